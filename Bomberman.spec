@@ -1,11 +1,21 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+import sys
 
+sys.path.insert(0, SPECPATH)
+from asset_pack import build_archive
+
+# Pack the images, sounds, music and sprite manifest into one archive so the
+# build ships (and opens) a single file instead of dozens of loose ones
+os.makedirs(workpath, exist_ok=True)
+asset_archive = os.path.join(workpath, 'assets.pak')
+build_archive(asset_archive, SPECPATH)
 
 a = Analysis(
     ['grid_game.py'],
     pathex=[],
     binaries=[],
-    datas=[('Bomb Bounce.wav', '.'), ('Bomb Explodes.wav', '.'), ('Hurry Up 1.wav', '.'), ('Hurry Up 2.wav', '.'), ('Item Bounce.wav', '.'), ('Item Get.wav', '.'), ('Kick Voice.wav', '.'), ('Kick.wav', '.'), ('Pause Jingle.wav', '.'), ('Place Bomb.wav', '.'), ('Pressure Block.wav', '.'), ('Skull.wav', '.'), ('Throw.wav', '.'), ('debug_tile_raw.png', '.'), ('pause.png', '.'), ('Screenshot 2026-01-05 102131.png', '.'), ('SNES - Super Bomberman 2 - Battle Stages - Battle Stage 01.png', '.'), ('SNES - Super Bomberman 2 - Miscellaneous - Bombs.png', '.'), ('SNES - Super Bomberman 2 - Miscellaneous - Items.png', '.'), ('SNES - Super Bomberman 2 - Playable Characters - Bomberman.png', '.'), ('SNES - Super Bomberman 2 - Tilesets - Battle Game Tiles.png', '.'), ('test_block1.png', '.'), ('test_block2.png', '.'), ('test_block4.png', '.'), ('test_extract1.png', '.'), ('test_extract2.png', '.'), ('test_extract4.png', '.'), ('test_scaled.png', '.'), ('Super Bomberman 2 - Battle 1 (SNES OST).mp3', '.')],
+    datas=[(asset_archive, '.')],
     hiddenimports=['pygame', 'numpy'],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,188 @@
+"""Packed asset archive for bundled builds
+
+All the game's images, sounds, music and the sprite manifest are packed into one
+file so a frozen build opens a single file instead of dozens of loose ones.
+
+Layout:
+    header  - magic (8 bytes) + index size (8 bytes, little endian)
+    index   - JSON list of {"name", "offset", "size", "md5"} (offsets are from the start of the file)
+    data    - the packed files, back to back
+
+The archive is memory-mapped when it is opened and files are read straight out of the
+mapping, so nothing is copied until a decoder actually reads it. Names are matched
+case-insensitively, so "kick voice.wav" finds "Kick Voice.wav" on every platform.
+
+Only the files the game loads are packed: the sprite manifest, the sheets it cuts sprites
+from, and the images, sound effects and music listed below (grid_game.py loads its sound
+effects from the same lists). To build an archive from the asset files next to this script:
+    python asset_pack.py [output file]
+"""
+import hashlib
+import io
+import json
+import mmap
+import os
+import struct
+import sys
+
+ARCHIVE_MAGIC = b"BMPAK\x00\x00\x01"
+ARCHIVE_HEADER = struct.Struct("<8sQ")  # magic, index size
+
+# Files the game loads besides the sprite sheets named in the manifest
+SPRITE_MANIFEST_FILE = "sprites.json"
+IMAGE_FILES = ["pause.png", "hurry.png"]
+SOUND_FILES = [
+    "Place Bomb.wav",
+    "Bomb Explodes.wav",
+    "Item Get.wav",
+    "kick voice.wav",
+    "kick.wav",
+    "Pause Jingle.wav",
+    "Throw.wav",
+    "Bomb Bounce.wav",
+    "Pressure Block.wav",
+    "Hurry Up 1.wav",
+    "Hurry Up 2.wav",
+    "skull.wav",
+]
+MUSIC_FILES = ["Super Bomberman 2 - Battle 1 (SNES OST).mp3", "boss fight.mp3"]
+
+
+class AssetReader(io.RawIOBase):
+    """Read-only file object over one packed file (a slice of the memory-mapped archive)"""
+    def __init__(self, view, name):
+        self.view = view
+        self.name = name
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.view[self.position:self.position + len(buffer)]
+        buffer[:len(data)] = data
+        self.position += len(data)
+        return len(data)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += len(self.view)
+        self.position = max(0, offset)
+        return self.position
+
+    def tell(self):
+        return self.position
+
+
+class AssetArchive:
+    """Memory-mapped packed asset archive with a case-insensitive index"""
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, index_size = ARCHIVE_HEADER.unpack_from(self.data)
+            if magic != ARCHIVE_MAGIC:
+                raise ValueError(f"{path} is not an asset archive")
+            self.view = memoryview(self.data)
+            index = json.loads(bytes(self.view[ARCHIVE_HEADER.size:ARCHIVE_HEADER.size + index_size]))
+        except Exception:
+            self.file.close()
+            raise
+        # {lowercase name: index entry}
+        self.entries = {entry["name"].lower(): entry for entry in index}
+
+    def __contains__(self, name):
+        return name.lower() in self.entries
+
+    def names(self):
+        """Get the names of every packed file"""
+        return [entry["name"] for entry in self.entries.values()]
+
+    def read(self, name):
+        """Get a packed file's bytes as a memoryview into the archive (no copy)"""
+        entry = self.entries[name.lower()]
+        return self.view[entry["offset"]:entry["offset"] + entry["size"]]
+
+    def open(self, name):
+        """Open a packed file as a read-only file object"""
+        entry = self.entries[name.lower()]
+        return AssetReader(self.read(name), entry["name"])
+
+    def get_hash(self, name):
+        """Get the md5 of a packed file (worked out when the archive was built)"""
+        return bytes.fromhex(self.entries[name.lower()]["md5"])
+
+
+def open_archive(path):
+    """Open an asset archive, or return None if there isn't one"""
+    if not os.path.isfile(path):
+        return None
+    return AssetArchive(path)
+
+
+def get_game_asset_files(source_dir):
+    """Get the names (as spelled on disk) of the files in source_dir that the game loads"""
+    with open(os.path.join(source_dir, SPRITE_MANIFEST_FILE), 'rb') as f:
+        manifest = json.load(f)
+    wanted = [SPRITE_MANIFEST_FILE] + [sheet["file"] for sheet in manifest["sheets"].values()]
+    wanted += IMAGE_FILES + SOUND_FILES + MUSIC_FILES
+    
+    # The game looks files up case-insensitively, so match them the same way here
+    on_disk = {filename.lower(): filename for filename in os.listdir(source_dir)
+               if os.path.isfile(os.path.join(source_dir, filename))}
+    filenames = []
+    for name in wanted:
+        filename = on_disk.get(name.lower())
+        if filename is None:
+            print(f"Warning: {name} is missing, so it won't be packed")
+        elif filename not in filenames:
+            filenames.append(filename)
+    return sorted(filenames)
+
+
+def build_archive(output_path, source_dir=None, filenames=None):
+    """Pack the game's asset files in source_dir (or just the given filenames) into an archive"""
+    source_dir = source_dir or os.path.dirname(os.path.abspath(__file__))
+    if filenames is None:
+        filenames = get_game_asset_files(source_dir)
+
+    contents = []
+    for filename in filenames:
+        with open(os.path.join(source_dir, filename), 'rb') as f:
+            contents.append(f.read())
+
+    # Offsets depend on the index size, and the index holds the offsets, so size it with
+    # placeholder offsets first (offsets are padded to a fixed width to keep the size stable)
+    def make_index(data_start):
+        index = []
+        offset = data_start
+        for filename, data in zip(filenames, contents):
+            index.append({"name": filename, "offset": offset, "size": len(data),
+                          "md5": hashlib.md5(data).hexdigest()})
+            offset += len(data)
+        return json.dumps(index).encode()
+
+    index_size = len(make_index(10 ** 12))
+    data_start = ARCHIVE_HEADER.size + index_size
+    index = make_index(data_start).ljust(index_size)
+
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, index_size))
+        f.write(index)
+        for data in contents:
+            f.write(data)
+    os.replace(tmp_path, output_path)
+    return filenames
+
+
+if __name__ == "__main__":
+    output = sys.argv[1] if len(sys.argv) > 1 else "assets.pak"
+    packed = build_archive(output)
+    print(f"Packed {len(packed)} files into {output}")
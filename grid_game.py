@@ -1,8 +1,82 @@
+import time
 import pygame
 import sys
 import math
 import os
 import random
+import hashlib
+import tempfile
+import json
+import threading
+import contextlib
+import weakref
+import bisect
+import asset_pack
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# NumPy is optional - used to speed up sprite processing when available
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Startup profiling
+# Launch with --profile-startup to print how long each part of startup took (slowest first),
+# or with --profile-startup=FILE to write the timings to FILE as JSON instead.
+# Spans can nest (a sprite sheet span includes its chroma key and scale spans), and decode
+# spans run on the decode threads, so the times don't add up to the total.
+startup_profile_start = time.perf_counter()
+STARTUP_PROFILE_ENABLED = False
+STARTUP_PROFILE_FILE = None
+for arg in sys.argv[1:]:
+    if arg == "--profile-startup":
+        STARTUP_PROFILE_ENABLED = True
+    elif arg.startswith("--profile-startup="):
+        STARTUP_PROFILE_ENABLED = True
+        STARTUP_PROFILE_FILE = arg.split("=", 1)[1]
+startup_spans = {}  # {span name: [total seconds, count]}
+startup_spans_lock = threading.Lock()  # Decode threads record spans too
+
+@contextlib.contextmanager
+def profile_span(name):
+    """Time a named part of startup (only recorded with --profile-startup)"""
+    if not STARTUP_PROFILE_ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        with startup_spans_lock:
+            span = startup_spans.setdefault(name, [0.0, 0])
+            span[0] += elapsed
+            span[1] += 1
+
+def report_startup_profile():
+    """Print the startup timings as a table, or write them as JSON"""
+    total = time.perf_counter() - startup_profile_start
+    with startup_spans_lock:
+        spans = sorted(startup_spans.items(), key=lambda item: item[1][0], reverse=True)
+    if STARTUP_PROFILE_FILE:
+        report = {
+            "total_ms": round(total * 1000, 3),
+            "spans": [{"name": name, "ms": round(seconds * 1000, 3), "count": count}
+                      for name, (seconds, count) in spans],
+        }
+        try:
+            with open(STARTUP_PROFILE_FILE, 'w') as f:
+                json.dump(report, f, indent=2)
+            print(f"Startup profile written to {STARTUP_PROFILE_FILE}")
+        except OSError as e:
+            print(f"Warning: Could not write startup profile: {e}")
+        return
+    name_width = max([len(name) for name, _ in spans] + [len("span")])
+    print(f"Startup took {total * 1000:.1f} ms")
+    print(f"{'span':<{name_width}}  {'ms':>9}  {'count':>5}")
+    for name, (seconds, count) in spans:
+        print(f"{name:<{name_width}}  {seconds * 1000:>9.2f}  {count:>5}")
 
 # Helper function to get resource path (works with PyInstaller)
 def resource_path(relative_path):
@@ -12,16 +86,194 @@ def resource_path(relative_path):
         base_path = sys._MEIPASS
     except Exception:
         base_path = os.path.abspath(".")
-    return os.path.join(base_path, relative_path)
+    path = os.path.join(base_path, relative_path)
+    if not os.path.exists(path):
+        # File names are case sensitive on Linux ("kick voice.wav" vs "Kick Voice.wav"),
+        # so fall back to a case-insensitive match against the folder listing
+        actual_name = get_loose_asset_names(base_path).get(relative_path.lower())
+        if actual_name:
+            path = os.path.join(base_path, actual_name)
+    return path
+
+loose_asset_names = {}  # {base path: {lowercase file name: file name}}
+
+def get_loose_asset_names(base_path):
+    """Get the case-insensitive file name index for a folder, listing it the first time"""
+    names = loose_asset_names.get(base_path)
+    if names is None:
+        try:
+            names = {name.lower(): name for name in os.listdir(base_path)}
+        except OSError:
+            names = {}
+        loose_asset_names[base_path] = names
+    return names
+
+# Helper function to get the folder for baked caches (sprites, sound variants)
+def get_cache_dir():
+    """Get the folder used for baked asset caches (kept outside the PyInstaller bundle)"""
+    base_dir = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME")
+    if not base_dir:
+        base_dir = os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base_dir, "bomberman_remake")
+
+# Packed asset archive
+# Bundled builds ship every asset in one memory-mapped archive (packed by asset_pack.py when
+# Bomberman.spec runs) instead of dozens of loose files. The archive index is read once here
+# and names are looked up case-insensitively. Without an archive the loose files are used.
+ASSET_ARCHIVE_FILE = "assets.pak"
+try:
+    asset_archive = asset_pack.open_archive(resource_path(ASSET_ARCHIVE_FILE))
+except Exception as e:
+    asset_archive = None
+    print(f"Warning: Could not open asset archive: {e}")
+
+def get_asset_source(filename):
+    """Get what pygame should load an asset from: a file object from the archive or the loose file's path"""
+    if asset_archive is not None and filename in asset_archive:
+        return asset_archive.open(filename)
+    return resource_path(filename)
+
+def read_asset(filename):
+    """Read an asset's bytes (a memoryview straight into the archive when there is one)"""
+    if asset_archive is not None and filename in asset_archive:
+        return asset_archive.read(filename)
+    with open(resource_path(filename), 'rb') as f:
+        return f.read()
+
+def get_asset_hash(filename):
+    """Get the md5 digest of an asset (stored in the archive index, so only loose files are hashed)"""
+    if asset_archive is not None and filename in asset_archive:
+        return asset_archive.get_hash(filename)
+    return hashlib.md5(read_asset(filename)).digest()
+
+def asset_exists(filename):
+    """Check whether an asset is in the archive or on disk"""
+    if asset_archive is not None and filename in asset_archive:
+        return True
+    return os.path.exists(resource_path(filename))
 
 # Initialize Pygame
-pygame.init()
+with profile_span("pygame init"):
+    pygame.init()
 
 # Initialize mixer for music with more channels for multiple sounds
-pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+with profile_span("mixer init"):
+    pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
 # Reserve more channels for simultaneous sounds (bounce sounds can overlap)
 pygame.mixer.set_num_channels(16)
 
+# Parallel asset decoding
+# Decoding the PNG and WAV files doesn't depend on anything else, so it runs on a
+# thread pool while the main thread gets on with other loading. The decoded images
+# are handed back to the main thread, which does convert() and sprite extraction
+# (both need the display). Single-core machines just decode on the main thread.
+ASSET_DECODE_WORKERS = min(8, os.cpu_count() or 1)
+asset_decode_pool = None
+if ASSET_DECODE_WORKERS > 1:
+    asset_decode_pool = ThreadPoolExecutor(max_workers=ASSET_DECODE_WORKERS, thread_name_prefix="asset-decode")
+asset_decode_futures = {}  # {filename: Future of the decoded image or sound}
+
+def decode_assets(filenames):
+    """Start decoding image and sound files in the background"""
+    if asset_decode_pool is None:
+        return
+    for filename in filenames:
+        if filename in asset_decode_futures:
+            continue
+        if filename.lower().endswith(".wav"):
+            decoder = decode_sound
+        else:
+            decoder = decode_image
+        asset_decode_futures[filename] = asset_decode_pool.submit(decoder, filename)
+
+def get_decoded_asset(filename, decoder):
+    """Get a decoded asset, waiting for its background decode if one was started"""
+    future = asset_decode_futures.pop(filename, None)
+    if future is not None:
+        return future.result()  # Re-raises any decode error here on the main thread
+    return decoder(filename)
+
+def decode_image(filename):
+    """Decode an image file"""
+    with profile_span(f"decode {filename}"):
+        return pygame.image.load(get_asset_source(filename), filename)
+
+def decode_sound(filename):
+    """Decode a sound file"""
+    with profile_span(f"decode {filename}"):
+        return pygame.mixer.Sound(get_asset_source(filename))
+
+def load_sound(filename):
+    """Load a sound effect, using the background decode if there is one"""
+    with profile_span(f"sound {filename}"):
+        return get_decoded_asset(filename, decode_sound)
+
+def load_music(filename):
+    """Load a music track (streamed straight out of the archive when there is one)"""
+    pygame.mixer.music.load(get_asset_source(filename), filename)
+
+# Baked sound variants
+# Pitch and gain variants of a sound are resampled with NumPy over the whole sample
+# array, then saved to the cache folder so later launches just load the result.
+SOUND_VARIANT_CACHE_VERSION = 1
+
+def bake_sound_variant(sound_array, semitones=0, gain=1.0):
+    """Resample a sndarray to shift its pitch and scale its volume"""
+    # Pitch ratio (e.g. 4 semitones down = 2^(-4/12)); to pitch down we play the samples back slower
+    pitch_ratio = 2 ** (semitones / 12)
+    original_length = sound_array.shape[0]
+    new_length = int(original_length / pitch_ratio)
+    # Nearest (truncated) source sample for every output sample - works for mono and stereo
+    source_indices = (np.arange(new_length) * pitch_ratio).astype(np.int64)
+    resampled = np.zeros((new_length,) + sound_array.shape[1:], dtype=sound_array.dtype)
+    valid = source_indices < original_length
+    resampled[valid] = sound_array[source_indices[valid]]
+    if gain != 1.0:
+        # Scale in float and clip so loud variants don't wrap around
+        limits = np.iinfo(sound_array.dtype)
+        resampled = np.clip(resampled * gain, limits.min, limits.max).astype(sound_array.dtype)
+    return resampled
+
+def load_sound_variant(filename, semitones=0, gain=1.0):
+    """Load a pitch/gain variant of a sound, baking it and caching it on disk the first time"""
+    with profile_span(f"sound {filename} (variant)"):
+        if np is None:
+            # Without numpy the variant can't be baked, use the original sound
+            print(f"Warning: numpy not available, using original {filename}")
+            return load_sound(filename)
+        
+        # Key on the source file, the variant settings and the mixer format (sndarray layout depends on it)
+        key = hashlib.md5(get_asset_hash(filename))
+        key.update(f"{SOUND_VARIANT_CACHE_VERSION}|{semitones}|{gain}|{pygame.mixer.get_init()}".encode())
+        cache_file = os.path.join(get_cache_dir(), "sounds", f"{os.path.splitext(filename)[0]}-{key.hexdigest()}.npy")
+        
+        try:
+            resampled = np.load(cache_file)
+            asset_decode_futures.pop(filename, None)  # Raw sound isn't needed
+            return pygame.sndarray.make_sound(resampled)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Warning: Could not read cached {filename} variant: {e}")
+        
+        sound = load_sound(filename)
+        try:
+            resampled = bake_sound_variant(pygame.sndarray.array(sound), semitones, gain)
+            variant = pygame.sndarray.make_sound(resampled)
+        except Exception as e:
+            # If resampling fails, use the original sound
+            print(f"Warning: Could not bake {filename} variant: {e}, using original")
+            return sound
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            np.save(cache_file, resampled)
+        except Exception as e:
+            print(f"Warning: Could not cache {filename} variant: {e}")
+        return variant
+
+# Start decoding every sound effect at once (asset_pack.py packs the same list)
+decode_assets(asset_pack.SOUND_FILES)
+
 # Load sound effects
 place_bomb_sound = None
 bomb_explode_sound = None
@@ -31,69 +283,34 @@ kick_sound = None
 throw_sound = None
 bomb_bounce_sound = None
 try:
-    place_bomb_sound = pygame.mixer.Sound(resource_path("Place Bomb.wav"))
+    place_bomb_sound = load_sound("Place Bomb.wav")
 except Exception as e:
     print(f"Warning: Could not load place bomb sound: {e}")
 
 try:
-    bomb_explode_sound = pygame.mixer.Sound(resource_path("Bomb Explodes.wav"))
+    bomb_explode_sound = load_sound("Bomb Explodes.wav")
 except Exception as e:
     print(f"Warning: Could not load bomb explode sound: {e}")
 
 try:
-    item_get_sound = pygame.mixer.Sound(resource_path("Item Get.wav"))
+    item_get_sound = load_sound("Item Get.wav")
 except Exception as e:
     print(f"Warning: Could not load item get sound: {e}")
 
 try:
-    kick_voice_sound = pygame.mixer.Sound(resource_path("kick voice.wav"))
+    kick_voice_sound = load_sound("kick voice.wav")
 except Exception as e:
     print(f"Warning: Could not load kick voice sound: {e}")
 
 try:
-    kick_sound_raw = pygame.mixer.Sound(resource_path("kick.wav"))
-    # Pitch down by 1 semitone (ratio = 2^(-1/12) ≈ 0.9439)
-    # To pitch down, we need to resample at a slower rate
-    try:
-        import numpy as np
-        # Get the sound array
-        sound_array = pygame.sndarray.array(kick_sound_raw)
-        # Calculate the pitch ratio (4 semitones down = 2^(-4/12))
-        pitch_ratio = 2 ** (-4 / 12)  # ≈ 0.7937 (pitch down by 4 semitones)
-        # Resample the audio to pitch it down
-        if len(sound_array.shape) == 2:  # Stereo
-            # Resample each channel
-            original_length = sound_array.shape[0]
-            new_length = int(original_length / pitch_ratio)
-            resampled = np.zeros((new_length, sound_array.shape[1]), dtype=sound_array.dtype)
-            for i in range(new_length):
-                source_index = int(i * pitch_ratio)
-                if source_index < original_length:
-                    resampled[i] = sound_array[source_index]
-            kick_sound = pygame.sndarray.make_sound(resampled)
-        else:  # Mono
-            original_length = sound_array.shape[0]
-            new_length = int(original_length / pitch_ratio)
-            resampled = np.zeros(new_length, dtype=sound_array.dtype)
-            for i in range(new_length):
-                source_index = int(i * pitch_ratio)
-                if source_index < original_length:
-                    resampled[i] = sound_array[source_index]
-            kick_sound = pygame.sndarray.make_sound(resampled)
-    except ImportError:
-        # If numpy is not available, use the original sound
-        kick_sound = kick_sound_raw
-        print("Warning: numpy not available, using original kick sound pitch")
-    except Exception as e:
-        # If resampling fails, use the original sound
-        kick_sound = kick_sound_raw
-        print(f"Warning: Could not pitch shift kick sound: {e}, using original")
+    # Pitch down by 4 semitones (ratio = 2^(-4/12) ≈ 0.7937)
+    kick_sound = load_sound_variant("kick.wav", semitones=-4)
 except Exception as e:
     kick_sound = None
     print(f"Warning: Could not load kick sound: {e}")
 
 try:
-    pause_jingle_sound = pygame.mixer.Sound(resource_path("Pause Jingle.wav"))
+    pause_jingle_sound = load_sound("Pause Jingle.wav")
     # Set volume to be louder (1.0 is max, but we can go higher if needed)
     pause_jingle_sound.set_volume(1.0)
 except Exception as e:
@@ -101,37 +318,37 @@ except Exception as e:
     print(f"Warning: Could not load pause jingle sound: {e}")
 
 try:
-    throw_sound = pygame.mixer.Sound(resource_path("Throw.wav"))
+    throw_sound = load_sound("Throw.wav")
 except Exception as e:
     throw_sound = None
     print(f"Warning: Could not load throw sound: {e}")
 
 try:
-    bomb_bounce_sound = pygame.mixer.Sound(resource_path("Bomb Bounce.wav"))
+    bomb_bounce_sound = load_sound("Bomb Bounce.wav")
 except Exception as e:
     bomb_bounce_sound = None
     print(f"Warning: Could not load bomb bounce sound: {e}")
 
 try:
-    pressure_block_sound = pygame.mixer.Sound(resource_path("Pressure Block.wav"))
+    pressure_block_sound = load_sound("Pressure Block.wav")
 except Exception as e:
     pressure_block_sound = None
     print(f"Warning: Could not load pressure block sound: {e}")
 
 try:
-    hurry_up_1_sound = pygame.mixer.Sound(resource_path("Hurry Up 1.wav"))
+    hurry_up_1_sound = load_sound("Hurry Up 1.wav")
 except Exception as e:
     hurry_up_1_sound = None
     print(f"Warning: Could not load hurry up 1 sound: {e}")
 
 try:
-    hurry_up_2_sound = pygame.mixer.Sound(resource_path("Hurry Up 2.wav"))
+    hurry_up_2_sound = load_sound("Hurry Up 2.wav")
 except Exception as e:
     hurry_up_2_sound = None
     print(f"Warning: Could not load hurry up 2 sound: {e}")
 
 try:
-    skull_sound = pygame.mixer.Sound(resource_path("skull.wav"))
+    skull_sound = load_sound("skull.wav")
 except Exception as e:
     skull_sound = None
     print(f"Warning: Could not load skull sound: {e}")
@@ -156,8 +373,36 @@ ORANGE = (255, 165, 0)  # Bomb
 YELLOW = (255, 255, 0)  # Explosion
 PURPLE = (128, 0, 128)  # Glove powerup fallback
 
+# Native resolution rendering
+# Launch with --native-resolution to put each frame together at the SNES art's own 16 pixels
+# per tile (240x208) and scale the finished frame up to the window once, instead of drawing
+# sprites pre-scaled to CELL_SIZE at full window size. The window can then be resized freely
+# (the frame is scaled up by the largest whole number that fits and centred).
+# --native-resolution=scale2x uses the scale2x filter for the doubling steps instead of plain
+# pixel doubling. The game itself still runs in CELL_SIZE units - positions are only
+# converted to native pixels when the sprites are drawn.
+NATIVE_TILE_SIZE = 16
+NATIVE_WIDTH = GRID_WIDTH * NATIVE_TILE_SIZE
+NATIVE_HEIGHT = GRID_HEIGHT * NATIVE_TILE_SIZE
+NATIVE_WINDOW_SCALE = 3  # Starting window size, in window pixels per native pixel
+NATIVE_RESOLUTION_ENABLED = False
+NATIVE_UPSCALE_FILTER = "nearest"  # "nearest" or "scale2x"
+for arg in sys.argv[1:]:
+    if arg == "--native-resolution":
+        NATIVE_RESOLUTION_ENABLED = True
+    elif arg.startswith("--native-resolution="):
+        NATIVE_RESOLUTION_ENABLED = True
+        NATIVE_UPSCALE_FILTER = arg.split("=", 1)[1]
+
 # Create the window
-window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+# In native resolution mode window is the native size frame the game draws on, not the display
+with profile_span("display init"):
+    if NATIVE_RESOLUTION_ENABLED:
+        pygame.display.set_mode((NATIVE_WIDTH * NATIVE_WINDOW_SCALE, NATIVE_HEIGHT * NATIVE_WINDOW_SCALE), pygame.RESIZABLE)
+        window = pygame.Surface((NATIVE_WIDTH, NATIVE_HEIGHT)).convert()
+    else:
+        window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+FRAME_TILE_SIZE = NATIVE_TILE_SIZE if NATIVE_RESOLUTION_ENABLED else CELL_SIZE  # Size of a grid cell on window
 pygame.display.set_caption("Grid Movement Game - P1: Arrow Keys + Space | P2: WASD + E | P3: IJKL + O | P4: Numpad 8/4/5/6 + 9")
 
 # Powerups on the ground: {(grid_x, grid_y): powerup_type}
@@ -436,15 +681,67 @@ class Player:
 bombs = []
 
 # Helper function to remove chroma key green background
+CHROMA_KEY_COLORS = [
+    (152, 248, 152),
+    (144, 248, 144),
+    (160, 248, 160),
+]
+CHROMA_KEY_TOLERANCE = 30
+
+# Array keying
+# The NumPy keying steps (chroma key and powerup processing) only differ in which pixels they
+# keep. Each works out a keep mask over the RGB array and shares the rest from here.
+def run_array_process(surface, array_process, slow_process, name):
+    """Run a NumPy pixel process, or its per-pixel version without NumPy"""
+    if np is not None:
+        try:
+            return array_process(surface)
+        except Exception as e:
+            # Fall back to the per-pixel loop if surfarray can't handle this surface
+            print(f"Warning: Array {name} failed, using per-pixel fallback: {e}")
+    return slow_process(surface)
+
+def get_rgb_array(surface):
+    """Get a (width, height, 3) array of a surface's pixels - int16 so differences can go negative"""
+    return pygame.surfarray.array3d(surface).astype(np.int16)
+
+def make_keyed_surface(rgb, keep):
+    """Make an SRCALPHA surface from an RGB array, with the kept pixels fully opaque"""
+    # Keyed-out pixels stay fully transparent black, like a fresh SRCALPHA surface
+    result = pygame.Surface(rgb.shape[:2], pygame.SRCALPHA)
+    result_rgb = pygame.surfarray.pixels3d(result)
+    result_rgb[keep] = rgb[keep]
+    del result_rgb  # Release the surface lock
+    result_alpha = pygame.surfarray.pixels_alpha(result)
+    result_alpha[keep] = 255
+    del result_alpha  # Release the surface lock
+    return result
+
 def remove_chroma_key(surface):
     """Remove light green chroma key background from a surface"""
+    return run_array_process(surface, remove_chroma_key_array, remove_chroma_key_slow, "chroma key")
+
+def remove_chroma_key_array(surface):
+    """Remove chroma key background using NumPy (same result as remove_chroma_key_slow)"""
     corner_color = surface.get_at((0, 0))
-    chroma_colors = [
-        corner_color[:3],
-        (152, 248, 152),
-        (144, 248, 144),
-        (160, 248, 160),
-    ]
+    chroma_colors = [tuple(corner_color[:3])] + CHROMA_KEY_COLORS
+    
+    rgb = get_rgb_array(surface)
+    r = rgb[:, :, 0]
+    g = rgb[:, :, 1]
+    b = rgb[:, :, 2]
+    
+    is_chroma = (g > 200) & (r < 200) & (b < 200)
+    for chroma_r, chroma_g, chroma_b in chroma_colors:
+        is_chroma |= ((np.abs(r - chroma_r) < CHROMA_KEY_TOLERANCE) &
+                      (np.abs(g - chroma_g) < CHROMA_KEY_TOLERANCE) &
+                      (np.abs(b - chroma_b) < CHROMA_KEY_TOLERANCE))
+    return make_keyed_surface(rgb, ~is_chroma)
+
+def remove_chroma_key_slow(surface):
+    """Remove chroma key background pixel by pixel (fallback when NumPy is missing)"""
+    corner_color = surface.get_at((0, 0))
+    chroma_colors = [corner_color[:3]] + CHROMA_KEY_COLORS
     
     result = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
     for x in range(surface.get_width()):
@@ -453,7 +750,9 @@ def remove_chroma_key(surface):
             r, g, b = pixel[:3]
             is_chroma = False
             for chroma_r, chroma_g, chroma_b in chroma_colors:
-                if abs(r - chroma_r) < 30 and abs(g - chroma_g) < 30 and abs(b - chroma_b) < 30:
+                if (abs(r - chroma_r) < CHROMA_KEY_TOLERANCE and
+                        abs(g - chroma_g) < CHROMA_KEY_TOLERANCE and
+                        abs(b - chroma_b) < CHROMA_KEY_TOLERANCE):
                     is_chroma = True
                     break
             if not is_chroma and g > 200 and r < 200 and b < 200:
@@ -463,9 +762,341 @@ def remove_chroma_key(surface):
                 result.set_at((x, y), (r, g, b, 255))
     return result
 
-# Load bomb sprites for pulsing animation
-# Player 1 bombs: Row 8 (y=128), columns x=0, 16, 32
-# Player 2 bombs: Row 8 (y=128), columns x=128, 144, 160 (8 columns further than player 1)
+# Helper function to load an image file with libpng warnings suppressed
+stderr_redirect_lock = threading.Lock()  # sys.stderr is shared by every thread, so one redirect at a time
+
+@contextlib.contextmanager
+def suppress_stderr():
+    """Send sys.stderr to devnull until the block ends"""
+    with stderr_redirect_lock, open(os.devnull, 'w') as devnull:
+        old_stderr = sys.stderr
+        sys.stderr = devnull
+        try:
+            yield
+        finally:
+            sys.stderr = old_stderr
+
+def load_image(filename, alpha=False):
+    """Load an image and convert it to the display format (main thread only)"""
+    # Suppress libpng warnings about incorrect sRGB profile
+    with suppress_stderr(), profile_span(f"image {filename}"):
+        image = get_decoded_asset(filename, decode_image)
+    with profile_span("convert to display format"):
+        if alpha:
+            return image.convert_alpha()  # Preserve transparency
+        return image.convert()
+
+# Baked sprite cache
+# The first run writes every cut, chroma keyed and scaled sprite into one cache file.
+# Later runs load the sprites straight from that file and never decode the sheets.
+# The file is keyed by a hash of the source images and CELL_SIZE, and every sprite
+# in it is keyed by its sheet, cut rectangle, size and processing step. Each sprite also
+# records the sprite set that cut it, so sprites a set no longer uses (after a manifest edit)
+# are dropped the next time the cache is written. Its transparency class is stored with it too,
+# so packing cached sprites into atlases never has to scan their pixels.
+# The file is a JSON index on the first line followed by the raw RGBA pixels of every sprite
+# (nothing in it is ever run as code), and a file that doesn't parse is just a cache miss.
+SPRITE_CACHE_VERSION = 4
+SPRITE_CACHE_ENABLED = "--no-sprite-cache" not in sys.argv
+SPRITE_TRANSPARENCY_CLASSES = ('opaque', 'colorkey', 'alpha')
+sprite_cache = {}  # {sprite key: (size, RGBA bytes, (sprite set name, native), transparency)}
+sprite_cache_sizes = {}  # {sheet filename: (width, height)}
+sprite_cache_dirty = False  # True if a sprite was cut from a sheet since the cache was written
+sprite_cache_used = set()  # Keys of the sprites cut or loaded from the cache this run
+sprite_cache_keys = weakref.WeakKeyDictionary()  # {sprite: key it is cached under} (atlas views included)
+sprite_cache_cuts = {}  # {key of a cut sprite: (x, y, width, height, size, process, flags) it was cut with}
+
+def get_sprite_cache_key(filenames):
+    """Hash the source images and CELL_SIZE into the key for the sprite cache file"""
+    key = hashlib.md5(f"{SPRITE_CACHE_VERSION}|{CELL_SIZE}".encode())
+    for filename in filenames:
+        key.update(filename.encode())
+        try:
+            key.update(get_asset_hash(filename))
+        except OSError:
+            key.update(b"missing")
+    return key.hexdigest()
+
+def parse_sprite_cache(data):
+    """Read the sprites and sheet sizes out of a sprite cache file (raises ValueError if it's malformed)"""
+    index_end = data.find(b"\n")
+    if index_end < 0:
+        raise ValueError("no index")
+    try:
+        index = json.loads(data[:index_end])
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"bad index: {e}")
+    if not isinstance(index, dict) or index.get("key") != sprite_cache_key:
+        return {}, {}  # Cut from other source images (or an older cache version)
+    
+    pixels_start = index_end + 1
+    sprites = {}
+    try:
+        for key, (width, height, offset, set_name, native, transparency) in index["sprites"].items():
+            length = width * height * 4
+            if (not all(isinstance(value, int) for value in (width, height, offset)) or
+                    width <= 0 or height <= 0 or offset < 0 or
+                    pixels_start + offset + length > len(data) or
+                    not isinstance(set_name, str) or transparency not in SPRITE_TRANSPARENCY_CLASSES):
+                raise ValueError(f"bad sprite entry {key!r}")
+            pixels = data[pixels_start + offset:pixels_start + offset + length]
+            sprites[key] = ((width, height), pixels, (set_name, bool(native)), transparency)
+        sizes = {filename: (int(width), int(height)) for filename, (width, height) in index["sizes"].items()}
+    except (KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"bad index: {e}")
+    return sprites, sizes
+
+def load_sprite_cache(filenames):
+    """Load the baked sprite cache if it matches the current source images"""
+    global sprite_cache, sprite_cache_sizes, sprite_cache_key
+    sprite_cache_key = get_sprite_cache_key(filenames)
+    if not SPRITE_CACHE_ENABLED:
+        return
+    try:
+        with profile_span("sprite cache load"):
+            with open(os.path.join(get_cache_dir(), "sprites.cache"), 'rb') as f:
+                data = f.read()
+            sprite_cache, sprite_cache_sizes = parse_sprite_cache(data)
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        # Unreadable or malformed - cut the sprites again and write a fresh cache
+        print(f"Warning: Could not read sprite cache: {e}")
+
+def prune_sprite_cache():
+    """Drop cached sprites that no current manifest sprite set uses (returns True if any were dropped)"""
+    # A sprite set built this run used exactly the sprites it needs, so its other sprites are
+    # stale. Sets that weren't built this run (unused lazy sets) keep what they had.
+    built_sets = {sprite_cache[key][2] for key in list(sprite_cache_used) if key in sprite_cache}
+    stale = [key for key, (size, data, owner, transparency) in list(sprite_cache.items())
+             if key not in sprite_cache_used and (owner in built_sets or owner[0] not in sprite_manifest["sprites"])]
+    for key in stale:
+        sprite_cache.pop(key, None)
+    return bool(stale)
+
+def save_sprite_cache():
+    """Write the sprite cache back to disk if any sprite was cut (or went stale) since it was loaded"""
+    global sprite_cache_dirty
+    if not SPRITE_CACHE_ENABLED:
+        return
+    pruned = prune_sprite_cache()
+    if not sprite_cache_dirty and not pruned:
+        return
+    tmp_path = None
+    try:
+        cache_dir = get_cache_dir()
+        os.makedirs(cache_dir, exist_ok=True)
+        cache_file = os.path.join(cache_dir, "sprites.cache")
+        index = {"key": sprite_cache_key, "sprites": {},
+                 "sizes": {filename: list(size) for filename, size in sprite_cache_sizes.items()}}
+        pixels = []
+        offset = 0
+        for key, ((width, height), data, (set_name, native), transparency) in list(sprite_cache.items()):
+            index["sprites"][key] = [width, height, offset, set_name, native, transparency]
+            pixels.append(data)
+            offset += len(data)
+        # Write to a temp file of our own first so a crash (or another copy of the game saving at
+        # the same time) never leaves a half-written cache
+        with profile_span("sprite cache save"), tempfile.NamedTemporaryFile(
+                dir=cache_dir, prefix="sprites.cache.", suffix=".tmp", delete=False) as f:
+            tmp_path = f.name
+            f.write(json.dumps(index, separators=(",", ":")).encode())
+            f.write(b"\n")
+            f.writelines(pixels)
+        os.replace(tmp_path, cache_file)
+        tmp_path = None
+        sprite_cache_dirty = False
+    except Exception as e:
+        print(f"Warning: Could not write sprite cache: {e}")
+    finally:
+        if tmp_path is not None:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+
+def get_cached_sprite(key, make_sprite, owner):
+    """Get a sprite from the sprite cache, or make it with make_sprite() and add it to the cache"""
+    global sprite_cache_dirty
+    sprite_cache_used.add(key)
+    cached = sprite_cache.get(key)
+    if cached is not None:
+        with profile_span("sprite cache hit"):
+            sprite = pygame.image.frombytes(cached[1], cached[0], "RGBA")
+    else:
+        sprite = make_sprite()
+        sprite_cache[key] = (sprite.get_size(), pygame.image.tobytes(sprite, "RGBA"), owner,
+                             measure_sprite_transparency(sprite))
+        sprite_cache_dirty = True
+    sprite_cache_keys[sprite] = key
+    return sprite
+
+# Shared sheet cache
+# Every sprite sheet surface comes from here, so an image file is decoded (with its stderr
+# redirect) and converted once per process, however many sheets and sprite sets use it.
+# Surfaces stay cached until evict_sheet_surfaces() is called once extraction is done.
+sheet_surfaces = {}  # {(filename, alpha): converted surface}
+
+def get_sheet_surface(filename, alpha=False):
+    """Get a decoded and converted sheet, decoding it the first time it is asked for"""
+    key = (filename, alpha)
+    surface = sheet_surfaces.get(key)
+    if surface is None:
+        surface = load_image(filename, alpha)
+        sheet_surfaces[key] = surface
+    return surface
+
+def evict_sheet_surfaces(filename=None):
+    """Drop one file's cached sheet surfaces, or every cached sheet surface"""
+    for key in list(sheet_surfaces):
+        if filename is None or key[0] == filename:
+            del sheet_surfaces[key]
+
+class SpriteSheet:
+    """Sprite sheet image that is only decoded when a sprite has to be cut from it"""
+    def __init__(self, filename, alpha=False):
+        self.filename = filename
+        self.alpha = alpha  # Use convert_alpha instead of convert when decoding
+    
+    def get_surface(self):
+        """Get the decoded sheet from the shared sheet cache"""
+        return get_sheet_surface(self.filename, self.alpha)
+    
+    def get_size(self):
+        """Get the sheet size without decoding it if the cache already knows it"""
+        global sprite_cache_dirty
+        size = sprite_cache_sizes.get(self.filename)
+        if size is None:
+            size = self.get_surface().get_size()
+            sprite_cache_sizes[self.filename] = size
+            sprite_cache_dirty = True
+        return size
+    
+    def cut(self, x, y, width, height, size=None, process=remove_chroma_key, flags=0, owner=None):
+        """Cut a sprite out of the sheet, run it through process and scale it to size
+
+        owner is the (sprite set name, native) the sprite is cut for in the sprite cache.
+        """
+        process_name = process.__name__ if process else None
+        key = f"{self.filename}|{x},{y},{width},{height}|{size}|{process_name}|{flags}"
+        sprite_cache_cuts[key] = (x, y, width, height, size, process, flags)
+        return get_cached_sprite(key, lambda: self.cut_uncached(x, y, width, height, size, process, flags), owner)
+    
+    def cut_uncached(self, x, y, width, height, size=None, process=remove_chroma_key, flags=0):
+        """Cut a sprite like cut() without going through the sprite cache"""
+        sprite = pygame.Surface((width, height), flags)
+        sprite.blit(self.get_surface(), (0, 0), (x, y, width, height))
+        if process is not None:
+            with profile_span(f"process {process.__name__}"):
+                sprite = process(sprite)
+        if size is not None:
+            with profile_span("scale"):
+                sprite = pygame.transform.scale(sprite, size)
+        return sprite
+
+# Sprite manifest
+# Every sprite set is described in sprites.json instead of in code:
+#   "sheets"   - sheet name -> {"file": image file, "alpha": decode with convert_alpha}
+#   "layouts"  - shared options and frames that a sprite set pulls in with "layout"
+#   "palettes" - palette name -> {"#rrggbb": "#rrggbb"} colour swaps for recolored sprite sets
+#   "sprites"  - global variable name -> sprite set
+# A sprite set gives its "sheet", the frame "size" on the sheet, how to "scale" it (a factor,
+# or "cell" for CELL_SIZE x CELL_SIZE), the "process" to run on it ("chroma_key" by default,
+# "powerup" or "none"), "alpha_blit" to cut it onto a per-pixel alpha surface, the "flag"
+# global that says it loaded, "lazy" to only cut it on first use, and its frames as either:
+#   "frames"           - [x, y] for one sprite, a list of frames for a list of sprites,
+#                        {name: frames} for a dictionary, or {options..., "frames": frames}
+#                        to change the options for just that part
+#   "rows"/"columns"   - a grid, {row: sprites for each column} (a list of rows is keyed by
+#                        row index), with optional "aliases" that repeat a column by another name
+# A sprite set can instead "recolor" another sprite set through one of the "palettes". If it also
+# gives a "sheet" with the original art (laid out like the base set's), any frame the palette
+# doesn't reproduce exactly (hand-edited pixels) is cut from that sheet instead. That check only
+# runs when a sprite isn't in the sprite cache yet, so the sheet is only decoded then.
+# Adding a character or tileset only needs a new entry here, not another load loop.
+SPRITE_MANIFEST_FILE = "sprites.json"
+try:
+    with profile_span("sprite manifest"):
+        sprite_manifest = json.loads(bytes(read_asset(SPRITE_MANIFEST_FILE)))
+except Exception as e:
+    sprite_manifest = {"sheets": {}, "layouts": {}, "palettes": {}, "sprites": {}}
+    print(f"Warning: Could not load sprite manifest: {e}. Using default drawing.")
+sprite_sheets = {name: SpriteSheet(sheet["file"], sheet.get("alpha", False))
+                 for name, sheet in sprite_manifest["sheets"].items()}
+
+# Every sheet the sprites below are cut from (part of the sprite cache key)
+SPRITE_SHEET_FILES = [sheet.filename for sheet in sprite_sheets.values()]
+sprite_cache_key = None
+load_sprite_cache(SPRITE_SHEET_FILES)
+
+# Decode the sheets in the background when the cache can't supply the sprites
+# (sheets that only have lazy sprite sets are left out because they are only cut on demand)
+if not sprite_cache:
+    eager_sheets = {sprite_set.get("sheet") for sprite_set in sprite_manifest["sprites"].values() if not sprite_set.get("lazy")}
+    decode_assets([sheet.filename for name, sheet in sprite_sheets.items() if name in eager_sheets])
+decode_assets(asset_pack.IMAGE_FILES)
+
+# Lazy sprite registry
+# Sprite sets that most matches never use (or only use seconds into the match) are
+# registered with a builder function and only cut the first time they are asked for.
+# Launch with --prewarm-sprites to decode their sheets on the decode threads at startup
+# and build them on the main thread over the first frames instead (one sheet per frame).
+lazy_sprite_builders = {}  # {name: function that builds the sprite set}
+lazy_sprite_sets = {}  # {name: built sprite set}
+prewarm_sprite_queue = []  # [(sheet filename, [lazy sprite set names])] still to be prewarmed
+prewarm_held_sheets = set()  # Sheet files kept decoded until every queued set cut from them is built
+
+def register_lazy_sprites(name, builder):
+    """Register a sprite set that is built on first use"""
+    lazy_sprite_builders[name] = builder
+    lazy_sprite_sets.pop(name, None)
+
+def get_lazy_sprites(name):
+    """Get a lazily built sprite set, building it the first time it is asked for"""
+    sprites = lazy_sprite_sets.get(name)
+    if sprites is None:
+        builder = lazy_sprite_builders.get(name)
+        try:
+            sprites = builder() if builder else None
+        except Exception as e:
+            sprites = None
+            print(f"Warning: Could not load {name}: {e}")
+        if sprites is None:
+            sprites = []  # Empty set so callers fall back to default drawing
+        lazy_sprite_sets[name] = sprites
+    return sprites
+
+def prewarm_lazy_sprites():
+    """Start decoding the lazy sprite sets' sheets and queue the sets to be built"""
+    sets_by_sheet = {}  # {sheet filename: [lazy sprite set names]}
+    for name in lazy_sprite_builders:
+        filename = get_sprite_set_sheet(get_sprite_set_spec(name)).filename
+        sets_by_sheet.setdefault(filename, []).append(name)
+    decode_assets([filename for name in lazy_sprite_builders for filename in get_sprite_set_files(get_sprite_set_spec(name))])
+    prewarm_sprite_queue.extend(sets_by_sheet.items())
+
+def build_prewarmed_sprites():
+    """Build the lazy sprite sets of the next queued sheet once it has decoded (called once a frame)"""
+    if not prewarm_sprite_queue:
+        return
+    filename, names = prewarm_sprite_queue[0]
+    future = asset_decode_futures.get(filename)
+    if future is not None and not future.done():
+        return
+    prewarm_sprite_queue.pop(0)
+    prewarm_held_sheets.add(filename)
+    try:
+        for name in names:
+            get_lazy_sprites(name)
+    finally:
+        prewarm_held_sheets.discard(filename)
+        evict_sheet_surfaces(filename)
+        # Never picked up if the sprite cache already had every sprite cut from them
+        for name in names:
+            for sheet_filename in get_sprite_set_files(get_sprite_set_spec(name)):
+                asset_decode_futures.pop(sheet_filename, None)
+
+# Sprite sets cut from the sheets in sprites.json
+# Each one is published as a global of the same name, and its flag is set when it loads
+# Bomb sprites for pulsing animation
 bomb_sprites = []  # List of bomb animation frames for player 1
 bomb2_sprites = []  # List of bomb animation frames for player 2
 bomb3_sprites = []  # List of bomb animation frames for player 3
@@ -475,894 +1106,38 @@ bomb2_sprite_loaded = False
 bomb3_sprite_loaded = False
 bomb4_sprite_loaded = False
 BOMB_ANIMATION_SPEED = 200  # milliseconds per frame
-try:
-    # Suppress libpng warnings about incorrect sRGB profile
-    # Redirect stderr temporarily to suppress libpng warnings
-    old_stderr = sys.stderr
-    sys.stderr = open(os.devnull, 'w')
-    try:
-        bomb_sprite_sheet = pygame.image.load(resource_path("SNES - Super Bomberman 2 - Miscellaneous - Bombs.png"))
-    finally:
-        sys.stderr.close()
-        sys.stderr = old_stderr
-    bomb_sprite_sheet = bomb_sprite_sheet.convert()
-    
-    BOMB_SPRITE_SIZE = 16  # Typical SNES sprite size
-    bomb_sprite_positions = [0, 16, 32]  # x coordinates for sprites 1, 2, 3
-    
-    # Load Player 1 bomb sprites from row 8 (y=128, 8 rows down from y=0)
-    # 1st sprite: x=0, 2nd sprite: x=16, 3rd sprite: x=32
-    BOMB_ROW_Y_P1 = 128  # Row 8: 8 rows down (8 * 16 = 128)
-    
-    for x_pos in bomb_sprite_positions:
-        bomb_sprite = pygame.Surface((BOMB_SPRITE_SIZE, BOMB_SPRITE_SIZE))
-        bomb_sprite.blit(bomb_sprite_sheet, (0, 0), (x_pos, BOMB_ROW_Y_P1, BOMB_SPRITE_SIZE, BOMB_SPRITE_SIZE))
-        
-        # Remove chroma key green background using the helper function
-        bomb_sprite = remove_chroma_key(bomb_sprite)
-        
-        # Scale with alpha preservation
-        bomb_sprite = pygame.transform.scale(bomb_sprite, (CELL_SIZE, CELL_SIZE))
-        bomb_sprites.append(bomb_sprite)
-    
-    # Load Player 2 bomb sprites from row 8 (same row as player 1), but 8 columns further
-    # 1st sprite: x=128 (column 8), 2nd sprite: x=144 (column 9), 3rd sprite: x=160 (column 10)
-    BOMB_ROW_Y_P2 = 128  # Row 8: same as player 1 (8 * 16 = 128)
-    bomb2_sprite_positions = [128, 144, 160]  # x coordinates for columns 8, 9, 10 (8 columns further than player 1)
-    
-    for x_pos in bomb2_sprite_positions:
-        bomb_sprite = pygame.Surface((BOMB_SPRITE_SIZE, BOMB_SPRITE_SIZE))
-        bomb_sprite.blit(bomb_sprite_sheet, (0, 0), (x_pos, BOMB_ROW_Y_P2, BOMB_SPRITE_SIZE, BOMB_SPRITE_SIZE))
-        
-        # Remove chroma key green background using the helper function
-        bomb_sprite = remove_chroma_key(bomb_sprite)
-        
-        # Scale with alpha preservation
-        bomb_sprite = pygame.transform.scale(bomb_sprite, (CELL_SIZE, CELL_SIZE))
-        bomb2_sprites.append(bomb_sprite)
-    
-    # Load Player 3 bomb sprites from row 8 (same row as player 1), but 16 columns further
-    # 1st sprite: x=256 (column 16), 2nd sprite: x=272 (column 17), 3rd sprite: x=288 (column 18)
-    BOMB_ROW_Y_P3 = 128  # Row 8: same as player 1
-    bomb3_sprite_positions = [256, 272, 288]  # x coordinates for columns 16, 17, 18 (16 columns further than player 1)
-    
-    for x_pos in bomb3_sprite_positions:
-        bomb_sprite = pygame.Surface((BOMB_SPRITE_SIZE, BOMB_SPRITE_SIZE))
-        bomb_sprite.blit(bomb_sprite_sheet, (0, 0), (x_pos, BOMB_ROW_Y_P3, BOMB_SPRITE_SIZE, BOMB_SPRITE_SIZE))
-        
-        # Remove chroma key green background using the helper function
-        bomb_sprite = remove_chroma_key(bomb_sprite)
-        
-        # Scale with alpha preservation
-        bomb_sprite = pygame.transform.scale(bomb_sprite, (CELL_SIZE, CELL_SIZE))
-        bomb3_sprites.append(bomb_sprite)
-    
-    # Load Player 4 bomb sprites from row 8 (same row as player 1), but 24 columns further
-    # 1st sprite: x=384 (column 24), 2nd sprite: x=400 (column 25), 3rd sprite: x=416 (column 26)
-    BOMB_ROW_Y_P4 = 128  # Row 8: same as player 1
-    bomb4_sprite_positions = [384, 400, 416]  # x coordinates for columns 24, 25, 26 (24 columns further than player 1)
-    
-    for x_pos in bomb4_sprite_positions:
-        bomb_sprite = pygame.Surface((BOMB_SPRITE_SIZE, BOMB_SPRITE_SIZE))
-        bomb_sprite.blit(bomb_sprite_sheet, (0, 0), (x_pos, BOMB_ROW_Y_P4, BOMB_SPRITE_SIZE, BOMB_SPRITE_SIZE))
-        
-        # Remove chroma key green background using the helper function
-        bomb_sprite = remove_chroma_key(bomb_sprite)
-        
-        # Scale with alpha preservation
-        bomb_sprite = pygame.transform.scale(bomb_sprite, (CELL_SIZE, CELL_SIZE))
-        bomb4_sprites.append(bomb_sprite)
-    
-    bomb_sprite_loaded = True
-    bomb2_sprite_loaded = True
-    bomb3_sprite_loaded = True
-    bomb4_sprite_loaded = True
-except Exception as e:
-    bomb_sprite_loaded = False
-    bomb2_sprite_loaded = False
-    bomb3_sprite_loaded = False
-    bomb4_sprite_loaded = False
-    print(f"Warning: Could not load bomb sprites: {e}. Using default circle.")
 
-# Load player sprites for all directions with walking animations
+# Player sprites for all directions with walking animations
 # Dictionary: 'up', 'right', 'down', 'left' -> list of sprites [idle, walk1, walk2]
 player_sprites = {}
 player2_sprites = {}
 player3_sprites = {}
 player4_sprites = {}
-boss_test_sprites = {}  # Boss test sprites for player 1 toggle
-boss_idle_sprites = []  # List of all sprites from row 9 for idle animation
+boss_test_sprites = {}  # Boss test sprites for player 1 toggle (cut on first toggle)
+boss_idle_sprites = []  # List of all sprites from row 9 for idle animation (cut on first toggle)
 player_sprite_loaded = False
 player2_sprite_loaded = False
 player3_sprite_loaded = False
 player4_sprite_loaded = False
 boss_test_sprite_loaded = False
-try:
-    # Suppress libpng warnings about incorrect sRGB profile
-    old_stderr = sys.stderr
-    sys.stderr = open(os.devnull, 'w')
-    try:
-        player_sprite_sheet = pygame.image.load(resource_path("SNES - Super Bomberman 2 - Playable Characters - Bomberman.png"))
-    finally:
-        sys.stderr.close()
-        sys.stderr = old_stderr
-    player_sprite_sheet = player_sprite_sheet.convert()
-    # Player sprites have a 1:2 aspect ratio (width:height), so 16x32 pixels
-    # Rows: 1st row (y=0) = up, 2nd row (y=32) = right, 3rd row (y=64) = down, 4th row (y=96) = left
-    # Columns: 1st column (x=0) = idle, 2nd column (x=16) = walk frame 1, 3rd column (x=32) = walk frame 2
-    PLAYER_SPRITE_WIDTH = 16
-    PLAYER_SPRITE_HEIGHT = 32
-    
-    # Player 1 directions (rows 1-4)
-    directions = {
-        'up': 0,      # Row 1: y = 0
-        'right': 32,  # Row 2: y = 32
-        'down': 64,   # Row 3: y = 64
-        'left': 96    # Row 4: y = 96
-    }
-    
-    # Column offsets for animation frames
-    columns = {
-        'idle': 0,    # Column 1: x = 0
-        'walk1': 16,  # Column 2: x = 16
-        'walk2': 32   # Column 3: x = 32
-    }
-    
-    # Load Player 1 sprites
-    for direction, y_offset in directions.items():
-        direction_sprites = []
-        for frame_name, x_offset in columns.items():
-            sprite = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-            sprite.blit(player_sprite_sheet, (0, 0), (x_offset, y_offset, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-            
-            # Remove chroma key green background using the helper function
-            sprite = remove_chroma_key(sprite)
-            # Scale player sprite to be 2.5x bigger (maintain 1:2 aspect ratio)
-            # 16x32 becomes 40x80
-            new_width = int(PLAYER_SPRITE_WIDTH * 2.5)
-            new_height = int(PLAYER_SPRITE_HEIGHT * 2.5)
-            sprite = pygame.transform.scale(sprite, (new_width, new_height))
-            direction_sprites.append(sprite)
-        
-        player_sprites[direction] = direction_sprites  # [idle, walk1, walk2]
-    
-    player_sprite_loaded = True
-    
-    # Load boss test sprites for player 1 toggle
-    # Boss test sprites use the same row/column structure as normal sprites
-    # These coordinates are ONLY used for boss test sprites and do NOT affect normal player sprites
-    # Boss sprites are 26x32 pixels (different from player sprites which are 16x32)
-    try:
-        boss_test_sprite_sheet = pygame.image.load(resource_path("boss test.png"))
-        # Use convert_alpha to preserve transparency better for boss sprites
-        boss_test_sprite_sheet = boss_test_sprite_sheet.convert_alpha()
-        
-        # Boss sprite dimensions: 26x32 pixels
-        BOSS_SPRITE_WIDTH = 26
-        BOSS_SPRITE_HEIGHT = 32
-        
-        # Boss test sprite coordinate mappings based on row/column structure
-        # Sprites are arranged in the same grid structure as normal sprites:
-        # Rows: up (row 1), right (row 2), down (row 3), left (row 4)
-        # Columns: idle (col 1), walk1 (col 2), walk2 (col 3)
-        # These are separate from the normal player sprite coordinates to avoid affecting normal sprites
-        boss_test_directions = {
-            'up': 0,      # Row 1: y = 0
-            'right': 32,  # Row 2: y = 32
-            'down': 64,   # Row 3: y = 64
-            'left': 96    # Row 4: y = 96
-        }
-        
-        boss_test_columns = {
-            'idle': 0,    # Column 1: x = 0
-            'walk1': 26,  # Column 2: x = 26 (boss sprites are 26 pixels wide)
-            'walk2': 52   # Column 3: x = 52
-        }
-        
-        # Get boss sprite sheet dimensions to verify layout
-        sheet_width, sheet_height = boss_test_sprite_sheet.get_size()
-        print(f"Boss test sprite sheet size: {sheet_width}x{sheet_height}")
-        print(f"Boss sprite coordinates (based on row/column structure):")
-        print(f"  Directions (Y): {boss_test_directions}")
-        print(f"  Columns (X): {boss_test_columns}")
-        print(f"  Boss sprite size: {BOSS_SPRITE_WIDTH}x{BOSS_SPRITE_HEIGHT}")
-        
-        # Load boss test sprites using boss-specific coordinate mappings
-        # Ensure we don't exceed sprite sheet bounds
-        for direction, y_offset in boss_test_directions.items():
-            direction_sprites = []
-            for frame_name, x_offset in boss_test_columns.items():
-                # Check bounds before extracting
-                if x_offset + BOSS_SPRITE_WIDTH > sheet_width or y_offset + BOSS_SPRITE_HEIGHT > sheet_height:
-                    print(f"Warning: Boss sprite extraction out of bounds for {direction}/{frame_name} at ({x_offset}, {y_offset})")
-                    # Create a blank sprite as fallback
-                    sprite = pygame.Surface((BOSS_SPRITE_WIDTH, BOSS_SPRITE_HEIGHT), pygame.SRCALPHA)
-                else:
-                    # Extract sprite region from boss test sprite sheet
-                    sprite = pygame.Surface((BOSS_SPRITE_WIDTH, BOSS_SPRITE_HEIGHT), pygame.SRCALPHA)
-                    sprite.blit(boss_test_sprite_sheet, (0, 0), (x_offset, y_offset, BOSS_SPRITE_WIDTH, BOSS_SPRITE_HEIGHT))
-                
-                # Remove chroma key green background using the helper function
-                # This ensures proper transparency for boss sprites
-                sprite = remove_chroma_key(sprite)
-                # Scale boss sprite to be 2.5x bigger (maintain aspect ratio)
-                # 26x32 becomes 65x80
-                new_width = int(BOSS_SPRITE_WIDTH * 2.5)
-                new_height = int(BOSS_SPRITE_HEIGHT * 2.5)
-                sprite = pygame.transform.scale(sprite, (new_width, new_height))
-                direction_sprites.append(sprite)
-            
-            boss_test_sprites[direction] = direction_sprites  # [idle, walk1, walk2]
-        
-        # Load idle animation sprites from row 9
-        # Row 9 is at y = 8 * 32 = 256 (assuming rows are 32 pixels apart)
-        # There are exactly 4 sprites to cycle through
-        ROW_9_Y = 8 * 32  # Row 9: y = 256
-        NUM_IDLE_SPRITES = 4  # Cycle through 4 sprites
-        x_offset = 0
-        for i in range(NUM_IDLE_SPRITES):
-            # Check bounds before extracting
-            if x_offset + BOSS_SPRITE_WIDTH > sheet_width or ROW_9_Y + BOSS_SPRITE_HEIGHT > sheet_height:
-                print(f"Warning: Boss idle sprite extraction out of bounds at ({x_offset}, {ROW_9_Y})")
-                break
-            
-            # Extract sprite from row 9
-            sprite = pygame.Surface((BOSS_SPRITE_WIDTH, BOSS_SPRITE_HEIGHT), pygame.SRCALPHA)
-            sprite.blit(boss_test_sprite_sheet, (0, 0), (x_offset, ROW_9_Y, BOSS_SPRITE_WIDTH, BOSS_SPRITE_HEIGHT))
-            
-            # Remove chroma key green background
-            sprite = remove_chroma_key(sprite)
-            # Scale boss sprite to be 2.5x bigger
-            new_width = int(BOSS_SPRITE_WIDTH * 2.5)
-            new_height = int(BOSS_SPRITE_HEIGHT * 2.5)
-            sprite = pygame.transform.scale(sprite, (new_width, new_height))
-            boss_idle_sprites.append(sprite)
-            
-            # Move to next sprite (26 pixels to the right)
-            x_offset += BOSS_SPRITE_WIDTH
-        
-        boss_test_sprite_loaded = True
-        print(f"Boss test sprites loaded successfully. Sprite keys: {list(boss_test_sprites.keys())}")
-        for direction, sprites in boss_test_sprites.items():
-            print(f"  {direction}: {len(sprites)} frames")
-        print(f"  Boss idle animation: {len(boss_idle_sprites)} frames from row 9")
-    except Exception as e:
-        boss_test_sprite_loaded = False
-        boss_idle_sprites = []  # Clear idle sprites on failure
-        print(f"Warning: Could not load boss test sprite: {e}")
-        import traceback
-        traceback.print_exc()
-    
-    # Load Player 2 sprites from separate file (player 2.png)
-    # Use the same sprite positions as player 1 (rows 1-4)
-    try:
-        old_stderr = sys.stderr
-        sys.stderr = open(os.devnull, 'w')
-        try:
-            player2_sprite_sheet = pygame.image.load(resource_path("player 2.png"))
-        finally:
-            sys.stderr.close()
-            sys.stderr = old_stderr
-        player2_sprite_sheet = player2_sprite_sheet.convert()
-        
-        # Load Player 2 sprites using same positions as Player 1
-        for direction, y_offset in directions.items():
-            direction_sprites = []
-            for frame_name, x_offset in columns.items():
-                sprite = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-                sprite.blit(player2_sprite_sheet, (0, 0), (x_offset, y_offset, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-                
-                # Remove chroma key green background using the helper function
-                sprite = remove_chroma_key(sprite)
-                # Scale player sprite to be 2.5x bigger (maintain 1:2 aspect ratio)
-                # 16x32 becomes 40x80
-                new_width = int(PLAYER_SPRITE_WIDTH * 2.5)
-                new_height = int(PLAYER_SPRITE_HEIGHT * 2.5)
-                sprite = pygame.transform.scale(sprite, (new_width, new_height))
-                direction_sprites.append(sprite)
-            
-            player2_sprites[direction] = direction_sprites  # [idle, walk1, walk2]
-        
-        # Load Player 2 death animation sprites from player2_sprite_sheet using same positions as player 1
-        # Player sprites are 16x32 pixels, rows are 32 pixels apart
-        # Row 11 (1-indexed) = y = 10 * 32 = 320
-        # Row 12 (1-indexed) = y = 11 * 32 = 352
-        # Row 5 (1-indexed) = y = 4 * 32 = 128
-        # Columns are 16 pixels apart
-        # Sprite 1 = x = 0, Sprite 2 = x = 16, Sprite 3 = x = 32, Sprite 4 = x = 48, Sprite 5 = x = 64
-        death_sprites2 = []
-        DEATH_ROW_11_Y = 10 * 32  # Row 11 (1-indexed) = 320
-        DEATH_ROW_12_Y = 11 * 32  # Row 12 (1-indexed) = 352
-        DEATH_ROW_5_Y = 4 * 32    # Row 5 (1-indexed) = 128
-        
-        # Front facing: row 11, sprite 1 (x=0)
-        front_sprite2 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        front_sprite2.blit(player2_sprite_sheet, (0, 0), (0, DEATH_ROW_11_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        front_sprite2 = remove_chroma_key(front_sprite2)
-        front_sprite2 = pygame.transform.scale(front_sprite2, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        death_sprites2.append(front_sprite2)
-        
-        # Right facing: row 11, sprite 2 (x=16)
-        right_sprite2 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        right_sprite2.blit(player2_sprite_sheet, (0, 0), (16, DEATH_ROW_11_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        right_sprite2 = remove_chroma_key(right_sprite2)
-        right_sprite2 = pygame.transform.scale(right_sprite2, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        death_sprites2.append(right_sprite2)
-        
-        # Back facing: row 5, sprite 1 (x=0)
-        back_sprite2 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        back_sprite2.blit(player2_sprite_sheet, (0, 0), (0, DEATH_ROW_5_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        back_sprite2 = remove_chroma_key(back_sprite2)
-        back_sprite2 = pygame.transform.scale(back_sprite2, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        death_sprites2.append(back_sprite2)
-        
-        # Left facing: row 11, sprite 3 (x=32)
-        left_sprite2 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        left_sprite2.blit(player2_sprite_sheet, (0, 0), (32, DEATH_ROW_11_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        left_sprite2 = remove_chroma_key(left_sprite2)
-        left_sprite2 = pygame.transform.scale(left_sprite2, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        death_sprites2.append(left_sprite2)
-        
-        # Additional death animation sprites
-        # Row 11, sprite 4 (x=48)
-        row11_sprite4_2 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row11_sprite4_2.blit(player2_sprite_sheet, (0, 0), (48, DEATH_ROW_11_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row11_sprite4_2 = remove_chroma_key(row11_sprite4_2)
-        row11_sprite4_2 = pygame.transform.scale(row11_sprite4_2, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        death_sprites2.append(row11_sprite4_2)
-        
-        # Row 12, sprite 1 (x=0)
-        row12_sprite1_2 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row12_sprite1_2.blit(player2_sprite_sheet, (0, 0), (0, DEATH_ROW_12_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row12_sprite1_2 = remove_chroma_key(row12_sprite1_2)
-        row12_sprite1_2 = pygame.transform.scale(row12_sprite1_2, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        death_sprites2.append(row12_sprite1_2)
-        
-        # Row 12, sprite 2 (x=16)
-        row12_sprite2_2 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row12_sprite2_2.blit(player2_sprite_sheet, (0, 0), (16, DEATH_ROW_12_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row12_sprite2_2 = remove_chroma_key(row12_sprite2_2)
-        row12_sprite2_2 = pygame.transform.scale(row12_sprite2_2, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        death_sprites2.append(row12_sprite2_2)
-        
-        # Row 12, sprite 3 (x=32)
-        row12_sprite3_2 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row12_sprite3_2.blit(player2_sprite_sheet, (0, 0), (32, DEATH_ROW_12_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row12_sprite3_2 = remove_chroma_key(row12_sprite3_2)
-        row12_sprite3_2 = pygame.transform.scale(row12_sprite3_2, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        death_sprites2.append(row12_sprite3_2)
-        
-        # Row 12, sprite 4 (x=48)
-        row12_sprite4_2 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row12_sprite4_2.blit(player2_sprite_sheet, (0, 0), (48, DEATH_ROW_12_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row12_sprite4_2 = remove_chroma_key(row12_sprite4_2)
-        row12_sprite4_2 = pygame.transform.scale(row12_sprite4_2, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        death_sprites2.append(row12_sprite4_2)
-        
-        # Row 12, sprite 5 (x=64)
-        row12_sprite5_2 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row12_sprite5_2.blit(player2_sprite_sheet, (0, 0), (64, DEATH_ROW_12_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row12_sprite5_2 = remove_chroma_key(row12_sprite5_2)
-        row12_sprite5_2 = pygame.transform.scale(row12_sprite5_2, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        death_sprites2.append(row12_sprite5_2)
-        
-        # Load Player 2 glove pickup animation sprites from player2_sprite_sheet using same positions as player 1
-        # Dictionary: 'up', 'right', 'down', 'left' -> list of sprites [sprite1, sprite2, sprite3, sprite4]
-        # Sprites: 1 = x=0, 2 = x=16, 3 = x=32, 4 = x=48
-        glove_pickup_sprites2 = {}
-        
-        # Helper function to load sprites from a row for player 2
-        def load_glove_row_sprites2(row_y):
-            sprites = []
-            for sprite_num in range(1, 5):  # Sprites 1-4
-                x_offset = (sprite_num - 1) * 16  # x=0, 16, 32, 48
-                sprite = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-                sprite.blit(player2_sprite_sheet, (0, 0), (x_offset, row_y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-                sprite = remove_chroma_key(sprite)
-                sprite = pygame.transform.scale(sprite, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-                sprites.append(sprite)
-            return sprites
-        
-        # Row 5 (1-indexed) = y = 4 * 32 = 128 (facing up)
-        GLOVE_PICKUP_ROW_5_Y = 4 * 32
-        glove_pickup_sprites2['up'] = load_glove_row_sprites2(GLOVE_PICKUP_ROW_5_Y)
-        
-        # Row 6 (1-indexed) = y = 5 * 32 = 160 (facing right)
-        GLOVE_PICKUP_ROW_6_Y = 5 * 32
-        glove_pickup_sprites2['right'] = load_glove_row_sprites2(GLOVE_PICKUP_ROW_6_Y)
-        
-        # Row 7 (1-indexed) = y = 6 * 32 = 192 (facing down)
-        GLOVE_PICKUP_ROW_7_Y = 6 * 32
-        glove_pickup_sprites2['down'] = load_glove_row_sprites2(GLOVE_PICKUP_ROW_7_Y)
-        
-        # Row 8 (1-indexed) = y = 7 * 32 = 224 (facing left)
-        GLOVE_PICKUP_ROW_8_Y = 7 * 32
-        glove_pickup_sprites2['left'] = load_glove_row_sprites2(GLOVE_PICKUP_ROW_8_Y)
-        
-        player2_sprite_loaded = True
-        death_sprites2_loaded = True
-        glove_pickup_sprites2_loaded = True
-    except Exception as e:
-        player2_sprite_loaded = False
-        death_sprites2_loaded = False
-        glove_pickup_sprites2_loaded = False
-        print(f"Warning: Could not load player 2 sprite: {e}. Using default circle.")
-    
-    # Load Player 3 sprites from separate file (player 3.png)
-    # Use the same sprite positions as player 1 (rows 1-4)
-    try:
-        old_stderr = sys.stderr
-        sys.stderr = open(os.devnull, 'w')
-        try:
-            player3_sprite_sheet = pygame.image.load(resource_path("player 3.png"))
-        finally:
-            sys.stderr.close()
-            sys.stderr = old_stderr
-        player3_sprite_sheet = player3_sprite_sheet.convert()
-        
-        # Load Player 3 sprites using same positions as Player 1
-        for direction, y_offset in directions.items():
-            direction_sprites = []
-            for frame_name, x_offset in columns.items():
-                sprite = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-                sprite.blit(player3_sprite_sheet, (0, 0), (x_offset, y_offset, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-                
-                # Remove chroma key green background using the helper function
-                sprite = remove_chroma_key(sprite)
-                # Scale player sprite to be 2.5x bigger (maintain 1:2 aspect ratio)
-                # 16x32 becomes 40x80
-                new_width = int(PLAYER_SPRITE_WIDTH * 2.5)
-                new_height = int(PLAYER_SPRITE_HEIGHT * 2.5)
-                sprite = pygame.transform.scale(sprite, (new_width, new_height))
-                direction_sprites.append(sprite)
-            
-            player3_sprites[direction] = direction_sprites  # [idle, walk1, walk2]
-        
-        # Load Player 3 death animation sprites from player3_sprite_sheet using same positions as player 1
-        # Player sprites are 16x32 pixels, rows are 32 pixels apart
-        # Row 11 (1-indexed) = y = 10 * 32 = 320
-        # Row 12 (1-indexed) = y = 11 * 32 = 352
-        # Row 5 (1-indexed) = y = 4 * 32 = 128
-        # Columns are 16 pixels apart
-        # Sprite 1 = x = 0, Sprite 2 = x = 16, Sprite 3 = x = 32, Sprite 4 = x = 48, Sprite 5 = x = 64
-        death_sprites3 = []
-        DEATH_ROW_11_Y = 10 * 32  # Row 11 (1-indexed) = 320
-        DEATH_ROW_12_Y = 11 * 32  # Row 12 (1-indexed) = 352
-        DEATH_ROW_5_Y = 4 * 32    # Row 5 (1-indexed) = 128
-        
-        # Front facing: row 11, sprite 1 (x=0)
-        front_sprite3 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        front_sprite3.blit(player3_sprite_sheet, (0, 0), (0, DEATH_ROW_11_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        front_sprite3 = remove_chroma_key(front_sprite3)
-        front_sprite3 = pygame.transform.scale(front_sprite3, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        death_sprites3.append(front_sprite3)
-        
-        # Right facing: row 11, sprite 2 (x=16)
-        right_sprite3 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        right_sprite3.blit(player3_sprite_sheet, (0, 0), (16, DEATH_ROW_11_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        right_sprite3 = remove_chroma_key(right_sprite3)
-        right_sprite3 = pygame.transform.scale(right_sprite3, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        death_sprites3.append(right_sprite3)
-        
-        # Back facing: row 5, sprite 1 (x=0)
-        back_sprite3 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        back_sprite3.blit(player3_sprite_sheet, (0, 0), (0, DEATH_ROW_5_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        back_sprite3 = remove_chroma_key(back_sprite3)
-        back_sprite3 = pygame.transform.scale(back_sprite3, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        death_sprites3.append(back_sprite3)
-        
-        # Left facing: row 11, sprite 3 (x=32)
-        left_sprite3 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        left_sprite3.blit(player3_sprite_sheet, (0, 0), (32, DEATH_ROW_11_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        left_sprite3 = remove_chroma_key(left_sprite3)
-        left_sprite3 = pygame.transform.scale(left_sprite3, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        death_sprites3.append(left_sprite3)
-        
-        # Additional death animation sprites
-        # Row 11, sprite 4 (x=48)
-        row11_sprite4_3 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row11_sprite4_3.blit(player3_sprite_sheet, (0, 0), (48, DEATH_ROW_11_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row11_sprite4_3 = remove_chroma_key(row11_sprite4_3)
-        row11_sprite4_3 = pygame.transform.scale(row11_sprite4_3, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        death_sprites3.append(row11_sprite4_3)
-        
-        # Row 12, sprite 1 (x=0)
-        row12_sprite1_3 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row12_sprite1_3.blit(player3_sprite_sheet, (0, 0), (0, DEATH_ROW_12_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row12_sprite1_3 = remove_chroma_key(row12_sprite1_3)
-        row12_sprite1_3 = pygame.transform.scale(row12_sprite1_3, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        death_sprites3.append(row12_sprite1_3)
-        
-        # Row 12, sprite 2 (x=16)
-        row12_sprite2_3 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row12_sprite2_3.blit(player3_sprite_sheet, (0, 0), (16, DEATH_ROW_12_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row12_sprite2_3 = remove_chroma_key(row12_sprite2_3)
-        row12_sprite2_3 = pygame.transform.scale(row12_sprite2_3, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        death_sprites3.append(row12_sprite2_3)
-        
-        # Row 12, sprite 3 (x=32)
-        row12_sprite3_3 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row12_sprite3_3.blit(player3_sprite_sheet, (0, 0), (32, DEATH_ROW_12_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row12_sprite3_3 = remove_chroma_key(row12_sprite3_3)
-        row12_sprite3_3 = pygame.transform.scale(row12_sprite3_3, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        death_sprites3.append(row12_sprite3_3)
-        
-        # Row 12, sprite 4 (x=48)
-        row12_sprite4_3 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row12_sprite4_3.blit(player3_sprite_sheet, (0, 0), (48, DEATH_ROW_12_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row12_sprite4_3 = remove_chroma_key(row12_sprite4_3)
-        row12_sprite4_3 = pygame.transform.scale(row12_sprite4_3, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        death_sprites3.append(row12_sprite4_3)
-        
-        # Row 12, sprite 5 (x=64)
-        row12_sprite5_3 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row12_sprite5_3.blit(player3_sprite_sheet, (0, 0), (64, DEATH_ROW_12_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row12_sprite5_3 = remove_chroma_key(row12_sprite5_3)
-        row12_sprite5_3 = pygame.transform.scale(row12_sprite5_3, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        death_sprites3.append(row12_sprite5_3)
-        
-        # Load Player 3 glove pickup animation sprites from player3_sprite_sheet using same positions as player 1
-        # Dictionary: 'up', 'right', 'down', 'left' -> list of sprites [sprite1, sprite2, sprite3, sprite4]
-        # Sprites: 1 = x=0, 2 = x=16, 3 = x=32, 4 = x=48
-        glove_pickup_sprites3 = {}
-        
-        # Helper function to load sprites from a row for player 3
-        def load_glove_row_sprites3(row_y):
-            sprites = []
-            for sprite_num in range(1, 5):  # Sprites 1-4
-                x_offset = (sprite_num - 1) * 16  # x=0, 16, 32, 48
-                sprite = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-                sprite.blit(player3_sprite_sheet, (0, 0), (x_offset, row_y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-                sprite = remove_chroma_key(sprite)
-                sprite = pygame.transform.scale(sprite, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-                sprites.append(sprite)
-            return sprites
-        
-        # Row 5 (1-indexed) = y = 4 * 32 = 128 (facing up)
-        GLOVE_PICKUP_ROW_5_Y = 4 * 32
-        glove_pickup_sprites3['up'] = load_glove_row_sprites3(GLOVE_PICKUP_ROW_5_Y)
-        
-        # Row 6 (1-indexed) = y = 5 * 32 = 160 (facing right)
-        GLOVE_PICKUP_ROW_6_Y = 5 * 32
-        glove_pickup_sprites3['right'] = load_glove_row_sprites3(GLOVE_PICKUP_ROW_6_Y)
-        
-        # Row 7 (1-indexed) = y = 6 * 32 = 192 (facing down)
-        GLOVE_PICKUP_ROW_7_Y = 6 * 32
-        glove_pickup_sprites3['down'] = load_glove_row_sprites3(GLOVE_PICKUP_ROW_7_Y)
-        
-        # Row 8 (1-indexed) = y = 7 * 32 = 224 (facing left)
-        GLOVE_PICKUP_ROW_8_Y = 7 * 32
-        glove_pickup_sprites3['left'] = load_glove_row_sprites3(GLOVE_PICKUP_ROW_8_Y)
-        
-        player3_sprite_loaded = True
-        death_sprites3_loaded = True
-        glove_pickup_sprites3_loaded = True
-    except Exception as e:
-        player3_sprite_loaded = False
-        death_sprites3_loaded = False
-        glove_pickup_sprites3_loaded = False
-        print(f"Warning: Could not load player 3 sprite: {e}. Using default circle.")
-    
-    # Load Player 4 sprites from separate file (player 4.png)
-    # Use the same sprite positions as player 1 (rows 1-4)
-    try:
-        old_stderr = sys.stderr
-        sys.stderr = open(os.devnull, 'w')
-        try:
-            player4_sprite_sheet = pygame.image.load(resource_path("player 4.png"))
-        finally:
-            sys.stderr.close()
-            sys.stderr = old_stderr
-        player4_sprite_sheet = player4_sprite_sheet.convert()
-        
-        # Load Player 4 sprites using same positions as Player 1
-        for direction, y_offset in directions.items():
-            direction_sprites = []
-            for frame_name, x_offset in columns.items():
-                sprite = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-                sprite.blit(player4_sprite_sheet, (0, 0), (x_offset, y_offset, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-                
-                # Remove chroma key green background using the helper function
-                sprite = remove_chroma_key(sprite)
-                # Scale player sprite to be 2.5x bigger (maintain 1:2 aspect ratio)
-                # 16x32 becomes 40x80
-                new_width = int(PLAYER_SPRITE_WIDTH * 2.5)
-                new_height = int(PLAYER_SPRITE_HEIGHT * 2.5)
-                sprite = pygame.transform.scale(sprite, (new_width, new_height))
-                direction_sprites.append(sprite)
-            
-            player4_sprites[direction] = direction_sprites  # [idle, walk1, walk2]
-        
-        # Load Player 4 death animation sprites from player4_sprite_sheet using same positions as player 1
-        # Player sprites are 16x32 pixels, rows are 32 pixels apart
-        # Row 11 (1-indexed) = y = 10 * 32 = 320
-        # Row 12 (1-indexed) = y = 11 * 32 = 352
-        # Row 5 (1-indexed) = y = 4 * 32 = 128
-        # Columns are 16 pixels apart
-        # Sprite 1 = x = 0, Sprite 2 = x = 16, Sprite 3 = x = 32, Sprite 4 = x = 48, Sprite 5 = x = 64
-        death_sprites4 = []
-        DEATH_ROW_11_Y = 10 * 32  # Row 11 (1-indexed) = 320
-        DEATH_ROW_12_Y = 11 * 32  # Row 12 (1-indexed) = 352
-        DEATH_ROW_5_Y = 4 * 32    # Row 5 (1-indexed) = 128
-        
-        # Front facing: row 11, sprite 1 (x=0)
-        front_sprite4 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        front_sprite4.blit(player4_sprite_sheet, (0, 0), (0, DEATH_ROW_11_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        front_sprite4 = remove_chroma_key(front_sprite4)
-        front_sprite4 = pygame.transform.scale(front_sprite4, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        death_sprites4.append(front_sprite4)
-        
-        # Right facing: row 11, sprite 2 (x=16)
-        right_sprite4 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        right_sprite4.blit(player4_sprite_sheet, (0, 0), (16, DEATH_ROW_11_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        right_sprite4 = remove_chroma_key(right_sprite4)
-        right_sprite4 = pygame.transform.scale(right_sprite4, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        death_sprites4.append(right_sprite4)
-        
-        # Back facing: row 5, sprite 1 (x=0)
-        back_sprite4 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        back_sprite4.blit(player4_sprite_sheet, (0, 0), (0, DEATH_ROW_5_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        back_sprite4 = remove_chroma_key(back_sprite4)
-        back_sprite4 = pygame.transform.scale(back_sprite4, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        death_sprites4.append(back_sprite4)
-        
-        # Left facing: row 11, sprite 3 (x=32)
-        left_sprite4 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        left_sprite4.blit(player4_sprite_sheet, (0, 0), (32, DEATH_ROW_11_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        left_sprite4 = remove_chroma_key(left_sprite4)
-        left_sprite4 = pygame.transform.scale(left_sprite4, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        death_sprites4.append(left_sprite4)
-        
-        # Additional death animation sprites
-        # Row 11, sprite 4 (x=48)
-        row11_sprite4_4 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row11_sprite4_4.blit(player4_sprite_sheet, (0, 0), (48, DEATH_ROW_11_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row11_sprite4_4 = remove_chroma_key(row11_sprite4_4)
-        row11_sprite4_4 = pygame.transform.scale(row11_sprite4_4, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        death_sprites4.append(row11_sprite4_4)
-        
-        # Row 12, sprite 1 (x=0)
-        row12_sprite1_4 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row12_sprite1_4.blit(player4_sprite_sheet, (0, 0), (0, DEATH_ROW_12_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row12_sprite1_4 = remove_chroma_key(row12_sprite1_4)
-        row12_sprite1_4 = pygame.transform.scale(row12_sprite1_4, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        death_sprites4.append(row12_sprite1_4)
-        
-        # Row 12, sprite 2 (x=16)
-        row12_sprite2_4 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row12_sprite2_4.blit(player4_sprite_sheet, (0, 0), (16, DEATH_ROW_12_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row12_sprite2_4 = remove_chroma_key(row12_sprite2_4)
-        row12_sprite2_4 = pygame.transform.scale(row12_sprite2_4, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        death_sprites4.append(row12_sprite2_4)
-        
-        # Row 12, sprite 3 (x=32)
-        row12_sprite3_4 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row12_sprite3_4.blit(player4_sprite_sheet, (0, 0), (32, DEATH_ROW_12_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row12_sprite3_4 = remove_chroma_key(row12_sprite3_4)
-        row12_sprite3_4 = pygame.transform.scale(row12_sprite3_4, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        death_sprites4.append(row12_sprite3_4)
-        
-        # Row 12, sprite 4 (x=48)
-        row12_sprite4_4 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row12_sprite4_4.blit(player4_sprite_sheet, (0, 0), (48, DEATH_ROW_12_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row12_sprite4_4 = remove_chroma_key(row12_sprite4_4)
-        row12_sprite4_4 = pygame.transform.scale(row12_sprite4_4, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        death_sprites4.append(row12_sprite4_4)
-        
-        # Row 12, sprite 5 (x=64)
-        row12_sprite5_4 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row12_sprite5_4.blit(player4_sprite_sheet, (0, 0), (64, DEATH_ROW_12_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row12_sprite5_4 = remove_chroma_key(row12_sprite5_4)
-        row12_sprite5_4 = pygame.transform.scale(row12_sprite5_4, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        death_sprites4.append(row12_sprite5_4)
-        
-        # Load Player 4 glove pickup animation sprites from player4_sprite_sheet using same positions as player 1
-        # Dictionary: 'up', 'right', 'down', 'left' -> list of sprites [sprite1, sprite2, sprite3, sprite4]
-        # Sprites: 1 = x=0, 2 = x=16, 3 = x=32, 4 = x=48
-        glove_pickup_sprites4 = {}
-        
-        # Helper function to load sprites from a row for player 4
-        def load_glove_row_sprites4(row_y):
-            sprites = []
-            for sprite_num in range(1, 5):  # Sprites 1-4
-                x_offset = (sprite_num - 1) * 16  # x=0, 16, 32, 48
-                sprite = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-                sprite.blit(player4_sprite_sheet, (0, 0), (x_offset, row_y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-                sprite = remove_chroma_key(sprite)
-                sprite = pygame.transform.scale(sprite, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-                sprites.append(sprite)
-            return sprites
-        
-        # Row 5 (1-indexed) = y = 4 * 32 = 128 (facing up)
-        GLOVE_PICKUP_ROW_5_Y = 4 * 32
-        glove_pickup_sprites4['up'] = load_glove_row_sprites4(GLOVE_PICKUP_ROW_5_Y)
-        
-        # Row 6 (1-indexed) = y = 5 * 32 = 160 (facing right)
-        GLOVE_PICKUP_ROW_6_Y = 5 * 32
-        glove_pickup_sprites4['right'] = load_glove_row_sprites4(GLOVE_PICKUP_ROW_6_Y)
-        
-        # Row 7 (1-indexed) = y = 6 * 32 = 192 (facing down)
-        GLOVE_PICKUP_ROW_7_Y = 6 * 32
-        glove_pickup_sprites4['down'] = load_glove_row_sprites4(GLOVE_PICKUP_ROW_7_Y)
-        
-        # Row 8 (1-indexed) = y = 7 * 32 = 224 (facing left)
-        GLOVE_PICKUP_ROW_8_Y = 7 * 32
-        glove_pickup_sprites4['left'] = load_glove_row_sprites4(GLOVE_PICKUP_ROW_8_Y)
-        
-        player4_sprite_loaded = True
-        death_sprites4_loaded = True
-        glove_pickup_sprites4_loaded = True
-    except Exception as e:
-        player4_sprite_loaded = False
-        death_sprites4_loaded = False
-        glove_pickup_sprites4_loaded = False
-        print(f"Warning: Could not load player 4 sprite: {e}. Using default circle.")
-    
-    # Load death animation sprites
-    # Player sprites are 16x32 pixels, rows are 32 pixels apart
-    # Row 11 (1-indexed) = y = 10 * 32 = 320
-    # Row 12 (1-indexed) = y = 11 * 32 = 352
-    # Row 5 (1-indexed) = y = 4 * 32 = 128
-    # Columns are 16 pixels apart
-    # Sprite 1 = x = 0, Sprite 2 = x = 16, Sprite 3 = x = 32, Sprite 4 = x = 48, Sprite 5 = x = 64
-    death_sprites = []
-    DEATH_ROW_11_Y = 10 * 32  # Row 11 (1-indexed) = 320
-    DEATH_ROW_12_Y = 11 * 32  # Row 12 (1-indexed) = 352
-    DEATH_ROW_5_Y = 4 * 32    # Row 5 (1-indexed) = 128
-    
-    # Front facing: row 11, sprite 1 (x=0)
-    front_sprite = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-    front_sprite.blit(player_sprite_sheet, (0, 0), (0, DEATH_ROW_11_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-    front_sprite = remove_chroma_key(front_sprite)
-    front_sprite = pygame.transform.scale(front_sprite, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-    death_sprites.append(front_sprite)
-    
-    # Right facing: row 11, sprite 2 (x=16)
-    right_sprite = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-    right_sprite.blit(player_sprite_sheet, (0, 0), (16, DEATH_ROW_11_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-    right_sprite = remove_chroma_key(right_sprite)
-    right_sprite = pygame.transform.scale(right_sprite, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-    death_sprites.append(right_sprite)
-    
-    # Back facing: row 5, sprite 1 (x=0)
-    back_sprite = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-    back_sprite.blit(player_sprite_sheet, (0, 0), (0, DEATH_ROW_5_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-    back_sprite = remove_chroma_key(back_sprite)
-    back_sprite = pygame.transform.scale(back_sprite, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-    death_sprites.append(back_sprite)
-    
-    # Left facing: row 11, sprite 3 (x=32)
-    left_sprite = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-    left_sprite.blit(player_sprite_sheet, (0, 0), (32, DEATH_ROW_11_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-    left_sprite = remove_chroma_key(left_sprite)
-    left_sprite = pygame.transform.scale(left_sprite, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-    death_sprites.append(left_sprite)
-    
-    # Additional death animation sprites
-    # Row 11, sprite 4 (x=48)
-    row11_sprite4 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-    row11_sprite4.blit(player_sprite_sheet, (0, 0), (48, DEATH_ROW_11_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-    row11_sprite4 = remove_chroma_key(row11_sprite4)
-    row11_sprite4 = pygame.transform.scale(row11_sprite4, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-    death_sprites.append(row11_sprite4)
-    
-    # Row 12, sprite 1 (x=0)
-    row12_sprite1 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-    row12_sprite1.blit(player_sprite_sheet, (0, 0), (0, DEATH_ROW_12_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-    row12_sprite1 = remove_chroma_key(row12_sprite1)
-    row12_sprite1 = pygame.transform.scale(row12_sprite1, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-    death_sprites.append(row12_sprite1)
-    
-    # Row 12, sprite 2 (x=16)
-    row12_sprite2 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-    row12_sprite2.blit(player_sprite_sheet, (0, 0), (16, DEATH_ROW_12_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-    row12_sprite2 = remove_chroma_key(row12_sprite2)
-    row12_sprite2 = pygame.transform.scale(row12_sprite2, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-    death_sprites.append(row12_sprite2)
-    
-    # Row 12, sprite 3 (x=32)
-    row12_sprite3 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-    row12_sprite3.blit(player_sprite_sheet, (0, 0), (32, DEATH_ROW_12_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-    row12_sprite3 = remove_chroma_key(row12_sprite3)
-    row12_sprite3 = pygame.transform.scale(row12_sprite3, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-    death_sprites.append(row12_sprite3)
-    
-    # Row 12, sprite 4 (x=48)
-    row12_sprite4 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-    row12_sprite4.blit(player_sprite_sheet, (0, 0), (48, DEATH_ROW_12_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-    row12_sprite4 = remove_chroma_key(row12_sprite4)
-    row12_sprite4 = pygame.transform.scale(row12_sprite4, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-    death_sprites.append(row12_sprite4)
-    
-    # Row 12, sprite 5 (x=64)
-    row12_sprite5 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-    row12_sprite5.blit(player_sprite_sheet, (0, 0), (64, DEATH_ROW_12_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-    row12_sprite5 = remove_chroma_key(row12_sprite5)
-    row12_sprite5 = pygame.transform.scale(row12_sprite5, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-    death_sprites.append(row12_sprite5)
-    
-    # Load glove pickup animation sprites for all directions
-    # Dictionary: 'up', 'right', 'down', 'left' -> list of sprites [sprite1, sprite2, sprite3, sprite4]
-    # Sprites: 1 = x=0, 2 = x=16, 3 = x=32, 4 = x=48
-    glove_pickup_sprites = {}
-    
-    # Helper function to load sprites from a row
-    def load_glove_row_sprites(row_y):
-        sprites = []
-        for sprite_num in range(1, 5):  # Sprites 1-4
-            x_offset = (sprite_num - 1) * 16  # x=0, 16, 32, 48
-            sprite = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-            sprite.blit(player_sprite_sheet, (0, 0), (x_offset, row_y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-            sprite = remove_chroma_key(sprite)
-            sprite = pygame.transform.scale(sprite, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-            sprites.append(sprite)
-        return sprites
-    
-    # Row 5 (1-indexed) = y = 4 * 32 = 128 (facing up)
-    GLOVE_PICKUP_ROW_5_Y = 4 * 32
-    glove_pickup_sprites['up'] = load_glove_row_sprites(GLOVE_PICKUP_ROW_5_Y)
-    
-    # Row 6 (1-indexed) = y = 5 * 32 = 160 (facing right)
-    GLOVE_PICKUP_ROW_6_Y = 5 * 32
-    glove_pickup_sprites['right'] = load_glove_row_sprites(GLOVE_PICKUP_ROW_6_Y)
-    
-    # Row 7 (1-indexed) = y = 6 * 32 = 192 (facing down)
-    GLOVE_PICKUP_ROW_7_Y = 6 * 32
-    glove_pickup_sprites['down'] = load_glove_row_sprites(GLOVE_PICKUP_ROW_7_Y)
-    
-    # Row 8 (1-indexed) = y = 7 * 32 = 224 (facing left)
-    GLOVE_PICKUP_ROW_8_Y = 7 * 32
-    glove_pickup_sprites['left'] = load_glove_row_sprites(GLOVE_PICKUP_ROW_8_Y)
-    
-    glove_pickup_sprites_loaded = True
-    
-except Exception as e:
-    player_sprite_loaded = False
-    death_sprites = []
-    glove_pickup_sprites = {}
-    glove_pickup_sprites_loaded = False
-    print(f"Warning: Could not load player sprite: {e}. Using default circle.")
-
-# Initialize death_sprites as empty list if not loaded
-if 'death_sprites' not in globals():
-    death_sprites = []
-
-# Initialize player 2 death and glove pickup sprites
-if 'death_sprites2' not in globals():
-    death_sprites2 = []
-if 'glove_pickup_sprites2' not in globals():
-    glove_pickup_sprites2 = {}
-if 'death_sprites2_loaded' not in globals():
-    death_sprites2_loaded = False
-if 'glove_pickup_sprites2_loaded' not in globals():
-    glove_pickup_sprites2_loaded = False
-
-# Initialize player 3 death and glove pickup sprites
-if 'death_sprites3' not in globals():
-    death_sprites3 = []
-if 'glove_pickup_sprites3' not in globals():
-    glove_pickup_sprites3 = {}
-if 'death_sprites3_loaded' not in globals():
-    death_sprites3_loaded = False
-if 'glove_pickup_sprites3_loaded' not in globals():
-    glove_pickup_sprites3_loaded = False
-
-# Initialize player 4 death and glove pickup sprites
-if 'death_sprites4' not in globals():
-    death_sprites4 = []
-if 'glove_pickup_sprites4' not in globals():
-    glove_pickup_sprites4 = {}
-if 'death_sprites4_loaded' not in globals():
-    death_sprites4_loaded = False
-if 'glove_pickup_sprites4_loaded' not in globals():
-    glove_pickup_sprites4_loaded = False
-
-# Initialize glove_pickup_sprites as empty dictionary if not loaded
-if 'glove_pickup_sprites' not in globals():
-    glove_pickup_sprites = {}
-    glove_pickup_sprites_loaded = False
-
-# Load skull sprites for all players
+
+# Death animation sprites are cut the first time a player dies (see get_lazy_sprites)
+death_sprites2_loaded = False
+death_sprites3_loaded = False
+death_sprites4_loaded = False
+
+# Glove pickup animation sprites
+# Dictionary: 'up', 'right', 'down', 'left' -> list of sprites [sprite1, sprite2, sprite3, sprite4]
+glove_pickup_sprites = {}
+glove_pickup_sprites2 = {}
+glove_pickup_sprites3 = {}
+glove_pickup_sprites4 = {}
+glove_pickup_sprites_loaded = False
+glove_pickup_sprites2_loaded = False
+glove_pickup_sprites3_loaded = False
+glove_pickup_sprites4_loaded = False
+
+# Skull sprites for all players (skull death and glove pickup sprites are cut on first use)
 skull_sprites = {}  # Dictionary for player 1 skull sprites
 skull_sprites2 = {}  # Dictionary for player 2 skull sprites
 skull_sprites3 = {}  # Dictionary for player 3 skull sprites
@@ -1372,228 +1147,8 @@ skull_sprite2_loaded = False
 skull_sprite3_loaded = False
 skull_sprite4_loaded = False
 
-try:
-    # Suppress libpng warnings about incorrect sRGB profile
-    old_stderr = sys.stderr
-    sys.stderr = open(os.devnull, 'w')
-    try:
-        skull_sprite_sheet = pygame.image.load(resource_path("player skull.png"))
-    finally:
-        sys.stderr.close()
-        sys.stderr = old_stderr
-    skull_sprite_sheet = skull_sprite_sheet.convert()
-    
-    # Load skull sprites using same structure as normal player sprites
-    # Rows: 1st row (y=0) = up, 2nd row (y=32) = right, 3rd row (y=64) = down, 4th row (y=96) = left
-    # Columns: 1st column (x=0) = idle, 2nd column (x=16) = walk frame 1, 3rd column (x=32) = walk frame 2
-    directions = {
-        'up': 0,      # Row 1: y = 0
-        'right': 32,  # Row 2: y = 32
-        'down': 64,   # Row 3: y = 64
-        'left': 96    # Row 4: y = 96
-    }
-    
-    columns = {
-        'idle': 0,    # Column 1: x = 0
-        'walk1': 16,  # Column 2: x = 16
-        'walk2': 32   # Column 3: x = 32
-    }
-    
-    # Load skull sprites for all players (using same sprite sheet for all)
-    for player_num in [1, 2, 3, 4]:
-        player_skull_sprites = {}
-        for direction, y_offset in directions.items():
-            direction_sprites = []
-            for frame_name, x_offset in columns.items():
-                sprite = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-                sprite.blit(skull_sprite_sheet, (0, 0), (x_offset, y_offset, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-                
-                # Remove chroma key green background using the helper function
-                sprite = remove_chroma_key(sprite)
-                # Scale player sprite to be 2.5x bigger (maintain 1:2 aspect ratio)
-                # 16x32 becomes 40x80
-                new_width = int(PLAYER_SPRITE_WIDTH * 2.5)
-                new_height = int(PLAYER_SPRITE_HEIGHT * 2.5)
-                sprite = pygame.transform.scale(sprite, (new_width, new_height))
-                direction_sprites.append(sprite)
-            
-            player_skull_sprites[direction] = direction_sprites  # [idle, walk1, walk2]
-        
-        # Assign to appropriate player
-        if player_num == 1:
-            skull_sprites = player_skull_sprites
-            skull_sprite_loaded = True
-        elif player_num == 2:
-            skull_sprites2 = player_skull_sprites
-            skull_sprite2_loaded = True
-        elif player_num == 3:
-            skull_sprites3 = player_skull_sprites
-            skull_sprite3_loaded = True
-        elif player_num == 4:
-            skull_sprites4 = player_skull_sprites
-            skull_sprite4_loaded = True
-    
-    # Load skull death sprites (using same positions as normal death sprites)
-    skull_death_sprites = []
-    skull_death_sprites2 = []
-    skull_death_sprites3 = []
-    skull_death_sprites4 = []
-    
-    DEATH_ROW_11_Y = 10 * 32
-    DEATH_ROW_12_Y = 11 * 32
-    DEATH_ROW_5_Y = 4 * 32
-    
-    # Load death sprites for all players
-    for player_num in [1, 2, 3, 4]:
-        player_skull_death_sprites = []
-        
-        # Front sprite (row 11, sprite 1)
-        front_sprite = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        front_sprite.blit(skull_sprite_sheet, (0, 0), (0, DEATH_ROW_11_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        front_sprite = remove_chroma_key(front_sprite)
-        front_sprite = pygame.transform.scale(front_sprite, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        player_skull_death_sprites.append(front_sprite)
-        
-        # Right sprite (row 11, sprite 2)
-        right_sprite = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        right_sprite.blit(skull_sprite_sheet, (0, 0), (16, DEATH_ROW_11_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        right_sprite = remove_chroma_key(right_sprite)
-        right_sprite = pygame.transform.scale(right_sprite, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        player_skull_death_sprites.append(right_sprite)
-        
-        # Back sprite (row 5, sprite 1)
-        back_sprite = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        back_sprite.blit(skull_sprite_sheet, (0, 0), (0, DEATH_ROW_5_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        back_sprite = remove_chroma_key(back_sprite)
-        back_sprite = pygame.transform.scale(back_sprite, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        player_skull_death_sprites.append(back_sprite)
-        
-        # Left sprite (row 11, sprite 3)
-        left_sprite = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        left_sprite.blit(skull_sprite_sheet, (0, 0), (32, DEATH_ROW_11_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        left_sprite = remove_chroma_key(left_sprite)
-        left_sprite = pygame.transform.scale(left_sprite, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        player_skull_death_sprites.append(left_sprite)
-        
-        # Row 11, sprite 4
-        row11_sprite4 = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row11_sprite4.blit(skull_sprite_sheet, (0, 0), (48, DEATH_ROW_11_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-        row11_sprite4 = remove_chroma_key(row11_sprite4)
-        row11_sprite4 = pygame.transform.scale(row11_sprite4, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-        player_skull_death_sprites.append(row11_sprite4)
-        
-        # Row 12 sprites
-        for x_offset in [0, 16, 32, 48, 64]:
-            row12_sprite = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-            row12_sprite.blit(skull_sprite_sheet, (0, 0), (x_offset, DEATH_ROW_12_Y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-            row12_sprite = remove_chroma_key(row12_sprite)
-            row12_sprite = pygame.transform.scale(row12_sprite, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-            player_skull_death_sprites.append(row12_sprite)
-        
-        # Assign to appropriate player
-        if player_num == 1:
-            skull_death_sprites = player_skull_death_sprites
-        elif player_num == 2:
-            skull_death_sprites2 = player_skull_death_sprites
-        elif player_num == 3:
-            skull_death_sprites3 = player_skull_death_sprites
-        elif player_num == 4:
-            skull_death_sprites4 = player_skull_death_sprites
-    
-    # Load skull glove pickup sprites (using same positions as normal glove pickup sprites)
-    skull_glove_pickup_sprites = {}
-    skull_glove_pickup_sprites2 = {}
-    skull_glove_pickup_sprites3 = {}
-    skull_glove_pickup_sprites4 = {}
-    
-    # Glove pickup animation rows: 5, 6, 7, 8 (for up, right, down, left)
-    glove_rows = {
-        'up': 4 * 32,      # Row 5: y = 128
-        'right': 5 * 32,   # Row 6: y = 160
-        'down': 6 * 32,    # Row 7: y = 192
-        'left': 7 * 32     # Row 8: y = 224
-    }
-    
-    for player_num in [1, 2, 3, 4]:
-        player_skull_glove_sprites = {}
-        for direction, row_y in glove_rows.items():
-            direction_sprites = []
-            for x_offset in [0, 16, 32, 48]:  # 4 sprites per direction
-                sprite = pygame.Surface((PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-                sprite.blit(skull_sprite_sheet, (0, 0), (x_offset, row_y, PLAYER_SPRITE_WIDTH, PLAYER_SPRITE_HEIGHT))
-                sprite = remove_chroma_key(sprite)
-                sprite = pygame.transform.scale(sprite, (int(PLAYER_SPRITE_WIDTH * 2.5), int(PLAYER_SPRITE_HEIGHT * 2.5)))
-                direction_sprites.append(sprite)
-            player_skull_glove_sprites[direction] = direction_sprites
-        
-        # Assign to appropriate player
-        if player_num == 1:
-            skull_glove_pickup_sprites = player_skull_glove_sprites
-        elif player_num == 2:
-            skull_glove_pickup_sprites2 = player_skull_glove_sprites
-        elif player_num == 3:
-            skull_glove_pickup_sprites3 = player_skull_glove_sprites
-        elif player_num == 4:
-            skull_glove_pickup_sprites4 = player_skull_glove_sprites
-            
-except Exception as e:
-    skull_sprite_loaded = False
-    skull_sprite2_loaded = False
-    skull_sprite3_loaded = False
-    skull_sprite4_loaded = False
-    print(f"Warning: Could not load skull sprites: {e}")
-
-# Create player instances after sprite loading
-# Player 1 spawns at top-left (1, 1)
-player1 = Player(1 * CELL_SIZE + CELL_SIZE // 2, 1 * CELL_SIZE + CELL_SIZE // 2, 1, player_sprites if player_sprite_loaded else {})
-# Player 2 spawns at bottom-right (GRID_WIDTH - 2, GRID_HEIGHT - 2)
-player2 = Player((GRID_WIDTH - 2) * CELL_SIZE + CELL_SIZE // 2, (GRID_HEIGHT - 2) * CELL_SIZE + CELL_SIZE // 2, 2, player2_sprites if player2_sprite_loaded else {})
-# Player 3 spawns at top-right (GRID_WIDTH - 2, 1)
-player3 = Player((GRID_WIDTH - 2) * CELL_SIZE + CELL_SIZE // 2, 1 * CELL_SIZE + CELL_SIZE // 2, 3, player3_sprites if player3_sprite_loaded else {})
-# Player 4 spawns at bottom-left (1, GRID_HEIGHT - 2)
-player4 = Player(1 * CELL_SIZE + CELL_SIZE // 2, (GRID_HEIGHT - 2) * CELL_SIZE + CELL_SIZE // 2, 4, player4_sprites if player4_sprite_loaded else {})
-
-# Load pause image
-pause_image = None
-pause_image_loaded = False
-try:
-    # Suppress libpng warnings about incorrect sRGB profile
-    old_stderr = sys.stderr
-    sys.stderr = open(os.devnull, 'w')
-    try:
-        pause_image = pygame.image.load(resource_path("pause.png"))
-        pause_image = pause_image.convert_alpha()  # Preserve transparency
-        pause_image_loaded = True
-    finally:
-        sys.stderr.close()
-        sys.stderr = old_stderr
-except Exception as e:
-    pause_image_loaded = False
-    print(f"Warning: Could not load pause image: {e}")
-
-# Load hurry image
-hurry_image = None
-hurry_image_loaded = False
-try:
-    # Suppress libpng warnings about incorrect sRGB profile
-    old_stderr = sys.stderr
-    sys.stderr = open(os.devnull, 'w')
-    try:
-        hurry_image = pygame.image.load(resource_path("hurry.png"))
-    finally:
-        sys.stderr.close()
-        sys.stderr = old_stderr
-    hurry_image = hurry_image.convert_alpha()  # Preserve transparency
-    # Remove chroma key green background using the helper function
-    hurry_image = remove_chroma_key(hurry_image)
-    hurry_image_loaded = True
-except Exception as e:
-    hurry_image_loaded = False
-    print(f"Warning: Could not load hurry image: {e}")
-
-# Load explosion sprites from bomb sprite sheet
-# Player 1 explosions: rows 14-10 (original positions)
-# Player 2 explosions: rows 9-13, columns 9-16
+# Explosion sprites: explosion_sprites[row_index][sprite_type]
+# Row indices: 0 = row 14 (y=208), 1 = row 13 (y=192), 2 = row 12 (y=176), 3 = row 11 (y=160), 4 = row 10 (y=144)
 explosion_sprites = {}  # Player 1 explosion sprites
 explosion2_sprites = {}  # Player 2 explosion sprites
 explosion3_sprites = {}  # Player 3 explosion sprites
@@ -1603,325 +1158,15 @@ explosion2_sprites_loaded = False
 explosion3_sprites_loaded = False
 explosion4_sprites_loaded = False
 
-try:
-    # Load the bomb sprite sheet (which contains explosions)
-    # Suppress libpng warnings about incorrect sRGB profile
-    # Redirect stderr temporarily to suppress libpng warnings
-    old_stderr = sys.stderr
-    sys.stderr = open(os.devnull, 'w')
-    try:
-        explosion_sheet = pygame.image.load(resource_path("SNES - Super Bomberman 2 - Miscellaneous - Bombs.png"))
-    finally:
-        sys.stderr.close()
-        sys.stderr = old_stderr
-    explosion_sheet = explosion_sheet.convert()
-    
-    SPRITE_SIZE = 16
-    
-    # Load Player 1 explosion sprites (original positions)
-    # Extract explosion sprites from rows 14 down to row 10
-    # Original rows were 6 down to 2 (y=80, 64, 48, 32, 16)
-    # 8 rows down (8 * 16 = 128 pixels): y=208, 192, 176, 160, 144
-    # Animation starts at row 14 and works down to row 10
-    # Column 7 (x=96): Center explosion - for bomb tile
-    # Column 6 (x=80): Horizontal segments (left/right arms)
-    # Column 5 (x=64): Vertical segments (up/down arms)
-    # Column 4 (x=48): Right end sprite
-    # Column 3 (x=32): Left end sprite
-    # Column 2 (x=16): Bottom end sprite
-    # Column 1 (x=0): Top end sprite
-    
-    # Store sprites by row: explosion_sprites[row_index][sprite_type]
-    # Row indices: 0 = row 14 (y=208), 1 = row 13 (y=192), 2 = row 12 (y=176), 3 = row 11 (y=160), 4 = row 10 (y=144)
-    explosion_rows_p1 = [208, 192, 176, 160, 144]  # y coordinates for rows 14, 13, 12, 11, 10
-    
-    explosion_types_p1 = {
-        'center': 96,      # Column 7 - 4-way cross explosion
-        'horizontal': 80,  # Column 6 - horizontal segment (left/right)
-        'vertical': 64,    # Column 5 - vertical segment (up/down)
-        'end_right': 48,  # Column 4 - right end
-        'end_left': 32,   # Column 3 - left end
-        'end_down': 16,   # Column 2 - bottom end
-        'end_up': 0,      # Column 1 - top end
-    }
-    
-    # Load Player 1 sprites for each row
-    explosion_sprites = {}  # Will be {row_index: {sprite_type: sprite}}
-    for row_idx, row_y in enumerate(explosion_rows_p1):
-        explosion_sprites[row_idx] = {}
-        for name, sx in explosion_types_p1.items():
-            sprite = pygame.Surface((SPRITE_SIZE, SPRITE_SIZE))
-            sprite.blit(explosion_sheet, (0, 0), (sx, row_y, SPRITE_SIZE, SPRITE_SIZE))
-            sprite = remove_chroma_key(sprite)
-            sprite = pygame.transform.scale(sprite, (CELL_SIZE, CELL_SIZE))
-            explosion_sprites[row_idx][name] = sprite
-    
-    # Create 'vertical_down' and 'vertical_up' aliases for backward compatibility
-    for row_idx in explosion_sprites:
-        explosion_sprites[row_idx]['vertical_down'] = explosion_sprites[row_idx]['vertical']
-        explosion_sprites[row_idx]['vertical_up'] = explosion_sprites[row_idx]['vertical']
-    
-    # Load Player 2 explosion sprites from rows 10-14, columns 9-15
-    # Rows 10-14: y = 144, 160, 176, 192, 208 (same rows as player 1)
-    # Columns 9-15: x = 128, 144, 160, 176, 192, 208, 224
-    # Column 9 (x=128): Top end sprite
-    # Column 10 (x=144): Bottom end sprite
-    # Column 11 (x=160): Left end sprite
-    # Column 12 (x=176): Right end sprite
-    # Column 13 (x=192): Vertical segments (up/down arms)
-    # Column 14 (x=208): Horizontal segments (left/right arms)
-    # Column 15 (x=224): Center explosion - for bomb tile
-    
-    explosion_rows_p2 = [208, 192, 176, 160, 144]  # y coordinates for rows 14, 13, 12, 11, 10 (same as player 1, animation from row 14 down to row 10)
-    
-    explosion_types_p2 = {
-        'end_up': 128,     # Column 9 - top end sprite
-        'end_down': 144,   # Column 10 - bottom end sprite
-        'end_left': 160,   # Column 11 - left end sprite
-        'end_right': 176,  # Column 12 - right end sprite
-        'vertical': 192,   # Column 13 - vertical segment (up/down arms)
-        'horizontal': 208, # Column 14 - horizontal segment (left/right arms)
-        'center': 224,     # Column 15 - 4-way cross explosion
-    }
-    
-    # Load Player 2 sprites for each row
-    explosion2_sprites = {}  # Will be {row_index: {sprite_type: sprite}}
-    for row_idx, row_y in enumerate(explosion_rows_p2):
-        explosion2_sprites[row_idx] = {}
-        for name, sx in explosion_types_p2.items():
-            sprite = pygame.Surface((SPRITE_SIZE, SPRITE_SIZE))
-            sprite.blit(explosion_sheet, (0, 0), (sx, row_y, SPRITE_SIZE, SPRITE_SIZE))
-            sprite = remove_chroma_key(sprite)
-            sprite = pygame.transform.scale(sprite, (CELL_SIZE, CELL_SIZE))
-            explosion2_sprites[row_idx][name] = sprite
-    
-    # Create 'vertical_down' and 'vertical_up' aliases for backward compatibility
-    for row_idx in explosion2_sprites:
-        explosion2_sprites[row_idx]['vertical_down'] = explosion2_sprites[row_idx]['vertical']
-        explosion2_sprites[row_idx]['vertical_up'] = explosion2_sprites[row_idx]['vertical']
-    
-    # Load Player 3 explosion sprites from rows 10-14, columns 16-23 (16 columns to the right of player 1)
-    # Rows 10-14: y = 144, 160, 176, 192, 208 (same rows as player 1)
-    # Columns 16-23: x = 256, 272, 288, 304, 320, 336, 352
-    # Column 16 (x=256): Top end sprite
-    # Column 17 (x=272): Bottom end sprite
-    # Column 18 (x=288): Left end sprite
-    # Column 19 (x=304): Right end sprite
-    # Column 20 (x=320): Vertical segments (up/down arms)
-    # Column 21 (x=336): Horizontal segments (left/right arms)
-    # Column 22 (x=352): Center explosion - for bomb tile
-    
-    explosion_rows_p3 = [208, 192, 176, 160, 144]  # y coordinates for rows 14, 13, 12, 11, 10 (same as player 1)
-    
-    explosion_types_p3 = {
-        'end_up': 256,     # Column 16 - top end sprite
-        'end_down': 272,   # Column 17 - bottom end sprite
-        'end_left': 288,   # Column 18 - left end sprite
-        'end_right': 304,  # Column 19 - right end sprite
-        'vertical': 320,   # Column 20 - vertical segment (up/down arms)
-        'horizontal': 336, # Column 21 - horizontal segment (left/right arms)
-        'center': 352,     # Column 22 - 4-way cross explosion
-    }
-    
-    # Load Player 3 sprites for each row
-    explosion3_sprites = {}  # Will be {row_index: {sprite_type: sprite}}
-    for row_idx, row_y in enumerate(explosion_rows_p3):
-        explosion3_sprites[row_idx] = {}
-        for name, sx in explosion_types_p3.items():
-            sprite = pygame.Surface((SPRITE_SIZE, SPRITE_SIZE))
-            sprite.blit(explosion_sheet, (0, 0), (sx, row_y, SPRITE_SIZE, SPRITE_SIZE))
-            sprite = remove_chroma_key(sprite)
-            sprite = pygame.transform.scale(sprite, (CELL_SIZE, CELL_SIZE))
-            explosion3_sprites[row_idx][name] = sprite
-    
-    # Create 'vertical_down' and 'vertical_up' aliases for backward compatibility
-    for row_idx in explosion3_sprites:
-        explosion3_sprites[row_idx]['vertical_down'] = explosion3_sprites[row_idx]['vertical']
-        explosion3_sprites[row_idx]['vertical_up'] = explosion3_sprites[row_idx]['vertical']
-    
-    # Load Player 4 explosion sprites from rows 10-14, columns 24-31 (24 columns to the right of player 1)
-    # Rows 10-14: y = 144, 160, 176, 192, 208 (same rows as player 1)
-    # Columns 24-31: x = 384, 400, 416, 432, 448, 464, 480
-    # Column 24 (x=384): Top end sprite
-    # Column 25 (x=400): Bottom end sprite
-    # Column 26 (x=416): Left end sprite
-    # Column 27 (x=432): Right end sprite
-    # Column 28 (x=448): Vertical segments (up/down arms)
-    # Column 29 (x=464): Horizontal segments (left/right arms)
-    # Column 30 (x=480): Center explosion - for bomb tile
-    
-    explosion_rows_p4 = [208, 192, 176, 160, 144]  # y coordinates for rows 14, 13, 12, 11, 10 (same as player 1)
-    
-    explosion_types_p4 = {
-        'end_up': 384,     # Column 24 - top end sprite
-        'end_down': 400,   # Column 25 - bottom end sprite
-        'end_left': 416,   # Column 26 - left end sprite
-        'end_right': 432,  # Column 27 - right end sprite
-        'vertical': 448,   # Column 28 - vertical segment (up/down arms)
-        'horizontal': 464, # Column 29 - horizontal segment (left/right arms)
-        'center': 480,     # Column 30 - 4-way cross explosion
-    }
-    
-    # Load Player 4 sprites for each row
-    explosion4_sprites = {}  # Will be {row_index: {sprite_type: sprite}}
-    for row_idx, row_y in enumerate(explosion_rows_p4):
-        explosion4_sprites[row_idx] = {}
-        for name, sx in explosion_types_p4.items():
-            sprite = pygame.Surface((SPRITE_SIZE, SPRITE_SIZE))
-            sprite.blit(explosion_sheet, (0, 0), (sx, row_y, SPRITE_SIZE, SPRITE_SIZE))
-            sprite = remove_chroma_key(sprite)
-            sprite = pygame.transform.scale(sprite, (CELL_SIZE, CELL_SIZE))
-            explosion4_sprites[row_idx][name] = sprite
-    
-    # Create 'vertical_down' and 'vertical_up' aliases for backward compatibility
-    for row_idx in explosion4_sprites:
-        explosion4_sprites[row_idx]['vertical_down'] = explosion4_sprites[row_idx]['vertical']
-        explosion4_sprites[row_idx]['vertical_up'] = explosion4_sprites[row_idx]['vertical']
-    
-    explosion_sprites_loaded = True
-    explosion2_sprites_loaded = True
-    explosion3_sprites_loaded = True
-    explosion4_sprites_loaded = True
-except Exception as e:
-    explosion_sprites_loaded = False
-    explosion2_sprites_loaded = False
-    explosion3_sprites_loaded = False
-    explosion4_sprites_loaded = False
-    print(f"Warning: Could not load explosion sprites: {e}. Using default visualization.")
-
-# Load item explosion animation sprites from Bombs.png sprite sheet
-# Column 16, rows 10-14 (5 animation frames)
+# Item explosion animation sprites (5 animation frames)
 item_explosion_sprites = []
 item_explosion_sprites_loaded = False
-try:
-    # Use the Bombs sprite sheet
-    old_stderr = sys.stderr
-    sys.stderr = open(os.devnull, 'w')
-    try:
-        item_explosion_sheet = pygame.image.load(resource_path("SNES - Super Bomberman 2 - Miscellaneous - Bombs.png"))
-    finally:
-        sys.stderr.close()
-        sys.stderr = old_stderr
-    item_explosion_sheet = item_explosion_sheet.convert()
-    
-    ITEM_EXPLOSION_SPRITE_SIZE = 16
-    ITEM_EXPLOSION_COLUMN_X = 240  # Column 16 (x=240, which is 15 * 16)
-    # 5 sprites from column 16, rows 10-14 (y=144, 160, 176, 192, 208)
-    item_explosion_rows = [144, 160, 176, 192, 208]  # y coordinates for rows 10, 11, 12, 13, 14
-    
-    for row_y in item_explosion_rows:
-        item_sprite = pygame.Surface((ITEM_EXPLOSION_SPRITE_SIZE, ITEM_EXPLOSION_SPRITE_SIZE))
-        item_sprite.blit(item_explosion_sheet, (0, 0), (ITEM_EXPLOSION_COLUMN_X, row_y, ITEM_EXPLOSION_SPRITE_SIZE, ITEM_EXPLOSION_SPRITE_SIZE))
-        
-        # Remove chroma key green background using the helper function
-        item_sprite = remove_chroma_key(item_sprite)
-        
-        # Scale sprite
-        item_sprite = pygame.transform.scale(item_sprite, (CELL_SIZE, CELL_SIZE))
-        item_explosion_sprites.append(item_sprite)
-    
-    item_explosion_sprites_loaded = True
-except Exception as e:
-    item_explosion_sprites_loaded = False
-    print(f"Warning: Could not load item explosion sprites: {e}.")
 
-# Load stage tileset sprites
+# Stage tileset sprites
 tileset_sprites = {}
 tileset_loaded = False
-try:
-    # Suppress libpng warnings about incorrect sRGB profile
-    old_stderr = sys.stderr
-    sys.stderr = open(os.devnull, 'w')
-    try:
-        tileset_sheet = pygame.image.load(resource_path("SNES - Super Bomberman 2 - Tilesets - Battle Game Tiles.png"))
-    finally:
-        sys.stderr.close()
-        sys.stderr = old_stderr
-    tileset_sheet = tileset_sheet.convert_alpha()  # Use convert_alpha to preserve transparency
-    
-    # Blocks are 1:1 ratio (square), 16x16 pixels each on the tileset.
-    # Based on user's coordinates:
-    # 1st block: (0, 14) to (15, 29) - breakable blocks
-    # 2nd block: (17, 14) to (32, 29) - unbreakable blocks  
-    # 4th block: (51, 14) to (66, 29) - empty ground tiles
-    
-    BLOCK_SPRITE_SIZE = 16  # Blocks are 16x16 on the sheet
-    
-    # Extract breakable block sprite (1st block) - full 16x16 sprite at (0, 14)
-    breakable_rect = pygame.Rect(0, 14, BLOCK_SPRITE_SIZE, BLOCK_SPRITE_SIZE)
-    breakable_tile = tileset_sheet.subsurface(breakable_rect).copy()
-    breakable_tile = breakable_tile.convert_alpha()
-    # Verify we got the full sprite
-    if breakable_tile.get_width() != BLOCK_SPRITE_SIZE or breakable_tile.get_height() != BLOCK_SPRITE_SIZE:
-        raise ValueError(f"Breakable tile wrong size: {breakable_tile.get_size()}, expected ({BLOCK_SPRITE_SIZE}, {BLOCK_SPRITE_SIZE})")
-    breakable_tile = pygame.transform.scale(breakable_tile, (CELL_SIZE, CELL_SIZE))
-    tileset_sprites['breakable'] = breakable_tile
-    
-    # Load breaking animation sprites from second row (row 1, y=30)
-    # Extract breaking animation frames from row 1
-    breaking_animation_sprites = []
-    BREAKING_ROW_Y = 30  # Second row (row 0 is y=14, row 1 is y=30)
-    # Load multiple frames from the second row (assuming same x positions as first row)
-    breaking_sprite_positions = [0, 16, 32]  # x coordinates for breaking animation frames
-    for x_pos in breaking_sprite_positions:
-        breaking_sprite = pygame.Surface((BLOCK_SPRITE_SIZE, BLOCK_SPRITE_SIZE))
-        breaking_sprite.blit(tileset_sheet, (0, 0), (x_pos, BREAKING_ROW_Y, BLOCK_SPRITE_SIZE, BLOCK_SPRITE_SIZE))
-        breaking_sprite = breaking_sprite.convert()
-        
-        # Remove chroma key green background using the helper function
-        breaking_sprite = remove_chroma_key(breaking_sprite)
-        
-        if breaking_sprite.get_width() != BLOCK_SPRITE_SIZE or breaking_sprite.get_height() != BLOCK_SPRITE_SIZE:
-            raise ValueError(f"Breaking sprite wrong size: {breaking_sprite.get_size()}, expected ({BLOCK_SPRITE_SIZE}, {BLOCK_SPRITE_SIZE})")
-        breaking_sprite = pygame.transform.scale(breaking_sprite, (CELL_SIZE, CELL_SIZE))
-        breaking_animation_sprites.append(breaking_sprite)
-    tileset_sprites['breaking'] = breaking_animation_sprites
-    
-    # Extract unbreakable block sprite (2nd block) - full 16x16 sprite at (17, 14)
-    unbreakable_rect = pygame.Rect(17, 14, BLOCK_SPRITE_SIZE, BLOCK_SPRITE_SIZE)
-    unbreakable_tile = tileset_sheet.subsurface(unbreakable_rect).copy()
-    unbreakable_tile = unbreakable_tile.convert_alpha()
-    if unbreakable_tile.get_width() != BLOCK_SPRITE_SIZE or unbreakable_tile.get_height() != BLOCK_SPRITE_SIZE:
-        raise ValueError(f"Unbreakable tile wrong size: {unbreakable_tile.get_size()}, expected ({BLOCK_SPRITE_SIZE}, {BLOCK_SPRITE_SIZE})")
-    unbreakable_tile = pygame.transform.scale(unbreakable_tile, (CELL_SIZE, CELL_SIZE))
-    tileset_sprites['unbreakable'] = unbreakable_tile
-    
-    # Extract ground tile sprite (4th block) - full 16x16 sprite at (51, 14)
-    ground_rect = pygame.Rect(51, 14, BLOCK_SPRITE_SIZE, BLOCK_SPRITE_SIZE)
-    ground_tile = tileset_sheet.subsurface(ground_rect).copy()
-    ground_tile = ground_tile.convert_alpha()
-    if ground_tile.get_width() != BLOCK_SPRITE_SIZE or ground_tile.get_height() != BLOCK_SPRITE_SIZE:
-        raise ValueError(f"Ground tile wrong size: {ground_tile.get_size()}, expected ({BLOCK_SPRITE_SIZE}, {BLOCK_SPRITE_SIZE})")
-    ground_tile = pygame.transform.scale(ground_tile, (CELL_SIZE, CELL_SIZE))
-    tileset_sprites['ground'] = ground_tile
-    
-    # Extract ground tile with wall above sprite (5th block) - full 16x16 sprite at (68, 14)
-    ground_wall_above_rect = pygame.Rect(68, 14, BLOCK_SPRITE_SIZE, BLOCK_SPRITE_SIZE)
-    ground_wall_above_tile = tileset_sheet.subsurface(ground_wall_above_rect).copy()
-    ground_wall_above_tile = ground_wall_above_tile.convert_alpha()
-    if ground_wall_above_tile.get_width() != BLOCK_SPRITE_SIZE or ground_wall_above_tile.get_height() != BLOCK_SPRITE_SIZE:
-        raise ValueError(f"Ground wall above tile wrong size: {ground_wall_above_tile.get_size()}, expected ({BLOCK_SPRITE_SIZE}, {BLOCK_SPRITE_SIZE})")
-    ground_wall_above_tile = pygame.transform.scale(ground_wall_above_tile, (CELL_SIZE, CELL_SIZE))
-    tileset_sprites['ground_wall_above'] = ground_wall_above_tile
-    
-    # Extract sudden death block sprite (next to ground_wall_above) - at (85, 14)
-    # ground_wall_above is at (68, 14), next sprite is at (85, 14) which is 68 + 17
-    sudden_death_rect = pygame.Rect(85, 14, BLOCK_SPRITE_SIZE, BLOCK_SPRITE_SIZE)
-    sudden_death_tile = tileset_sheet.subsurface(sudden_death_rect).copy()
-    sudden_death_tile = sudden_death_tile.convert_alpha()
-    if sudden_death_tile.get_width() != BLOCK_SPRITE_SIZE or sudden_death_tile.get_height() != BLOCK_SPRITE_SIZE:
-        # Fallback: if sprite doesn't exist at that position, use ground_wall_above
-        sudden_death_tile = ground_wall_above_tile.copy()
-    else:
-        sudden_death_tile = pygame.transform.scale(sudden_death_tile, (CELL_SIZE, CELL_SIZE))
-    tileset_sprites['sudden_death'] = sudden_death_tile
-    
-    tileset_loaded = True
-except Exception as e:
-    tileset_loaded = False
-    print(f"Warning: Could not load tileset sprites: {e}. Using default drawing.")
 
-# Load powerup sprites from items spritesheet (blue and red outline versions)
+# Powerup sprites (blue and red outline versions)
 powerup_sprites = []  # List of bomb powerup animation frames [blue, red]
 speed_powerup_sprites = []  # List of speed powerup animation frames [blue, red]
 fire_powerup_sprites = []  # List of fire powerup animation frames [blue, red]
@@ -1935,160 +1180,756 @@ kick_powerup_sprite_loaded = False
 glove_powerup_sprite_loaded = False
 skull_powerup_sprite_loaded = False
 POWERUP_ANIMATION_SPEED = 100  # milliseconds per frame (switches every 100ms for very fast flashing)
-try:
-    # Suppress libpng warnings about incorrect sRGB profile
-    old_stderr = sys.stderr
-    sys.stderr = open(os.devnull, 'w')
+
+def process_powerup_sprite(sprite_surface):
+    """Process a powerup sprite: remove chroma key"""
+    return run_array_process(sprite_surface, process_powerup_sprite_array, process_powerup_sprite_slow, "powerup processing")
+
+def process_powerup_sprite_array(sprite_surface):
+    """Remove a powerup sprite's chroma key using NumPy (same result as process_powerup_sprite_slow)"""
+    # Convert to surface with alpha channel for transparency
+    sprite_surface = sprite_surface.convert_alpha()
+    corner_r, corner_g, corner_b, corner_a = sprite_surface.get_at((0, 0))
+    
+    rgb = get_rgb_array(sprite_surface)
+    r = rgb[:, :, 0]
+    g = rgb[:, :, 1]
+    b = rgb[:, :, 2]
+    
+    # Only the green background goes: pixels matching the (green) corner colour and bright
+    # green pixels. Everything else, including the red/blue outlines, is kept fully opaque.
+    matches_corner = (np.abs(r - corner_r) < 20) & (np.abs(g - corner_g) < 20) & (np.abs(b - corner_b) < 20)
+    is_bright_green = (g > 200) & (r < 150) & (b < 150)
+    return make_keyed_surface(rgb, ~((matches_corner & (corner_g > 150)) | is_bright_green))
+
+def process_powerup_sprite_slow(sprite_surface):
+    """Remove a powerup sprite's chroma key pixel by pixel"""
+    # Convert to surface with alpha channel for transparency
+    sprite_surface = sprite_surface.convert_alpha()
+    
+    # Remove chroma key green background but preserve ALL colored pixels (red/blue outlines)
+    # Only remove pixels that are clearly the green background color
+    corner_color = sprite_surface.get_at((0, 0))
+    corner_r, corner_g, corner_b, corner_a = corner_color
+    
+    result = pygame.Surface(sprite_surface.get_size(), pygame.SRCALPHA)
+    for x in range(sprite_surface.get_width()):
+        for y in range(sprite_surface.get_height()):
+            pixel = sprite_surface.get_at((x, y))
+            r, g, b, a = pixel
+            
+            # Only remove if it's clearly the green background
+            # Check if it matches corner color (the green background)
+            matches_corner = (
+                abs(r - corner_r) < 20 and 
+                abs(g - corner_g) < 20 and 
+                abs(b - corner_b) < 20
+            )
+            
+            # Also check for bright green chroma key colors
+            is_bright_green = (g > 200 and r < 150 and b < 150)
+            
+            # Only remove green background, preserve everything else (including outlines)
+            # Red outlines will have high red values, blue outlines will have high blue values
+            if not (matches_corner and corner_g > 150) and not is_bright_green:
+                result.set_at((x, y), (r, g, b, 255))
+    
+    return result
+
+# Processing steps a manifest sprite set can ask for
+SPRITE_PROCESSES = {
+    "chroma_key": remove_chroma_key,
+    "powerup": process_powerup_sprite,
+    "none": None,
+}
+SPRITE_OPTIONS = ("size", "scale", "process", "alpha_blit")  # Options a part of a sprite set can override
+
+def get_sprite_set_spec(name):
+    """Get a sprite set from the manifest, merged over the layout it uses"""
+    sprite_set = sprite_manifest["sprites"][name]
+    spec = dict(sprite_manifest["layouts"].get(sprite_set.get("layout"), {}))
+    spec.update(sprite_set)
+    return spec
+
+def cut_manifest_sprite(sheet, x, y, options):
+    """Cut, process and scale one frame from a sheet"""
+    width, height = options["size"]
+    scale = options.get("scale")
+    if scale == "cell":
+        size = (CELL_SIZE, CELL_SIZE)
+    elif scale:
+        size = (int(width * scale), int(height * scale))
+    else:
+        size = None
+    if options.get("layout"):
+        return get_layout_sprite(size or (width, height))
+    if size is not None and options.get("native"):
+        # Native resolution copy - the same sprite at NATIVE_TILE_SIZE per cell instead of CELL_SIZE
+        size = (size[0] * NATIVE_TILE_SIZE // CELL_SIZE, size[1] * NATIVE_TILE_SIZE // CELL_SIZE)
+        if size == (width, height):
+            size = None  # Already the size it is on the sheet
+    
+    # Check bounds before extracting
+    sheet_width, sheet_height = sheet.get_size()
+    if x + width > sheet_width or y + height > sheet_height:
+        print(f"Warning: Sprite extraction out of bounds for {sheet.filename} at ({x}, {y})")
+        # Create a blank sprite as fallback
+        return pygame.Surface(size or (width, height), pygame.SRCALPHA)
+    
+    flags = pygame.SRCALPHA if options.get("alpha_blit") else 0
+    process = SPRITE_PROCESSES[options.get("process", "chroma_key")]
+    owner = (options.get("set"), bool(options.get("native")))
+    return sheet.cut(x, y, width, height, size, process=process, flags=flags, owner=owner)
+
+def cut_manifest_frames(sheet, frames, options):
+    """Cut a manifest frames entry into a sprite, a list or a dictionary of sprites"""
+    if isinstance(frames, dict):
+        if "frames" in frames or "rows" in frames:
+            # Options next to the frames only apply to this part of the set
+            options = dict(options)
+            options.update((key, frames[key]) for key in SPRITE_OPTIONS if key in frames)
+            if "rows" in frames:
+                return cut_manifest_grid(sheet, frames, options)
+            return cut_manifest_frames(sheet, frames["frames"], options)
+        return {name: cut_manifest_frames(sheet, part, options) for name, part in frames.items()}
+    if len(frames) == 2 and all(isinstance(value, int) for value in frames):
+        return cut_manifest_sprite(sheet, frames[0], frames[1], options)  # A single [x, y] frame
+    return [cut_manifest_frames(sheet, part, options) for part in frames]
+
+def cut_manifest_grid(sheet, grid, options):
+    """Cut a rows x columns grid of sprites"""
+    rows = grid["rows"]
+    if isinstance(rows, list):
+        rows = dict(enumerate(rows))  # Row index -> y
+    columns = grid["columns"]
+    sprites = {}
+    for row, y_offset in rows.items():
+        if isinstance(columns, dict):
+            sprites[row] = {name: cut_manifest_sprite(sheet, x_offset, y_offset, options) for name, x_offset in columns.items()}
+            for alias, name in grid.get("aliases", {}).items():
+                sprites[row][alias] = sprites[row][name]
+        else:
+            sprites[row] = [cut_manifest_sprite(sheet, x_offset, y_offset, options) for x_offset in columns]
+    return sprites
+
+# Palette swaps
+# Colour variants of a character (players 2-4) aren't cut from sheets of their own. They are
+# made from the base character's finished sprites by swapping colours through one of the
+# "palettes" in the manifest, so another player colour only costs a palette entry and a
+# quick recolor instead of decoding, chroma keying and scaling another sheet. Recolored
+# sprites are baked into the sprite cache (keyed by the base sprite's key and the palette),
+# so warm launches load them like any other cached sprite.
+class SpritePalette:
+    """Manifest palette with a lookup table for recoloring whole sprites at once"""
+    def __init__(self, name, colors):
+        self.swaps = {tuple(pygame.Color(old))[:3]: tuple(pygame.Color(new))[:3] for old, new in colors.items()}
+        # Part of the cache key of every sprite recolored with this palette, so editing it recolors again
+        self.key = f"{name}:{hashlib.md5(json.dumps(colors, sort_keys=True).encode()).hexdigest()[:12]}"
+        self.old_colors = None  # Old colours packed as sorted 0xRRGGBB ints (None without numpy)
+        self.new_colors = None  # New colours in the same order
+        if np is not None and self.swaps:
+            old_colors = sorted(self.swaps)
+            self.old_colors = np.array([(r << 16) | (g << 8) | b for r, g, b in old_colors], dtype=np.uint32)
+            self.new_colors = np.array([self.swaps[color] for color in old_colors], dtype=np.uint8)
+
+sprite_palettes = {}  # {palette name: SpritePalette}
+
+def get_sprite_palette(name):
+    """Get a manifest palette (its lookup table is built the first time it is asked for)"""
+    palette = sprite_palettes.get(name)
+    if palette is None:
+        palette = SpritePalette(name, sprite_manifest["palettes"][name])
+        sprite_palettes[name] = palette
+    return palette
+
+def recolor_sprite(sprite, palette):
+    """Copy a sprite with its colours swapped through a palette (alpha is kept)"""
+    recolored = sprite.copy()
+    if palette.old_colors is not None:
+        # Look every pixel's original colour up in the palette table in one pass
+        # (so one swap can't feed into the next)
+        source = pygame.surfarray.array3d(sprite).astype(np.uint32)
+        packed = (source[:, :, 0] << 16) | (source[:, :, 1] << 8) | source[:, :, 2]
+        index = np.minimum(np.searchsorted(palette.old_colors, packed), len(palette.old_colors) - 1)
+        matches = palette.old_colors[index] == packed
+        pixels = pygame.surfarray.pixels3d(recolored)
+        pixels[matches] = palette.new_colors[index[matches]]
+        del pixels  # Unlock the surface
+        return recolored
+    
+    # Without numpy swap the colours pixel by pixel
+    for x in range(sprite.get_width()):
+        for y in range(sprite.get_height()):
+            r, g, b, a = sprite.get_at((x, y))
+            new_color = palette.swaps.get((r, g, b))
+            if new_color is not None:
+                recolored.set_at((x, y), (*new_color, a))
+    return recolored
+
+def sprites_look_alike(sprite, other):
+    """Check whether two sprites show the same pixels (the colour of see-through pixels doesn't matter)"""
+    if sprite.get_size() != other.get_size():
+        return False
+    # Colorkey and per-pixel alpha sprites compare the same way once both have alpha
+    sprite = sprite.convert_alpha()
+    other = other.convert_alpha()
+    if np is not None:
+        alpha = pygame.surfarray.array_alpha(sprite)
+        if not np.array_equal(alpha, pygame.surfarray.array_alpha(other)):
+            return False
+        visible = alpha > 0
+        return np.array_equal(pygame.surfarray.array3d(sprite)[visible], pygame.surfarray.array3d(other)[visible])
+    
+    # Without numpy compare pixel by pixel
+    for x in range(sprite.get_width()):
+        for y in range(sprite.get_height()):
+            color = sprite.get_at((x, y))
+            other_color = other.get_at((x, y))
+            if color.a != other_color.a or (color.a and color != other_color):
+                return False
+    return True
+
+def recolor_sprite_set(sprites, palette, owner=None, sheet=None):
+    """Recolor every sprite in a sprite set, keeping its list/dictionary layout
+
+    With an owner ((sprite set name, native) like SpriteSheet.cut) the recolored sprites go
+    through the sprite cache. Sprites that appear more than once (aliases) are recolored once.
+    With a sheet of the original art, a recolored sprite that doesn't match the same frame on
+    that sheet exactly is replaced by the frame from the sheet.
+    """
+    recolored = {}  # {id of base sprite: recolored sprite}
+    def recolor_or_cut(value, base_key):
+        sprite = recolor_sprite(value, palette)
+        cut = sprite_cache_cuts.get(base_key)
+        if sheet is not None and cut is not None:
+            original = sheet.cut_uncached(*cut)
+            if not sprites_look_alike(sprite, original):
+                return original
+        return sprite
+    def recolor(value):
+        if isinstance(value, dict):
+            return {key: recolor(child) for key, child in value.items()}
+        if isinstance(value, list):
+            return [recolor(child) for child in value]
+        sprite = recolored.get(id(value))
+        if sprite is None:
+            base_key = sprite_cache_keys.get(value)
+            if owner is None or base_key is None:
+                sprite = recolor_or_cut(value, base_key)
+            else:
+                key = f"{base_key}|recolor {palette.key}"
+                if sheet is not None:
+                    key += f"|{sheet.filename}"
+                sprite = get_cached_sprite(key, lambda: recolor_or_cut(value, base_key), owner)
+            recolored[id(value)] = sprite
+        return sprite
+    return recolor(sprites)
+
+def get_sprite_set(name):
+    """Get a sprite set that has already been loaded (building it if it's lazy)"""
+    if name in lazy_sprite_builders:
+        return get_lazy_sprites(name)
+    return globals()[name]
+
+def get_sprite_set_sheet(spec):
+    """Get the sheet a sprite set comes from (the base set's sheet for a recolor)"""
+    while "recolor" in spec:
+        spec = get_sprite_set_spec(spec["recolor"])
+    return sprite_sheets[spec["sheet"]]
+
+def get_sprite_set_files(spec):
+    """Get the image files a sprite set can be cut from (a recolor's original art sheet too)"""
+    filenames = [get_sprite_set_sheet(spec).filename]
+    if "recolor" in spec and "sheet" in spec:
+        filenames.append(sprite_sheets[spec["sheet"]].filename)
+    return filenames
+
+def get_recolor_sheet(spec):
+    """Get the sheet of original art a recolored sprite set is checked against (None without one)"""
+    sheet = sprite_sheets.get(spec.get("sheet"))
+    if sheet is None or not asset_exists(sheet.filename):
+        return None  # Just the recolor then
+    return sheet
+
+def get_empty_sprite_set(spec):
+    """Get the empty list or dictionary a sprite set falls back to"""
+    while "recolor" in spec:
+        spec = get_sprite_set_spec(spec["recolor"])
+    return {} if "rows" in spec or isinstance(spec.get("frames"), dict) else []
+
+# Display format
+# Every runtime sprite ends up in the display's pixel format, blitted the cheapest way its
+# transparency allows: plain copies for opaque sprites, an RLE colorkey for sprites whose
+# pixels are all either fully see-through or fully solid (the chroma keyed art), and
+# per-pixel alpha only for sprites with partly see-through pixels
+SPRITE_COLORKEY = (255, 0, 255)  # Transparent colour for colorkey sprites
+display_alpha_masks = None  # Pixel masks of convert_alpha() surfaces
+
+def get_sprite_transparency(sprite):
+    """Get how a sprite can be blitted: 'opaque', 'colorkey' or 'alpha'"""
+    # Sprites from the sprite cache had it worked out when they were cached
+    key = sprite_cache_keys.get(sprite)
+    if key is not None:
+        cached = sprite_cache.get(key)
+        if cached is not None:
+            return cached[3]
+    return measure_sprite_transparency(sprite)
+
+def measure_sprite_transparency(sprite):
+    """Work out how a sprite can be blitted from its pixels"""
+    width, height = sprite.get_size()
+    solid = pygame.mask.from_surface(sprite, 254)  # Fully solid pixels
+    if solid.count() == width * height:
+        return 'opaque'
+    visible = pygame.mask.from_surface(sprite, 0)  # Pixels that aren't fully see-through
+    if solid.count() == visible.count():
+        # A colorkey only works if no solid pixel is already the colorkey colour
+        key_pixels = pygame.mask.from_threshold(sprite, SPRITE_COLORKEY + (255,), (1, 1, 1, 255))
+        if not key_pixels.overlap_area(visible, (0, 0)):
+            return 'colorkey'
+    return 'alpha'
+
+def make_display_surface(size, transparency):
+    """Make a blank display format surface for sprites with the given transparency"""
+    if transparency == 'alpha':
+        surface = pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
+        surface.fill((0, 0, 0, 0))
+    else:
+        surface = pygame.Surface(size).convert()
+        if transparency == 'colorkey':
+            surface.fill(SPRITE_COLORKEY)
+            surface.set_colorkey(SPRITE_COLORKEY, pygame.RLEACCEL)
+    return surface
+
+def copy_to_display_surface(surface, sprite, position, transparency):
+    """Copy a sprite's pixels exactly onto a surface from make_display_surface"""
+    if transparency == 'alpha':
+        # RGBA max onto a clear surface copies the pixels exactly
+        surface.blit(sprite, position, special_flags=pygame.BLEND_RGBA_MAX)
+    else:
+        # Every pixel is fully solid or fully see-through, so a normal blit is exact
+        surface.blit(sprite, position)
+
+def convert_to_display_format(image):
+    """Copy a standalone image into the display format that suits its transparency"""
+    transparency = get_sprite_transparency(image)
+    converted = make_display_surface(image.get_size(), transparency)
+    copy_to_display_surface(converted, image, (0, 0), transparency)
+    return converted
+
+def is_display_format(sprite):
+    """Check if a sprite blits without a pixel format conversion"""
+    global display_alpha_masks
+    if sprite.get_flags() & pygame.SRCALPHA:
+        if display_alpha_masks is None:
+            display_alpha_masks = pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha().get_masks()
+        return sprite.get_masks() == display_alpha_masks
+    return sprite.get_bitsize() == window.get_bitsize() and sprite.get_masks() == window.get_masks()
+
+def report_slow_sprites(name, sprites):
+    """Warn about any sprite in a sprite set that isn't in the display format"""
+    slow = []
+    def check(value):
+        if isinstance(value, dict):
+            for child in value.values():
+                check(child)
+        elif isinstance(value, list):
+            for child in value:
+                check(child)
+        elif isinstance(value, pygame.Surface) and not is_display_format(value):
+            slow.append(value)
+    check(sprites)
+    if slow:
+        print(f"Warning: {len(slow)} sprites in {name} are not in the display format and will blit slowly")
+
+# Sprite atlases
+# Rather than hundreds of small surfaces, the finished sprites are packed into a few large
+# atlas surfaces and handed out as subsurface views of them. The sprites start life as
+# separate surfaces (cut from a sheet or loaded from the sprite cache) and are dropped once copied.
+# The atlases are display format surfaces, with separate pages for each kind of transparency.
+SPRITE_ATLAS_SIZE = 1024  # Largest atlas width/height (a bigger sprite gets a page of its own)
+sprite_atlases = []  # Every atlas surface made so far
+
+def pack_sprite_atlas(sprite_sets):
+    """Pack the sprites from some sprite sets into atlases and return the sets with subsurface views"""
+    # Find every distinct sprite (aliases like 'vertical_up' share one surface)
+    sprites = {}  # {id: sprite}
+    def collect(value):
+        if isinstance(value, dict):
+            for child in value.values():
+                collect(child)
+        elif isinstance(value, list):
+            for child in value:
+                collect(child)
+        elif isinstance(value, pygame.Surface):
+            sprites[id(value)] = value
+    for sprite_set in sprite_sets:
+        collect(sprite_set)
+    
+    # Sprites that blit the same way share atlas pages
+    sprites_by_transparency = {}  # {transparency: [sprites]}
+    for sprite in sprites.values():
+        sprites_by_transparency.setdefault(get_sprite_transparency(sprite), []).append(sprite)
+    
+    views = {}  # {id of original sprite: subsurface}
+    for transparency, packable in sprites_by_transparency.items():
+        # Shelf packing: tallest sprites first, left to right, starting a new shelf (then a new
+        # atlas) when one fills up
+        packable.sort(key=lambda sprite: (sprite.get_height(), sprite.get_width()), reverse=True)
+        pages = []  # [[atlas width, atlas height, [(sprite, x, y)]]]
+        x = y = shelf_height = 0
+        for sprite in packable:
+            width, height = sprite.get_size()
+            if pages and x + width > SPRITE_ATLAS_SIZE:
+                x, y, shelf_height = 0, y + shelf_height, 0
+            if not pages or y + height > SPRITE_ATLAS_SIZE:
+                pages.append([0, 0, []])
+                x = y = shelf_height = 0
+            page = pages[-1]
+            page[2].append((sprite, x, y))
+            page[0] = max(page[0], x + width)
+            page[1] = max(page[1], y + height)
+            x += width
+            shelf_height = max(shelf_height, height)
+        
+        # Copy the sprites in and make the views
+        for atlas_width, atlas_height, placements in pages:
+            atlas = make_display_surface((atlas_width, atlas_height), transparency)
+            for sprite, sprite_x, sprite_y in placements:
+                copy_to_display_surface(atlas, sprite, (sprite_x, sprite_y), transparency)
+                view = atlas.subsurface((sprite_x, sprite_y) + sprite.get_size())
+                if transparency == 'colorkey':
+                    # Views share the atlas colorkey, but RLE is set per surface
+                    view.set_colorkey(SPRITE_COLORKEY, pygame.RLEACCEL)
+                views[id(sprite)] = view
+                # Views stand in for the sprite, so recolors of them can still be cached
+                key = sprite_cache_keys.get(sprite)
+                if key is not None:
+                    sprite_cache_keys[view] = key
+            sprite_atlases.append(atlas)
+    
+    def replace(value):
+        if isinstance(value, dict):
+            return {key: replace(child) for key, child in value.items()}
+        if isinstance(value, list):
+            return [replace(child) for child in value]
+        if isinstance(value, pygame.Surface):
+            return views.get(id(value), value)
+        return value
+    return [replace(sprite_set) for sprite_set in sprite_sets]
+
+# Runtime transform cache
+# Overlays and effects that need a transformed copy of a sprite at draw time (the scaled hurry and
+# pause images, native resolution copies of them) get it from get_transformed_surface() instead
+# of transforming the sprite again every frame. The least recently used results are dropped once
+# they add up to more than TRANSFORM_CACHE_BUDGET bytes. Entries are keyed by the id of their
+# source so the cache never keeps a source alive - a finalizer notes when a source is freed and
+# its copies are dropped on the next lookup (not in the finalizer, which can run mid-lookup).
+TRANSFORM_CACHE_BUDGET = 16 * 1024 * 1024  # Bytes of transformed pixels kept
+transform_cache = OrderedDict()  # {(id of source surface, operation, parameters): transformed surface}, oldest first
+transform_cache_bytes = 0
+transform_cache_sources = {}  # {id of source surface: (finalizer, set of its cache keys)}
+freed_transform_sources = []  # Ids of sources freed since the last lookup
+
+def drop_transform_cache_entry(key):
+    """Remove one transformed copy from the cache"""
+    global transform_cache_bytes
+    transformed = transform_cache.pop(key)
+    transform_cache_bytes -= transformed.get_width() * transformed.get_height() * transformed.get_bytesize()
+    finalizer, keys = transform_cache_sources[key[0]]
+    keys.discard(key)
+    if not keys:
+        # Nothing of this source left to drop when it's freed
+        finalizer.detach()
+        del transform_cache_sources[key[0]]
+
+def get_transformed_surface(surface, operation, *parameters):
+    """Get a scaled, flipped, rotated or tinted copy of a surface (cached)
+
+    operation is "scale" (size), "flip" (flip x, flip y), "rotate" (degrees) or "tint"
+    (color the pixels are multiplied by). The copy is shared, so don't draw on it.
+    """
+    global transform_cache_bytes
+    while freed_transform_sources:
+        source = transform_cache_sources.get(freed_transform_sources.pop())
+        if source is not None:
+            for key in list(source[1]):
+                drop_transform_cache_entry(key)
+    
+    key = (id(surface), operation, parameters)
+    transformed = transform_cache.get(key)
+    if transformed is not None:
+        transform_cache.move_to_end(key)
+        return transformed
+    if operation == "scale":
+        transformed = pygame.transform.scale(surface, parameters[0])
+    elif operation == "flip":
+        transformed = pygame.transform.flip(surface, parameters[0], parameters[1])
+    elif operation == "rotate":
+        transformed = pygame.transform.rotate(surface, parameters[0])
+    elif operation == "tint":
+        transformed = surface.copy()
+        transformed.fill(parameters[0], special_flags=pygame.BLEND_RGB_MULT)
+    else:
+        raise ValueError(f"Unknown transform: {operation}")
+    source = transform_cache_sources.get(key[0])
+    if source is None:
+        source = (weakref.finalize(surface, freed_transform_sources.append, key[0]), set())
+        transform_cache_sources[key[0]] = source
+    source[1].add(key)
+    transform_cache[key] = transformed
+    transform_cache_bytes += transformed.get_width() * transformed.get_height() * transformed.get_bytesize()
+    while transform_cache_bytes > TRANSFORM_CACHE_BUDGET and len(transform_cache) > 1:
+        drop_transform_cache_entry(next(iter(transform_cache)))
+    return transformed
+
+# Native resolution sprites
+# With --native-resolution every sprite set is cut at its size on the sheet instead. The draw
+# code keeps laying out CELL_SIZE sprites, so the sprite set globals hold stand-ins with the
+# CELL_SIZE sizes (pixel-less views of one blank surface per size, sized from the manifest),
+# and each one is swapped for its native copy when the frame is drawn.
+native_sprite_sets = {}  # {sprite set name: native resolution sprite set}
+native_sprites = {}  # {CELL_SIZE sprite: native resolution sprite}
+layout_surfaces = {}  # {size: blank surface the stand-ins of that size are views of}
+
+def get_layout_sprite(size):
+    """Get a stand-in for a CELL_SIZE sprite (a new view of the shared blank surface for its size)"""
+    surface = layout_surfaces.get(size)
+    if surface is None:
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        layout_surfaces[size] = surface
+    return surface.subsurface((0, 0) + size)
+
+def cut_layout_sprite_set(name):
+    """Make the CELL_SIZE stand-ins for a sprite set (a recolor has the same layout as its base)"""
+    spec = get_sprite_set_spec(name)
+    while "recolor" in spec:
+        spec = get_sprite_set_spec(spec["recolor"])
+    return cut_manifest_frames(sprite_sheets[spec["sheet"]], spec, {"layout": True})
+
+def cut_native_sprite_set(name):
+    """Cut (or recolor) the native resolution copy of a sprite set"""
+    spec = get_sprite_set_spec(name)
+    if "recolor" in spec:
+        # The base set was built (with its native copy) before this one
+        return recolor_sprite_set(native_sprite_sets[spec["recolor"]], get_sprite_palette(spec["palette"]), (name, True),
+                                  get_recolor_sheet(spec))
+    return cut_manifest_frames(sprite_sheets[spec["sheet"]], spec, {"native": True, "set": name})
+
+def map_native_sprites(sprites, native):
+    """Pair every sprite in a sprite set with the sprite at the same place in its native copy"""
+    if isinstance(sprites, dict):
+        for key, value in sprites.items():
+            map_native_sprites(value, native[key])
+    elif isinstance(sprites, list):
+        for value, native_value in zip(sprites, native):
+            map_native_sprites(value, native_value)
+    elif isinstance(sprites, pygame.Surface):
+        native_sprites[sprites] = native
+
+def get_native_sprite(sprite):
+    """Get the native resolution copy of a sprite"""
+    native = native_sprites.get(sprite)
+    if native is None:
+        # Made at draw time (like the scaled hurry and pause images), so shrink it to match
+        width, height = sprite.get_size()
+        native = get_transformed_surface(sprite, "scale", (max(1, width * NATIVE_TILE_SIZE // CELL_SIZE),
+                                                           max(1, height * NATIVE_TILE_SIZE // CELL_SIZE)))
+    return native
+
+def to_frame(value):
+    """Convert a CELL_SIZE based position or length to pixels on window"""
+    if NATIVE_RESOLUTION_ENABLED:
+        return value * NATIVE_TILE_SIZE // CELL_SIZE
+    return value
+
+def build_sprite_set(name, pack=True):
+    """Cut (or recolor) a sprite set and publish it (and its loaded flag) as globals
+
+    The set gets an atlas of its own unless pack is False (load_sprite_sets packs
+    all the sets it loads into shared atlases afterwards).
+    """
+    spec = get_sprite_set_spec(name)
+    flag = spec.get("flag")
+    try:
+        if "recolor" in spec:
+            base_sprites = get_sprite_set(spec["recolor"])
+            if not base_sprites:
+                raise ValueError(f"{spec['recolor']} did not load")
+        if NATIVE_RESOLUTION_ENABLED:
+            # Only the native copy has pixels, the set itself is stand-ins to lay it out with
+            native = cut_native_sprite_set(name)
+            sprites = cut_layout_sprite_set(name)
+            if pack:
+                native = pack_sprite_atlas([native])[0]
+                report_slow_sprites(name, native)
+                map_native_sprites(sprites, native)
+        else:
+            if "recolor" in spec:
+                sprites = recolor_sprite_set(base_sprites, get_sprite_palette(spec["palette"]), (name, False),
+                                             get_recolor_sheet(spec))
+            else:
+                sprites = cut_manifest_frames(sprite_sheets[spec["sheet"]], spec, {"set": name})
+            if pack:
+                sprites = pack_sprite_atlas([sprites])[0]
+                report_slow_sprites(name, sprites)
+    except Exception:
+        if flag:
+            globals()[flag] = False
+        raise
+    if NATIVE_RESOLUTION_ENABLED:
+        native_sprite_sets[name] = native
+    globals()[name] = sprites
+    if flag:
+        globals()[flag] = True
+    return sprites
+
+def build_lazy_sprite_set(name):
+    """Build a lazy sprite set, then let go of the sheet it was cut from"""
+    spec = get_sprite_set_spec(name)
     try:
-        items_sheet = pygame.image.load(resource_path("SNES - Super Bomberman 2 - Miscellaneous - Items.png"))
+        return build_sprite_set(name)
     finally:
-        sys.stderr.close()
-        sys.stderr = old_stderr
-    items_sheet = items_sheet.convert_alpha()  # Use convert_alpha to preserve transparency and colors
-    
-    POWERUP_SPRITE_SIZE = 16
+        for filename in get_sprite_set_files(spec):
+            if filename not in prewarm_held_sheets:
+                evict_sheet_surfaces(filename)
+
+def load_sprite_sets():
+    """Cut every sprite set in the manifest in one pass per sheet and register the lazy ones"""
+    sets_by_sheet = {}  # {sheet name: [sprite set names]}
+    recolored_sets = []  # Made once the sets they recolor have been cut
+    for name in sprite_manifest["sprites"]:
+        spec = get_sprite_set_spec(name)
+        if spec.get("lazy"):
+            register_lazy_sprites(name, lambda name=name: build_lazy_sprite_set(name))
+            if "flag" in spec:
+                globals()[spec["flag"]] = asset_exists(get_sprite_set_sheet(spec).filename)
+        elif "recolor" in spec:
+            recolored_sets.append(name)
+        else:
+            sets_by_sheet.setdefault(spec["sheet"], []).append(name)
     
-    # Helper function to process a powerup sprite
-    def process_powerup_sprite(sprite_surface):
-        """Process a powerup sprite: remove chroma key and scale"""
-        # Convert to surface with alpha channel for transparency
-        sprite_surface = sprite_surface.convert_alpha()
-        
-        # Remove chroma key green background but preserve ALL colored pixels (red/blue outlines)
-        # Only remove pixels that are clearly the green background color
-        corner_color = sprite_surface.get_at((0, 0))
-        corner_r, corner_g, corner_b, corner_a = corner_color
-        
-        result = pygame.Surface(sprite_surface.get_size(), pygame.SRCALPHA)
-        for x in range(sprite_surface.get_width()):
-            for y in range(sprite_surface.get_height()):
-                pixel = sprite_surface.get_at((x, y))
-                r, g, b, a = pixel
-                
-                # Only remove if it's clearly the green background
-                # Check if it matches corner color (the green background)
-                matches_corner = (
-                    abs(r - corner_r) < 20 and 
-                    abs(g - corner_g) < 20 and 
-                    abs(b - corner_b) < 20
-                )
-                
-                # Also check for bright green chroma key colors
-                is_bright_green = (g > 200 and r < 150 and b < 150)
-                
-                # Only remove green background, preserve everything else (including outlines)
-                # Red outlines will have high red values, blue outlines will have high blue values
-                if not (matches_corner and corner_g > 150) and not is_bright_green:
-                    result.set_at((x, y), (r, g, b, 255))
-        
-        sprite_surface = result
-        
-        # Scale powerup sprite
-        sprite_surface = pygame.transform.scale(sprite_surface, (CELL_SIZE, CELL_SIZE))
-        return sprite_surface
-    
-    # Load bomb powerup sprites:
-    # First sprite on first row (blue outline) at (0, 0)
-    # First sprite on 4th row (red outline) at (0, 48) - row 4 = y = 3 * 16 = 48
-    bomb_powerup_rows = [0, 48]  # y coordinates for row 1 and row 4
-    
-    for y_pos in bomb_powerup_rows:
-        powerup_sprite = pygame.Surface((POWERUP_SPRITE_SIZE, POWERUP_SPRITE_SIZE), pygame.SRCALPHA)
-        powerup_sprite.blit(items_sheet, (0, 0), (0, y_pos, POWERUP_SPRITE_SIZE, POWERUP_SPRITE_SIZE))
-        powerup_sprite = process_powerup_sprite(powerup_sprite)
-        powerup_sprites.append(powerup_sprite)
-    
-    powerup_sprite_loaded = True
-    
-    # Load speed powerup sprites:
-    # User specified: 2nd sprite on 2nd row is red, 2nd sprite on 5th row is blue
-    # To match bomb powerup (blue first at index 0, then red at index 1)
-    # If currently starting on red, the colors may be reversed - trying swapped order
-    speed_powerup_positions = [(16, 16), (16, 64)]  # Swapped: [row 2, row 5] - testing if row 2 is actually blue
-    
-    for x_pos, y_pos in speed_powerup_positions:
-        speed_sprite = pygame.Surface((POWERUP_SPRITE_SIZE, POWERUP_SPRITE_SIZE), pygame.SRCALPHA)
-        speed_sprite.blit(items_sheet, (0, 0), (x_pos, y_pos, POWERUP_SPRITE_SIZE, POWERUP_SPRITE_SIZE))
-        speed_sprite = process_powerup_sprite(speed_sprite)
-        speed_powerup_sprites.append(speed_sprite)
-    
-    speed_powerup_sprite_loaded = True
-    
-    # Load fire powerup sprites:
-    # Blue fire sprite on row 4, column 2 at (16, 48) - row 4 = y = 3 * 16 = 48
-    # Red fire sprite on row 1, column 2 at (16, 0) - row 1 = y = 0 * 16 = 0
-    # Loading blue first (row 4) then red (row 1) to match bomb powerup animation order (blue at index 0, red at index 1)
-    # If starting on red, the colors may be reversed - swapping to ensure blue is first
-    fire_powerup_positions = [(16, 0), (16, 48)]  # Swapped: [row 1, row 4] - testing if row 1 is actually blue
-    
-    for x_pos, y_pos in fire_powerup_positions:
-        fire_sprite = pygame.Surface((POWERUP_SPRITE_SIZE, POWERUP_SPRITE_SIZE), pygame.SRCALPHA)
-        fire_sprite.blit(items_sheet, (0, 0), (x_pos, y_pos, POWERUP_SPRITE_SIZE, POWERUP_SPRITE_SIZE))
-        fire_sprite = process_powerup_sprite(fire_sprite)
-        fire_powerup_sprites.append(fire_sprite)
-    
-    fire_powerup_sprite_loaded = True
-    
-    # Load kick powerup sprites:
-    # Blue sprite on 2nd row (y=16), 3rd column (x=32)
-    # Red sprite on 5th row (y=64), 3rd column (x=32)
-    # Loading blue first then red to match animation order (blue at index 0, red at index 1)
-    kick_powerup_positions = [(32, 16), (32, 64)]  # [blue (row 2), red (row 5)]
-    
-    for x_pos, y_pos in kick_powerup_positions:
-        kick_sprite = pygame.Surface((POWERUP_SPRITE_SIZE, POWERUP_SPRITE_SIZE), pygame.SRCALPHA)
-        kick_sprite.blit(items_sheet, (0, 0), (x_pos, y_pos, POWERUP_SPRITE_SIZE, POWERUP_SPRITE_SIZE))
-        kick_sprite = process_powerup_sprite(kick_sprite)
-        kick_powerup_sprites.append(kick_sprite)
-    
-    kick_powerup_sprite_loaded = True
-    
-    # Load glove powerup sprites:
-    # Red sprite on 5th row (y=64), 4th column (x=48)
-    # Blue sprite on 2nd row (y=16), 4th column (x=48)
-    # Loading blue first then red to match animation order (blue at index 0, red at index 1)
-    glove_powerup_positions = [(48, 16), (48, 64)]  # [blue (row 2), red (row 5)]
-    
-    for x_pos, y_pos in glove_powerup_positions:
-        glove_sprite = pygame.Surface((POWERUP_SPRITE_SIZE, POWERUP_SPRITE_SIZE), pygame.SRCALPHA)
-        glove_sprite.blit(items_sheet, (0, 0), (x_pos, y_pos, POWERUP_SPRITE_SIZE, POWERUP_SPRITE_SIZE))
-        glove_sprite = process_powerup_sprite(glove_sprite)
-        glove_powerup_sprites.append(glove_sprite)
-    
-    glove_powerup_sprite_loaded = True
-    
-    # Load skull powerup sprites:
-    # Red sprite on 4th row (y=48), 6th column (x=80)
-    # Blue sprite on 1st row (y=0), 6th column (x=80)
-    # Loading blue first then red to match animation order (blue at index 0, red at index 1)
-    skull_powerup_positions = [(80, 0), (80, 48)]  # [blue (row 1), red (row 4)]
-    
-    for x_pos, y_pos in skull_powerup_positions:
-        skull_sprite = pygame.Surface((POWERUP_SPRITE_SIZE, POWERUP_SPRITE_SIZE), pygame.SRCALPHA)
-        skull_sprite.blit(items_sheet, (0, 0), (x_pos, y_pos, POWERUP_SPRITE_SIZE, POWERUP_SPRITE_SIZE))
-        skull_sprite = process_powerup_sprite(skull_sprite)
-        skull_powerup_sprites.append(skull_sprite)
-    
-    skull_powerup_sprite_loaded = True
+    for sheet_name, names in sets_by_sheet.items():
+        sheet = sprite_sheets[sheet_name]
+        try:
+            with profile_span(f"sheet {sheet.filename}"):
+                for name in names:
+                    build_sprite_set(name, pack=False)
+        except Exception as e:
+            # A sheet that can't be cut takes every sprite set on it down with it
+            for name in names:
+                spec = get_sprite_set_spec(name)
+                globals()[name] = get_empty_sprite_set(spec)
+                if "flag" in spec:
+                    globals()[spec["flag"]] = False
+            print(f"Warning: Could not load sprites from {sheet.filename}: {e}. Using default drawing.")
+    
+    for name in recolored_sets:
+        try:
+            with profile_span(f"recolor {name}"):
+                build_sprite_set(name, pack=False)
+        except Exception as e:
+            globals()[name] = get_empty_sprite_set(get_sprite_set_spec(name))
+            print(f"Warning: Could not recolor {name}: {e}. Using default drawing.")
+    
+    # Everything has been cut, so the decoded sheets aren't needed any more
+    evict_sheet_surfaces()
+    
+    # Pack everything that loaded into shared atlases
+    loaded_names = [name for name in sprite_manifest["sprites"] if name not in lazy_sprite_builders]
+    if NATIVE_RESOLUTION_ENABLED:
+        # The native copies are the only sprites with pixels
+        native_names = [name for name in loaded_names if name in native_sprite_sets]
+        with profile_span("native atlas packing"):
+            packed_sets = pack_sprite_atlas([native_sprite_sets[name] for name in native_names])
+        for name, native in zip(native_names, packed_sets):
+            native_sprite_sets[name] = native
+            report_slow_sprites(name, native)
+            map_native_sprites(globals()[name], native)
+    else:
+        with profile_span("atlas packing"):
+            packed_sets = pack_sprite_atlas([globals()[name] for name in loaded_names])
+        for name, sprites in zip(loaded_names, packed_sets):
+            globals()[name] = sprites
+            report_slow_sprites(name, sprites)
+
+load_sprite_sets()
+
+# The fallback shapes drawn for missing sprites are laid out for a CELL_SIZE window, so
+# native resolution mode needs every sprite set
+if NATIVE_RESOLUTION_ENABLED:
+    missing_sprites = [name for name, spec in sprite_manifest["sprites"].items()
+                       if "flag" in spec and not spec.get("lazy") and not globals()[spec["flag"]]]
+    if missing_sprites or not sprite_manifest["sprites"]:
+        print("Warning: Some sprites did not load, so native resolution rendering is off.")
+        NATIVE_RESOLUTION_ENABLED = False
+        FRAME_TILE_SIZE = CELL_SIZE
+        window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        # Only the native copies were cut, so cut the sprite sets again at CELL_SIZE
+        native_sprite_sets.clear()
+        native_sprites.clear()
+        load_sprite_sets()
+
+# Create player instances after sprite loading
+with profile_span("create players"):
+    # Player 1 spawns at top-left (1, 1)
+    player1 = Player(1 * CELL_SIZE + CELL_SIZE // 2, 1 * CELL_SIZE + CELL_SIZE // 2, 1, player_sprites if player_sprite_loaded else {})
+    # Player 2 spawns at bottom-right (GRID_WIDTH - 2, GRID_HEIGHT - 2)
+    player2 = Player((GRID_WIDTH - 2) * CELL_SIZE + CELL_SIZE // 2, (GRID_HEIGHT - 2) * CELL_SIZE + CELL_SIZE // 2, 2, player2_sprites if player2_sprite_loaded else {})
+    # Player 3 spawns at top-right (GRID_WIDTH - 2, 1)
+    player3 = Player((GRID_WIDTH - 2) * CELL_SIZE + CELL_SIZE // 2, 1 * CELL_SIZE + CELL_SIZE // 2, 3, player3_sprites if player3_sprite_loaded else {})
+    # Player 4 spawns at bottom-left (1, GRID_HEIGHT - 2)
+    player4 = Player(1 * CELL_SIZE + CELL_SIZE // 2, (GRID_HEIGHT - 2) * CELL_SIZE + CELL_SIZE // 2, 4, player4_sprites if player4_sprite_loaded else {})
+
+# Load pause image
+pause_image = None
+pause_image_loaded = False
+try:
+    pause_image = load_image("pause.png", alpha=True)
+    pause_image_loaded = True
 except Exception as e:
-    powerup_sprite_loaded = False
-    speed_powerup_sprite_loaded = False
-    fire_powerup_sprite_loaded = False
-    kick_powerup_sprite_loaded = False
-    glove_powerup_sprite_loaded = False
-    skull_powerup_sprite_loaded = False
-    print(f"Warning: Could not load powerup sprites: {e}. Using default circle.")
+    pause_image_loaded = False
+    print(f"Warning: Could not load pause image: {e}")
+
+# Load hurry image
+hurry_image = None
+hurry_image_loaded = False
+try:
+    hurry_image = load_image("hurry.png", alpha=True)
+    # Remove chroma key green background using the helper function
+    hurry_image = convert_to_display_format(remove_chroma_key(hurry_image))
+    hurry_image_loaded = True
+except Exception as e:
+    hurry_image_loaded = False
+    print(f"Warning: Could not load hurry image: {e}")
+
+# Write any newly cut sprites back to the baked sprite cache
+save_sprite_cache()
+
+# Optionally decode the lazy sprite sets' sheets in the background so first use never hitches
+if "--prewarm-sprites" in sys.argv:
+    prewarm_lazy_sprites()
+
+# Everything decoded at startup has been handed over (or queued) by now
+if asset_decode_pool is not None:
+    asset_decode_pool.shutdown(wait=False)
+
+if STARTUP_PROFILE_ENABLED:
+    report_startup_profile()
 
 # Clock for controlling frame rate
 clock = pygame.time.Clock()
 
-def draw_ground():
+def draw_ground(surface=None):
     """Draw ground tiles for all empty cells"""
+    if surface is None:
+        surface = window
     if tileset_loaded:
         ground_tile = tileset_sprites.get('ground')
         ground_wall_above_tile = tileset_sprites.get('ground_wall_above')
         if ground_tile:
             # Draw ground tiles for all cells
+            tiles = []
             for x in range(GRID_WIDTH):
                 for y in range(GRID_HEIGHT):
                     cell_x = x * CELL_SIZE
@@ -2102,12 +1943,13 @@ def draw_ground():
                     
                     # Use appropriate sprite based on whether there's a wall above
                     if has_wall_above and ground_wall_above_tile:
-                        window.blit(ground_wall_above_tile, (cell_x, cell_y))
+                        tiles.append((ground_wall_above_tile, (cell_x, cell_y)))
                     else:
-                        window.blit(ground_tile, (cell_x, cell_y))
+                        tiles.append((ground_tile, (cell_x, cell_y)))
+            blit_sprites(surface, tiles)
     else:
         # Fallback: fill with green background
-        window.fill(GREEN)
+        surface.fill(GREEN)
 
 def draw_grid():
     """Draw the grid lines"""
@@ -2116,29 +1958,464 @@ def draw_grid():
     for y in range(0, WINDOW_HEIGHT, CELL_SIZE):
         pygame.draw.line(window, GRAY, (0, y), (WINDOW_WIDTH, y))
 
-def draw_walls():
+def draw_walls(surface=None):
     """Draw permanent walls using tileset sprite"""
+    if surface is None:
+        surface = window
     if tileset_loaded:
         unbreakable_tile = tileset_sprites.get('unbreakable')
         if unbreakable_tile:
+            tiles = []
             for wall_x, wall_y in walls:
                 x = wall_x * CELL_SIZE
                 y = wall_y * CELL_SIZE
-                window.blit(unbreakable_tile, (x, y))
+                tiles.append((unbreakable_tile, (x, y)))
+            blit_sprites(surface, tiles)
         else:
             # Fallback to colored rectangles
             for wall_x, wall_y in walls:
                 x = wall_x * CELL_SIZE
                 y = wall_y * CELL_SIZE
-                pygame.draw.rect(window, DARK_GRAY, (x, y, CELL_SIZE, CELL_SIZE))
-                pygame.draw.rect(window, GRAY, (x, y, CELL_SIZE, CELL_SIZE), 2)
+                pygame.draw.rect(surface, DARK_GRAY, (x, y, CELL_SIZE, CELL_SIZE))
+                pygame.draw.rect(surface, GRAY, (x, y, CELL_SIZE, CELL_SIZE), 2)
+    else:
+        # Fallback to colored rectangles
+        for wall_x, wall_y in walls:
+            x = wall_x * CELL_SIZE
+            y = wall_y * CELL_SIZE
+            pygame.draw.rect(surface, DARK_GRAY, (x, y, CELL_SIZE, CELL_SIZE))
+            pygame.draw.rect(surface, GRAY, (x, y, CELL_SIZE, CELL_SIZE), 2)
+
+# Frame draw list - sprite blits from every layer are queued here in draw order and sent to the
+# window in one Surface.blits() call, instead of one Python-level blit call per sprite.
+# Shapes (fallbacks, hitboxes) are drawn onto get_shape_layer(), which flushes the draw list
+# first so they land on top of the sprites queued before them
+frame_draw_list = []  # [(sprite, dest)]
+frame_shape_layer = None  # Overlay the frame's shapes are drawn on when drawing from snapshots
+
+def frame_blits(blits):
+    """Convert (sprite, CELL_SIZE based position) pairs to the sprites and positions drawn on window"""
+    if NATIVE_RESOLUTION_ENABLED:
+        return [(get_native_sprite(sprite), (dest[0] * NATIVE_TILE_SIZE // CELL_SIZE, dest[1] * NATIVE_TILE_SIZE // CELL_SIZE))
+                for sprite, dest in blits]
+    return blits
+
+def blit_sprites(surface, blits):
+    """Blit (sprite, CELL_SIZE based position) pairs onto window or a layer drawn like it"""
+    surface.blits(frame_blits(blits), doreturn=False)
+
+def flush_draw_list():
+    """Blit everything queued in the frame draw list to the window
+    (or add it to the frame snapshot when frames are drawn from snapshots)"""
+    if frame_draw_list:
+        if RENDER_THREAD_ENABLED or FIXED_TIMESTEP_ENABLED:
+            frame_snapshot.extend(frame_blits(frame_draw_list))
+        else:
+            blit_sprites(window, frame_draw_list)
+        frame_draw_list.clear()
+
+def get_shape_layer():
+    """Get the surface to draw shapes on (on top of everything queued so far)"""
+    global frame_shape_layer
+    flush_draw_list()
+    if not RENDER_THREAD_ENABLED and not FIXED_TIMESTEP_ENABLED:
+        return window
+    # The frame is drawn from a snapshot later (and the render thread may be drawing the last one
+    # onto a back buffer), so shapes go on a transparent overlay in the snapshot instead (shared by shapes
+    # drawn back to back)
+    if not frame_snapshot or frame_snapshot[-1][0] is not frame_shape_layer:
+        frame_shape_layer = pygame.Surface(window.get_size(), pygame.SRCALPHA)
+        frame_snapshot.append((frame_shape_layer, (0, 0)))
+    return frame_shape_layer
+
+# Prerendered ground + permanent walls - none of it changes during a match, so it's drawn
+# once into this surface and the whole thing is blitted each frame instead of ~300 tiles
+background_surface = None
+background_walls = None  # Copy of the walls the background was built from
+
+def build_background():
+    """Render the ground and permanent walls into the cached background surface"""
+    global background_surface, background_walls
+    background_surface = pygame.Surface(window.get_size()).convert()
+    draw_ground(background_surface)
+    draw_walls(background_surface)
+    background_walls = frozenset(walls)
+    build_level_layer()
+
+def draw_background():
+    """Draw the cached ground, permanent walls and breakable blocks (rebuilt if the map has changed)"""
+    if background_surface is None or background_walls != walls:
+        build_background()
+    else:
+        update_level_layer()
+    frame_draw_list.append((level_surface, (0, 0)))
+
+# The intact breakable blocks are drawn into a copy of the background (the level layer), so a
+# frame starts with a single blit. The layer is only patched when the set of breakable blocks
+# changes - a block starts breaking or sudden death drops a block on it - and the few blocks
+# that are animating are drawn on top by draw_destructible_walls()
+level_surface = None
+level_walls = set()  # The destructible walls drawn into level_surface
+
+def draw_destructible_wall(surface, wall_x, wall_y):
+    """Draw one intact destructible wall onto a surface"""
+    x = wall_x * CELL_SIZE
+    y = wall_y * CELL_SIZE
+    breakable_tile = tileset_sprites.get('breakable') if tileset_loaded else None
+    if breakable_tile:
+        blit_sprites(surface, [(breakable_tile, (x, y))])
     else:
         # Fallback to colored rectangles
-        for wall_x, wall_y in walls:
-            x = wall_x * CELL_SIZE
-            y = wall_y * CELL_SIZE
-            pygame.draw.rect(window, DARK_GRAY, (x, y, CELL_SIZE, CELL_SIZE))
-            pygame.draw.rect(window, GRAY, (x, y, CELL_SIZE, CELL_SIZE), 2)
+        pygame.draw.rect(surface, BROWN, (x, y, CELL_SIZE, CELL_SIZE))
+        pygame.draw.rect(surface, DARK_GRAY, (x, y, CELL_SIZE, CELL_SIZE), 2)
+
+def set_level_surface(surface):
+    """Make surface the level layer"""
+    global level_surface
+    native_sprites.pop(level_surface, None)
+    level_surface = surface
+    if NATIVE_RESOLUTION_ENABLED:
+        # Already drawn at native resolution, so it's its own native copy
+        native_sprites[level_surface] = level_surface
+
+def build_level_layer():
+    """Draw the destructible walls over a copy of the prerendered background"""
+    global level_walls
+    set_level_surface(background_surface.copy())
+    for wall_x, wall_y in destructible_walls:
+        draw_destructible_wall(level_surface, wall_x, wall_y)
+    level_walls = set(destructible_walls)
+
+def update_level_layer():
+    """Patch the cells of the level layer whose destructible wall was added or removed"""
+    global level_walls
+    if level_walls == destructible_walls:
+        return
+    if RENDER_THREAD_ENABLED:
+        # The render thread may still be drawing the old layer, so patch a copy
+        set_level_surface(level_surface.copy())
+    for wall_x, wall_y in level_walls - destructible_walls:
+        # Put the prerendered ground back under the removed block
+        cell = pygame.Rect(wall_x * FRAME_TILE_SIZE, wall_y * FRAME_TILE_SIZE, FRAME_TILE_SIZE, FRAME_TILE_SIZE)
+        level_surface.blit(background_surface, cell, cell)
+    for wall_x, wall_y in destructible_walls - level_walls:
+        draw_destructible_wall(level_surface, wall_x, wall_y)
+    level_walls = set(destructible_walls)
+
+# Dirty-rect rendering
+# Launch with --dirty-rects to only push the parts of the window that changed since the last
+# frame (display.update(rects) instead of display.flip()) - much cheaper on software-rendered
+# and remote displays. Changed areas are found by comparing the finished frame against the
+# last one that was pushed, one grid cell at a time, so moving players, bomb animations,
+# explosions, breaking blocks, flashing powerups and the hurry banner are all picked up
+# without every draw function having to report what it drew. Needs numpy (flips otherwise).
+DIRTY_RECTS_ENABLED = "--dirty-rects" in sys.argv
+presented_frame = None  # Pixels of the last frame pushed to the screen
+
+def present_frame():
+    """Push the finished frame to the screen (or hand it to the render thread)"""
+    if RENDER_THREAD_ENABLED:
+        publish_frame_snapshot(take_frame_snapshot())
+        return
+    flush_draw_list()
+    display_frame()
+
+def display_frame():
+    """Put what's on window on the screen (only the changed cells in dirty-rect mode)"""
+    global DIRTY_RECTS_ENABLED, presented_frame
+    dirty_rects = None  # None = the whole window
+    if DIRTY_RECTS_ENABLED and np is not None:
+        try:
+            dirty_rects = find_dirty_rects()
+        except Exception as e:
+            # Fall back to full flips if surfarray can't handle the display surface
+            print(f"Warning: Dirty-rect rendering failed, using full flips: {e}")
+            DIRTY_RECTS_ENABLED = False
+            presented_frame = None
+    if NATIVE_RESOLUTION_ENABLED:
+        dirty_rects = upscale_frame(dirty_rects)
+    if dirty_rects is None:
+        pygame.display.flip()
+    elif dirty_rects:
+        pygame.display.update(dirty_rects)
+
+def find_dirty_rects():
+    """Get the rects of the grid cells that changed since the last pushed frame (None = whole window)"""
+    global presented_frame
+    frame = pygame.surfarray.array2d(window)
+    previous = presented_frame
+    presented_frame = frame
+    if previous is None or previous.shape != frame.shape:
+        return None
+
+    # (GRID_WIDTH, GRID_HEIGHT) array of which cells have any changed pixel
+    changed = (frame != previous).reshape(GRID_WIDTH, FRAME_TILE_SIZE, GRID_HEIGHT, FRAME_TILE_SIZE).any(axis=(1, 3))
+
+    # One rect per horizontal run of changed cells in each row
+    dirty_rects = []
+    for y in np.flatnonzero(changed.any(axis=0)):
+        row = changed[:, y]
+        x = 0
+        while x < GRID_WIDTH:
+            if row[x]:
+                start_x = x
+                while x < GRID_WIDTH and row[x]:
+                    x += 1
+                dirty_rects.append(pygame.Rect(start_x * FRAME_TILE_SIZE, int(y) * FRAME_TILE_SIZE,
+                                               (x - start_x) * FRAME_TILE_SIZE, FRAME_TILE_SIZE))
+            else:
+                x += 1
+    return dirty_rects
+
+native_display_size = None  # Display size the last native frame was scaled up to
+
+def upscale_frame(dirty_rects=None):
+    """Scale the finished native resolution frame up onto the display
+    Returns the display rects to push (None = the whole display)"""
+    global native_display_size
+    display = pygame.display.get_surface()
+    display_width, display_height = display.get_size()
+    scale = max(1, min(display_width // NATIVE_WIDTH, display_height // NATIVE_HEIGHT))
+    offset_x = (display_width - NATIVE_WIDTH * scale) // 2
+    offset_y = (display_height - NATIVE_HEIGHT * scale) // 2
+    if display.get_size() != native_display_size:
+        # New or resized window - clear the borders and push everything
+        native_display_size = display.get_size()
+        display.fill(BLACK)
+        dirty_rects = None
+    
+    if scale == 1:
+        display.blit(window, (offset_x, offset_y))
+    else:
+        frame = window
+        remaining_scale = scale
+        if NATIVE_UPSCALE_FILTER == "scale2x":
+            # Double with scale2x as many times as the scale allows, then finish with pixel copies
+            while remaining_scale % 2 == 0:
+                frame = pygame.transform.scale2x(frame)
+                remaining_scale //= 2
+        target = display.subsurface((offset_x, offset_y, NATIVE_WIDTH * scale, NATIVE_HEIGHT * scale))
+        if remaining_scale == 1:
+            target.blit(frame, (0, 0))
+        else:
+            pygame.transform.scale(frame, target.get_size(), target)
+    
+    if dirty_rects is None:
+        return None
+    pushed_rects = []
+    for rect in dirty_rects:
+        pushed = pygame.Rect(offset_x + rect.x * scale, offset_y + rect.y * scale, rect.width * scale, rect.height * scale)
+        if NATIVE_UPSCALE_FILTER == "scale2x":
+            # scale2x looks at neighbouring pixels, so the edge of the next cell can change too
+            pushed.inflate_ip(scale * 2, scale * 2)
+        pushed_rects.append(pushed.clip(display.get_rect()))
+    return pushed_rects
+
+# Render thread
+# Launch with --render-thread to put frames together on a second thread. The main loop still
+# handles input, runs the game and works out which sprite goes where, but instead of drawing it
+# publishes each frame as a snapshot - a tuple of (sprite, position) pairs, with sprites that are
+# never changed once they're made. The render thread blits the newest snapshot onto an offscreen
+# back buffer and skips any it didn't get to, so a frame with a lot of sprites no longer holds up
+# the next game tick (pygame lets go of the GIL while SDL blits, so the two really overlap). The
+# finished buffer is copied to the window and put on the screen by the main thread - SDL can only
+# present a window from the thread that created it - so frames show up one frame late.
+RENDER_THREAD_ENABLED = "--render-thread" in sys.argv
+RENDER_BUFFER_COUNT = 2  # Back buffers, so one can be composed while the last one is presented
+frame_snapshot = []  # Blits of the frame being put together, in window pixels
+latest_frame_snapshot = None  # Newest finished frame the render thread hasn't drawn yet
+composed_frame = None  # Newest back buffer the render thread finished that isn't on screen yet
+free_render_buffers = []  # Back buffers neither thread is using
+frame_snapshot_ready = threading.Condition()
+render_thread = None
+render_thread_running = False
+
+def render_loop():
+    """Blit the newest frame snapshot onto a free back buffer each time there is one (runs on the render thread)"""
+    global latest_frame_snapshot, composed_frame
+    try:
+        while True:
+            with frame_snapshot_ready:
+                while render_thread_running and (latest_frame_snapshot is None or not free_render_buffers):
+                    frame_snapshot_ready.wait()
+                if not render_thread_running:
+                    return
+                snapshot = latest_frame_snapshot
+                latest_frame_snapshot = None
+                buffer = free_render_buffers.pop()
+            buffer.blits(snapshot, doreturn=False)
+            with frame_snapshot_ready:
+                if composed_frame is not None:
+                    # The main thread never got to the last one, so it's skipped
+                    free_render_buffers.append(composed_frame)
+                composed_frame = buffer
+    except Exception as e:
+        print(f"Warning: Render thread stopped, drawing on the main thread: {e}")
+
+def start_render_thread():
+    """Start composing frame snapshots on the render thread"""
+    global render_thread, render_thread_running
+    # Made here on the main thread, in the window's pixel format so presenting is a plain copy
+    free_render_buffers[:] = [window.copy() for _ in range(RENDER_BUFFER_COUNT)]
+    render_thread_running = True
+    render_thread = threading.Thread(target=render_loop, name="render", daemon=True)
+    render_thread.start()
+
+def stop_render_thread():
+    """Stop the render thread (frames it hasn't finished yet are dropped)"""
+    global render_thread_running
+    if render_thread is None:
+        return
+    with frame_snapshot_ready:
+        render_thread_running = False
+        frame_snapshot_ready.notify()
+    render_thread.join()
+
+def take_frame_snapshot():
+    """Get the blits of the finished frame as a snapshot and start on the next frame"""
+    global frame_snapshot
+    flush_draw_list()
+    snapshot = tuple(frame_snapshot)
+    frame_snapshot = []
+    return snapshot
+
+def publish_frame_snapshot(snapshot):
+    """Hand a finished frame to the render thread and put the last frame it finished on the screen
+    (or draw and show it straight away without one)"""
+    global RENDER_THREAD_ENABLED, latest_frame_snapshot, composed_frame
+    if RENDER_THREAD_ENABLED and (render_thread is None or not render_thread.is_alive()):
+        # The render thread failed - draw on this thread from now on
+        RENDER_THREAD_ENABLED = False
+    if not RENDER_THREAD_ENABLED:
+        window.blits(snapshot, doreturn=False)
+        display_frame()
+        return
+    with frame_snapshot_ready:
+        # Replaces a snapshot the render thread hasn't picked up yet, so it never falls behind
+        latest_frame_snapshot = snapshot
+        buffer = composed_frame
+        composed_frame = None
+        frame_snapshot_ready.notify()
+    if buffer is None:
+        return
+    window.blit(buffer, (0, 0))
+    display_frame()
+    with frame_snapshot_ready:
+        free_render_buffers.append(buffer)
+        frame_snapshot_ready.notify()
+
+# Fixed timestep
+# Launch with --fixed-timestep to run the game in fixed ticks of game time, however fast or slow
+# frames are drawn. Speeds are in pixels per tick (move_speed, BOMB_KICK_SPEED, THROW_SPEED, the
+# bounce GRAVITY) and every timer reads the tick's game time, so a dropped frame no longer slows
+# the game down or changes where a kicked or thrown bomb ends up. When drawing falls behind, the
+# ticks it missed are run without being drawn (up to MAX_CATCH_UP_TICKS in a row, then the game
+# slows down rather than never drawing). While waiting for the next tick, the finished frame is
+# drawn as often as the display takes it, with players and bombs slid between where they were
+# on the last tick and where they are now - so a 144 Hz display gets smooth movement out of 60
+# ticks a second. The ticks run the draw functions too (they start throws and move held bombs),
+# so the in-between frames are made by moving the tick's blits, not by drawing again.
+FIXED_TIMESTEP_ENABLED = "--fixed-timestep" in sys.argv
+SIMULATION_RATE = 60  # Ticks per second
+SIMULATION_STEP = 1000 / SIMULATION_RATE  # Game time per tick (ms)
+MAX_CATCH_UP_TICKS = 5  # Ticks in a row that can be run without drawing
+RENDER_RATE_LIMIT = 240  # Highest frame rate the in-between frames are drawn at
+MAX_INTERPOLATION_DISTANCE = CELL_SIZE * 2  # Moves further than this (wrapping, respawns) aren't slid
+simulation_time = None  # Game time of the current tick (ms)
+next_tick_due = None  # Real time the next tick should run at (ms)
+catch_up_ticks = 0  # Ticks run without drawing since the last drawn frame
+tick_start_positions = {}  # {player or bomb: position at the start of the tick}
+frame_motion = []  # [(first blit, end blit, dx, dy)] - runs of the frame's blits that move with a player or bomb
+entity_draw_start = None  # (first blit, player or bomb) of the run being drawn
+
+def get_entity_position(entity):
+    """Get where a player or bomb is drawn (bombs are lifted by their bounce)"""
+    if isinstance(entity, Bomb):
+        return (entity.pixel_x, entity.pixel_y - entity.bounce_offset)
+    return (entity.x, entity.y)
+
+def start_tick():
+    """Get the game time for this tick (and remember where everything is, for interpolation)"""
+    global simulation_time, next_tick_due
+    if not FIXED_TIMESTEP_ENABLED:
+        return pygame.time.get_ticks()
+    if simulation_time is None:
+        simulation_time = next_tick_due = pygame.time.get_ticks()
+    tick_start_positions.clear()
+    for entity in [player1, player2, player3, player4] + bombs:
+        if entity:
+            tick_start_positions[entity] = get_entity_position(entity)
+    return int(simulation_time)
+
+def begin_entity_draw(entity):
+    """Start a run of blits that move with a player or bomb (ends at the next run or end_entity_draw)"""
+    global entity_draw_start
+    if not FIXED_TIMESTEP_ENABLED:
+        return
+    end_entity_draw()
+    entity_draw_start = (len(frame_snapshot) + len(frame_draw_list), entity)
+
+def end_entity_draw():
+    """Finish the run of blits started by begin_entity_draw"""
+    global entity_draw_start, frame_shape_layer
+    # Shapes drawn after this start a new overlay, so they don't move with the run
+    frame_shape_layer = None
+    if entity_draw_start is None:
+        return
+    start, entity = entity_draw_start
+    entity_draw_start = None
+    end = len(frame_snapshot) + len(frame_draw_list)
+    if end == start or entity not in tick_start_positions:
+        return
+    start_x, start_y = tick_start_positions[entity]
+    x, y = get_entity_position(entity)
+    dx = x - start_x
+    dy = y - start_y
+    if (dx or dy) and abs(dx) <= MAX_INTERPOLATION_DISTANCE and abs(dy) <= MAX_INTERPOLATION_DISTANCE:
+        frame_motion.append((start, end, dx, dy))
+
+def interpolate_snapshot(snapshot, motion, alpha):
+    """Slide the blits that move with a player or bomb back towards where it was on the last tick
+    (alpha 0 = last tick, 1 = this tick)"""
+    if alpha >= 1 or not motion:
+        return snapshot
+    blits = list(snapshot)
+    for start, end, dx, dy in motion:
+        offset_x = round((alpha - 1) * to_frame(dx))
+        offset_y = round((alpha - 1) * to_frame(dy))
+        for i in range(start, end):
+            sprite, dest = blits[i]
+            blits[i] = (sprite, (dest[0] + offset_x, dest[1] + offset_y))
+    return tuple(blits)
+
+def end_tick():
+    """Draw the tick's frame and wait for the next tick"""
+    global simulation_time, next_tick_due, catch_up_ticks
+    if not FIXED_TIMESTEP_ENABLED:
+        present_frame()
+        clock.tick(60)
+        return
+    end_entity_draw()
+    snapshot = take_frame_snapshot()
+    motion = frame_motion[:]
+    frame_motion.clear()
+    simulation_time += SIMULATION_STEP
+    next_tick_due += SIMULATION_STEP
+    if pygame.time.get_ticks() >= next_tick_due:
+        # Behind - run the next tick straight away, and skip drawing this one while catching up
+        if catch_up_ticks < MAX_CATCH_UP_TICKS:
+            catch_up_ticks += 1
+            return
+        # Too far behind to catch up, so let the game slow down instead
+        next_tick_due = pygame.time.get_ticks()
+    catch_up_ticks = 0
+    # Draw the frame at least once, then keep drawing in-between frames until the next tick is due
+    while True:
+        alpha = 1 - (next_tick_due - pygame.time.get_ticks()) / SIMULATION_STEP
+        publish_frame_snapshot(interpolate_snapshot(snapshot, motion, min(max(alpha, 0.0), 1.0)))
+        clock.tick(RENDER_RATE_LIMIT)
+        if pygame.time.get_ticks() >= next_tick_due:
+            break
 
 def draw_hurry_animation(current_time=None):
     """Draw hurry graphic moving from right to left across middle of screen, flashing"""
@@ -2150,7 +2427,7 @@ def draw_hurry_animation(current_time=None):
             scale_factor = 0.7  # 70% of original size
             scaled_width = int(hurry_image.get_width() * scale_factor)
             scaled_height = int(hurry_image.get_height() * scale_factor)
-            scaled_hurry_image = pygame.transform.scale(hurry_image, (scaled_width, scaled_height))
+            scaled_hurry_image = get_transformed_surface(hurry_image, "scale", (scaled_width, scaled_height))
             
             # Calculate position (moving from right to left)
             progress = hurry_elapsed / HURRY_ANIMATION_DURATION
@@ -2166,7 +2443,20 @@ def draw_hurry_animation(current_time=None):
             if is_visible:
                 # Center vertically in middle of screen
                 y_pos = (WINDOW_HEIGHT - scaled_height) // 2
-                window.blit(scaled_hurry_image, (current_x, y_pos))
+                frame_draw_list.append((scaled_hurry_image, (current_x, y_pos)))
+
+sudden_death_flash_tile = None  # Plain white cell for the sudden death block flash
+
+def get_flash_tile():
+    """Get the plain white cell the sudden death blocks flash with"""
+    global sudden_death_flash_tile
+    if sudden_death_flash_tile is None:
+        sudden_death_flash_tile = pygame.Surface((CELL_SIZE, CELL_SIZE)).convert()
+        sudden_death_flash_tile.fill(WHITE)
+        native_tile = pygame.Surface((NATIVE_TILE_SIZE, NATIVE_TILE_SIZE)).convert()
+        native_tile.fill(WHITE)
+        native_sprites[sudden_death_flash_tile] = native_tile
+    return sudden_death_flash_tile
 
 def draw_sudden_death_blocks(current_time=None):
     """Draw sudden death blocks using the sprite next to ground_wall_above, with white flash animation"""
@@ -2189,14 +2479,15 @@ def draw_sudden_death_blocks(current_time=None):
                 
                 if should_flash:
                     # Draw white flash
-                    pygame.draw.rect(window, WHITE, (x, y, CELL_SIZE, CELL_SIZE))
+                    frame_draw_list.append((get_flash_tile(), (x, y)))
                 else:
                     # Draw normal sprite
-                    window.blit(sudden_death_tile, (x, y))
+                    frame_draw_list.append((sudden_death_tile, (x, y)))
         else:
             # Fallback to colored rectangles if sprite didn't load
             SUDDEN_DEATH_COLOR = (255, 100, 100)  # Bright red
             SUDDEN_DEATH_BORDER = (200, 50, 50)  # Darker red border
+            shape_layer = get_shape_layer()
             for block_x, block_y in sudden_death_blocks:
                 x = block_x * CELL_SIZE
                 y = block_y * CELL_SIZE
@@ -2211,14 +2502,15 @@ def draw_sudden_death_blocks(current_time=None):
                         should_flash = (flash_phase == 0)
                 
                 if should_flash:
-                    pygame.draw.rect(window, WHITE, (x, y, CELL_SIZE, CELL_SIZE))
+                    pygame.draw.rect(shape_layer, WHITE, (x, y, CELL_SIZE, CELL_SIZE))
                 else:
-                    pygame.draw.rect(window, SUDDEN_DEATH_COLOR, (x, y, CELL_SIZE, CELL_SIZE))
-                    pygame.draw.rect(window, SUDDEN_DEATH_BORDER, (x, y, CELL_SIZE, CELL_SIZE), 2)
+                    pygame.draw.rect(shape_layer, SUDDEN_DEATH_COLOR, (x, y, CELL_SIZE, CELL_SIZE))
+                    pygame.draw.rect(shape_layer, SUDDEN_DEATH_BORDER, (x, y, CELL_SIZE, CELL_SIZE), 2)
     else:
         # Fallback to colored rectangles if tileset didn't load
         SUDDEN_DEATH_COLOR = (255, 100, 100)  # Bright red
         SUDDEN_DEATH_BORDER = (200, 50, 50)  # Darker red border
+        shape_layer = get_shape_layer()
         for block_x, block_y in sudden_death_blocks:
             x = block_x * CELL_SIZE
             y = block_y * CELL_SIZE
@@ -2233,86 +2525,41 @@ def draw_sudden_death_blocks(current_time=None):
                     should_flash = (flash_phase == 0)
             
             if should_flash:
-                pygame.draw.rect(window, WHITE, (x, y, CELL_SIZE, CELL_SIZE))
+                pygame.draw.rect(shape_layer, WHITE, (x, y, CELL_SIZE, CELL_SIZE))
             else:
-                pygame.draw.rect(window, SUDDEN_DEATH_COLOR, (x, y, CELL_SIZE, CELL_SIZE))
-                pygame.draw.rect(window, SUDDEN_DEATH_BORDER, (x, y, CELL_SIZE, CELL_SIZE), 2)
+                pygame.draw.rect(shape_layer, SUDDEN_DEATH_COLOR, (x, y, CELL_SIZE, CELL_SIZE))
+                pygame.draw.rect(shape_layer, SUDDEN_DEATH_BORDER, (x, y, CELL_SIZE, CELL_SIZE), 2)
 
 def draw_destructible_walls(current_time=None):
-    """Draw destructible walls using tileset sprite, with breaking animation"""
+    """Draw the breaking animation for destructible walls (intact ones are in the level layer)"""
     if tileset_loaded:
-        breakable_tile = tileset_sprites.get('breakable')
         breaking_sprites = tileset_sprites.get('breaking', [])
         
-        if breakable_tile:
-            # Draw normal breakable walls
-            for wall_x, wall_y in destructible_walls:
-                # Skip if this block is currently breaking
-                if (wall_x, wall_y) in breaking_blocks:
-                    continue
+        # Draw breaking animation (the level layer already has ground under the block)
+        if breaking_sprites and current_time is not None:
+            blocks_to_remove = []
+            for (wall_x, wall_y), start_time in breaking_blocks.items():
                 x = wall_x * CELL_SIZE
                 y = wall_y * CELL_SIZE
-                window.blit(breakable_tile, (x, y))
-            
-            # Draw breaking animation
-            if breaking_sprites and current_time is not None:
-                ground_tile = tileset_sprites.get('ground')
-                ground_wall_above_tile = tileset_sprites.get('ground_wall_above')
-                blocks_to_remove = []
-                for (wall_x, wall_y), start_time in breaking_blocks.items():
-                    x = wall_x * CELL_SIZE
-                    y = wall_y * CELL_SIZE
-                    
-                    # Draw ground tile behind breaking block first
-                    if ground_tile or ground_wall_above_tile:
-                        # Check if there's a permanent wall above this cell
-                        has_wall_above = False
-                        if wall_y > 0:  # Not at the top row
-                            if (wall_x, wall_y - 1) in walls:
-                                has_wall_above = True
-                        
-                        # Use appropriate ground sprite
-                        if has_wall_above and ground_wall_above_tile:
-                            window.blit(ground_wall_above_tile, (x, y))
-                        elif ground_tile:
-                            window.blit(ground_tile, (x, y))
-                    
-                    # Calculate animation progress (0.0 to 1.0)
-                    elapsed = current_time - start_time
-                    if elapsed >= BLOCK_BREAKING_DURATION:
-                        # Animation complete, mark for removal
-                        blocks_to_remove.append((wall_x, wall_y))
-                    else:
-                        # Select frame based on progress
-                        progress = elapsed / BLOCK_BREAKING_DURATION
-                        frame_index = int(progress * len(breaking_sprites))
-                        frame_index = min(frame_index, len(breaking_sprites) - 1)
-                        window.blit(breaking_sprites[frame_index], (x, y))
                 
-                # Remove completed breaking blocks and spawn powerup
-                for block_pos in blocks_to_remove:
-                    breaking_blocks.pop(block_pos, None)
-                    # Spawn powerup at the block location (randomly choose between bomb_up, speed_up, fire_up, kick, and glove)
-                    powerup_type = random.choice(['bomb_up', 'speed_up', 'fire_up', 'kick', 'glove'])
-                    powerups[block_pos] = powerup_type
-        else:
-            # Fallback to colored rectangles
-            for wall_x, wall_y in destructible_walls:
-                if (wall_x, wall_y) in breaking_blocks:
-                    continue
-                x = wall_x * CELL_SIZE
-                y = wall_y * CELL_SIZE
-                pygame.draw.rect(window, BROWN, (x, y, CELL_SIZE, CELL_SIZE))
-                pygame.draw.rect(window, DARK_GRAY, (x, y, CELL_SIZE, CELL_SIZE), 2)
-    else:
-        # Fallback to colored rectangles
-        for wall_x, wall_y in destructible_walls:
-            if (wall_x, wall_y) in breaking_blocks:
-                continue
-            x = wall_x * CELL_SIZE
-            y = wall_y * CELL_SIZE
-            pygame.draw.rect(window, BROWN, (x, y, CELL_SIZE, CELL_SIZE))
-            pygame.draw.rect(window, DARK_GRAY, (x, y, CELL_SIZE, CELL_SIZE), 2)
+                # Calculate animation progress (0.0 to 1.0)
+                elapsed = current_time - start_time
+                if elapsed >= BLOCK_BREAKING_DURATION:
+                    # Animation complete, mark for removal
+                    blocks_to_remove.append((wall_x, wall_y))
+                else:
+                    # Select frame based on progress
+                    progress = elapsed / BLOCK_BREAKING_DURATION
+                    frame_index = int(progress * len(breaking_sprites))
+                    frame_index = min(frame_index, len(breaking_sprites) - 1)
+                    frame_draw_list.append((breaking_sprites[frame_index], (x, y)))
+            
+            # Remove completed breaking blocks and spawn powerup
+            for block_pos in blocks_to_remove:
+                breaking_blocks.pop(block_pos, None)
+                # Spawn powerup at the block location (randomly choose between bomb_up, speed_up, fire_up, kick, and glove)
+                powerup_type = random.choice(['bomb_up', 'speed_up', 'fire_up', 'kick', 'glove'])
+                powerups[block_pos] = powerup_type
 
 def get_sprite_for_cell(grid_x, grid_y, bomb, animation_row=0):
     """Determine which explosion sprite to use for a cell relative to a bomb
@@ -2400,112 +2647,137 @@ def get_sprite_for_cell(grid_x, grid_y, bomb, animation_row=0):
             return sprite.copy(), 'center'
         return None, 'center'
 
+# Explosion autotiling - which explosion sprite a cell uses only depends on which of its 4
+# neighbours are exploding too, so the sprite for every neighbour mask is worked out once per
+# player sprite set and animation row. Mask bits: 1 = left, 2 = right, 4 = up, 8 = down
+EXPLOSION_NEIGHBOUR_LEFT = 1
+EXPLOSION_NEIGHBOUR_RIGHT = 2
+EXPLOSION_NEIGHBOUR_UP = 4
+EXPLOSION_NEIGHBOUR_DOWN = 8
+EXPLOSION_ANIMATION_ROWS = 5
+# Sprite type for each mask - horizontal-only and vertical-only lines get segments and ends,
+# crosses and isolated cells use the center sprite
+EXPLOSION_AUTOTILE_TYPES = (
+    'center', 'end_right', 'end_left', 'horizontal',  # no vertical neighbours
+    'end_down', 'center', 'center', 'center',  # up
+    'end_up', 'center', 'center', 'center',  # down
+    'vertical', 'center', 'center', 'center',  # up and down
+)
+explosion_autotiles = {}  # {placed_by: [16 sprites (None if missing) for each animation row]}
+
+def get_explosion_autotiles(placed_by):
+    """Get the explosion sprite lookup tables for a player's bombs (built on first use)"""
+    autotiles = explosion_autotiles.get(placed_by)
+    if autotiles is None:
+        if placed_by == 2:
+            sprite_set = explosion2_sprites
+        elif placed_by == 3:
+            sprite_set = explosion3_sprites
+        elif placed_by == 4:
+            sprite_set = explosion4_sprites
+        else:
+            sprite_set = explosion_sprites
+        autotiles = []
+        for animation_row in range(EXPLOSION_ANIMATION_ROWS):
+            row_sprites = sprite_set.get(animation_row, {})
+            autotiles.append(tuple(row_sprites.get(sprite_type) for sprite_type in EXPLOSION_AUTOTILE_TYPES))
+        explosion_autotiles[placed_by] = autotiles
+    return autotiles
+
 def get_sprite_for_cell_from_pattern(grid_x, grid_y, all_explosion_cells, bomb_positions, animation_row=0, placed_by=1):
     """Determine which explosion sprite to use for a cell based on the overall explosion pattern
     This fixes issues when multiple bombs overlap - determines sprite based on neighbors, not relative to individual bombs
-    placed_by: 1 for player 1, 2 for player 2, 3 for player 3, 4 for player 4"""
-    # Get sprites for the current animation row - use appropriate sprite set based on player
-    if placed_by == 1:
-        sprite_set = explosion_sprites
-    elif placed_by == 2:
-        sprite_set = explosion2_sprites
-    elif placed_by == 3:
-        sprite_set = explosion3_sprites
-    elif placed_by == 4:
-        sprite_set = explosion4_sprites
-    else:
-        sprite_set = explosion_sprites
-    row_sprites = sprite_set.get(animation_row, {})
+    placed_by: 1 for player 1, 2 for player 2, 3 for player 3, 4 for player 4
+    Returns the shared sprite (or None) - don't draw on it"""
+    row_tiles = get_explosion_autotiles(placed_by)[animation_row]
     
-    # Check if this cell is a bomb center
+    # Bomb centers always use the center sprite
     if (grid_x, grid_y) in bomb_positions:
-        sprite = row_sprites.get('center')
-        if sprite:
-            return sprite.copy(), 'center'
-        return None, 'center'
-    
-    # Check neighbors in all 4 directions
-    has_left = (grid_x - 1, grid_y) in all_explosion_cells
-    has_right = (grid_x + 1, grid_y) in all_explosion_cells
-    has_up = (grid_x, grid_y - 1) in all_explosion_cells
-    has_down = (grid_x, grid_y + 1) in all_explosion_cells
-    
-    # Determine if horizontal or vertical line
-    is_horizontal = (has_left or has_right) and not (has_up or has_down)
-    is_vertical = (has_up or has_down) and not (has_left or has_right)
-    
-    if is_horizontal:
-        # Horizontal line
-        if has_left and has_right:
-            # Middle segment
-            sprite = row_sprites.get('horizontal')
-            if sprite:
-                return sprite.copy(), 'horizontal'
-        elif has_right:
-            # Left end
-            sprite = row_sprites.get('end_left')
-            if sprite:
-                return sprite.copy(), 'end_left'
-        elif has_left:
-            # Right end
-            sprite = row_sprites.get('end_right')
-            if sprite:
-                return sprite.copy(), 'end_right'
-        return None, 'horizontal'
-    elif is_vertical:
-        # Vertical line
-        if has_up and has_down:
-            # Middle segment
-            vert = row_sprites.get('vertical')
-            if vert:
-                vert_copy = vert.copy()
-                return vert_copy, 'vertical_down'
-        elif has_down:
-            # Top end
-            sprite = row_sprites.get('end_up')
-            if sprite:
-                return sprite.copy(), 'end_up'
-        elif has_up:
-            # Bottom end
-            sprite = row_sprites.get('end_down')
-            if sprite:
-                return sprite.copy(), 'end_down'
-        return None, 'vertical'
-    else:
-        # Cross pattern or isolated - use center as fallback
-        sprite = row_sprites.get('center')
-        if sprite:
-            return sprite.copy(), 'center'
-        return None, 'center'
+        return row_tiles[0]
+    
+    # Build the neighbour mask and look the sprite up
+    mask = 0
+    if (grid_x - 1, grid_y) in all_explosion_cells:
+        mask |= EXPLOSION_NEIGHBOUR_LEFT
+    if (grid_x + 1, grid_y) in all_explosion_cells:
+        mask |= EXPLOSION_NEIGHBOUR_RIGHT
+    if (grid_x, grid_y - 1) in all_explosion_cells:
+        mask |= EXPLOSION_NEIGHBOUR_UP
+    if (grid_x, grid_y + 1) in all_explosion_cells:
+        mask |= EXPLOSION_NEIGHBOUR_DOWN
+    return row_tiles[mask]
 
-def draw_bombs(current_time):
-    """Draw active bombs and their blast radius (only when exploding)"""
+# Resolved explosion overlay - the cells and sprites only change when a bomb starts or stops
+# exploding or the animation steps to the next row, so they're worked out once per change
+explosion_overlay_key = None  # (exploding bombs, animation row) the overlay was built for
+explosion_overlay = []  # [((grid_x, grid_y), (cell_x, cell_y), sprite)]
+explosion_powerup_cells_key = None  # Exploding bombs the powerup cells were collected for
+explosion_powerup_cells = set()  # Cells that had powerups when any of those bombs exploded
+
+def get_explosion_powerup_cells(exploding_bombs):
+    """Get the cells that had powerups when the exploding bombs went off (cached until they change)"""
+    global explosion_powerup_cells_key, explosion_powerup_cells
+    key = tuple(exploding_bombs)
+    if key != explosion_powerup_cells_key:
+        explosion_powerup_cells = set()
+        for bomb in exploding_bombs:
+            explosion_powerup_cells.update(bomb.powerup_cells)
+        explosion_powerup_cells_key = key
+    return explosion_powerup_cells
+
+def get_explosion_overlay(exploding_bombs, animation_row):
+    """Get the explosion cells and sprites to draw for the exploding bombs (cached until they change)"""
+    global explosion_overlay_key, explosion_overlay
+    key = (tuple(exploding_bombs), animation_row)
+    if key == explosion_overlay_key:
+        return explosion_overlay
+    
     # First, collect all explosion cells from all exploding bombs
     all_explosion_cells = set()  # Set of all (grid_x, grid_y) cells in explosions
     bomb_positions = set()  # Set of (grid_x, grid_y) positions where bombs are
     # Track which bomb owns each explosion cell (for sprite selection)
     cell_bomb_owner = {}  # {(grid_x, grid_y): placed_by} - tracks which player's bomb owns each cell
-    # Track cells that had powerups when explosion happened (to skip drawing explosion there)
-    powerup_explosion_cells = set()
+    # Cells that had powerups when explosion happened (to skip drawing explosion there)
+    powerup_explosion_cells = get_explosion_powerup_cells(exploding_bombs)
+    for bomb in exploding_bombs:
+        # Collect all explosion cells and track which bomb owns them
+        bomb_owner = bomb.placed_by if bomb.placed_by else 1  # Default to player 1 if not set
+        for grid_x, grid_y in bomb.explosion_cells:
+            all_explosion_cells.add((grid_x, grid_y))
+            # Track which bomb owns this cell (use first bomb that claims it, or prefer player 1)
+            if (grid_x, grid_y) not in cell_bomb_owner:
+                cell_bomb_owner[(grid_x, grid_y)] = bomb_owner
+        # Track bomb positions
+        bomb_positions.add((bomb.grid_x, bomb.grid_y))
+    
+    # Resolve each cell's sprite using pattern-based sprite selection
+    overlay = []
+    for grid_x, grid_y in all_explosion_cells:
+        # Skip drawing explosion where a powerup was destroyed
+        if (grid_x, grid_y) in powerup_explosion_cells:
+            continue
+        
+        # Determine which player's bomb owns this cell (default to player 1)
+        cell_owner = cell_bomb_owner.get((grid_x, grid_y), 1)
+        
+        # Get sprite based on overall explosion pattern, using the correct sprite set
+        sprite = get_sprite_for_cell_from_pattern(grid_x, grid_y, all_explosion_cells, bomb_positions, animation_row, cell_owner)
+        if sprite:
+            overlay.append(((grid_x, grid_y), (grid_x * CELL_SIZE, grid_y * CELL_SIZE), sprite))
+    
+    explosion_overlay_key = key
+    explosion_overlay = overlay
+    return overlay
+
+def draw_explosions(current_time):
+    """Draw the blast radius of exploding bombs"""
+    exploding_bombs = [bomb for bomb in bombs if bomb.is_exploding(current_time) and bomb.explosion_cells is not None]
     
     # Find the earliest explosion start time to sync animation
     earliest_explosion_time = None
-    for bomb in bombs:
-        if bomb.is_exploding(current_time) and bomb.explosion_cells is not None:
-            if earliest_explosion_time is None or bomb.explosion_start_time < earliest_explosion_time:
-                earliest_explosion_time = bomb.explosion_start_time
-            # Collect cells that had powerups when this bomb exploded
-            if hasattr(bomb, 'powerup_cells'):
-                powerup_explosion_cells.update(bomb.powerup_cells)
-            # Collect all explosion cells and track which bomb owns them
-            bomb_owner = bomb.placed_by if bomb.placed_by else 1  # Default to player 1 if not set
-            for grid_x, grid_y in bomb.explosion_cells:
-                all_explosion_cells.add((grid_x, grid_y))
-                # Track which bomb owns this cell (use first bomb that claims it, or prefer player 1)
-                if (grid_x, grid_y) not in cell_bomb_owner:
-                    cell_bomb_owner[(grid_x, grid_y)] = bomb_owner
-            # Track bomb positions
-            bomb_positions.add((bomb.grid_x, bomb.grid_y))
+    for bomb in exploding_bombs:
+        if earliest_explosion_time is None or bomb.explosion_start_time < earliest_explosion_time:
+            earliest_explosion_time = bomb.explosion_start_time
     
     # Calculate animation progress based on earliest explosion
     animation_row = 0
@@ -2515,101 +2787,252 @@ def draw_bombs(current_time):
         animation_row = int(explosion_progress * 4.5)  # Reaches row 2 at ~89% of duration
         animation_row = min(animation_row, 4)  # Clamp to max row index (row 2)
     
-    # Draw each cell using pattern-based sprite selection
+    # Draw the cached explosion overlay
     if explosion_sprites_loaded:
-        for grid_x, grid_y in all_explosion_cells:
-            # Skip drawing explosion if there's a breaking block, current powerup, or powerup was destroyed here
-            if (grid_x, grid_y) in breaking_blocks or (grid_x, grid_y) in powerups or (grid_x, grid_y) in powerup_explosion_cells:
+        for cell, position, sprite in get_explosion_overlay(exploding_bombs, animation_row):
+            # Skip drawing explosion if there's a breaking block or current powerup
+            if cell in breaking_blocks or cell in powerups:
                 continue
-                
-            cell_x = grid_x * CELL_SIZE
-            cell_y = grid_y * CELL_SIZE
-            
-            # Determine which player's bomb owns this cell (default to player 1)
-            cell_owner = cell_bomb_owner.get((grid_x, grid_y), 1)
-            
-            # Get sprite based on overall explosion pattern, using the correct sprite set
-            sprite, sprite_type = get_sprite_for_cell_from_pattern(grid_x, grid_y, all_explosion_cells, bomb_positions, animation_row, cell_owner)
-            
-            if sprite:
-                window.blit(sprite, (cell_x, cell_y))
+            frame_draw_list.append((sprite, position))
     
     # Fallback to fiery explosion effect if sprites didn't load (also avoid overlapping)
     if not explosion_sprites_loaded:
         drawn_cells = set()
-        for bomb in bombs:
-            if bomb.is_exploding(current_time) and bomb.explosion_cells is not None:
-                # Collect cells that had powerups when this bomb exploded
-                if hasattr(bomb, 'powerup_cells'):
-                    powerup_explosion_cells.update(bomb.powerup_cells)
+        # Cells that had powerups when any of the explosions happened
+        powerup_explosion_cells = get_explosion_powerup_cells(exploding_bombs)
+        for bomb in exploding_bombs:
+            explosion_progress = (current_time - bomb.explosion_start_time) / BOMB_EXPLOSION_DURATION
+            
+            for grid_x, grid_y in bomb.explosion_cells:
+                if (grid_x, grid_y) in drawn_cells:
+                    continue
+                # Skip drawing explosion if there's a breaking block, current powerup, or powerup was destroyed here
+                if (grid_x, grid_y) in breaking_blocks or (grid_x, grid_y) in powerups or (grid_x, grid_y) in powerup_explosion_cells:
+                    continue
+                drawn_cells.add((grid_x, grid_y))
                 
-                explosion_progress = (current_time - bomb.explosion_start_time) / BOMB_EXPLOSION_DURATION
+                cell_x = grid_x * CELL_SIZE
+                cell_y = grid_y * CELL_SIZE
                 
-                for grid_x, grid_y in bomb.explosion_cells:
-                    if (grid_x, grid_y) in drawn_cells:
-                        continue
-                    # Skip drawing explosion if there's a breaking block, current powerup, or powerup was destroyed here
-                    if (grid_x, grid_y) in breaking_blocks or (grid_x, grid_y) in powerups or (grid_x, grid_y) in powerup_explosion_cells:
-                        continue
-                    drawn_cells.add((grid_x, grid_y))
-                    
-                    cell_x = grid_x * CELL_SIZE
-                    cell_y = grid_y * CELL_SIZE
-                    
-                    dx = grid_x - bomb.grid_x
-                    dy = grid_y - bomb.grid_y
-                    distance = (dx * dx + dy * dy) ** 0.5
-                    # Get explosion range from the player who placed the bomb
-                    max_distance = BOMB_EXPLOSION_RANGE  # Default fallback
-                    if bomb.placed_by == 1 and player1:
-                        max_distance = player1.explosion_range
-                    elif bomb.placed_by == 2 and player2:
-                        max_distance = player2.explosion_range
-                    elif bomb.placed_by == 3 and player3:
-                        max_distance = player3.explosion_range
-                    elif bomb.placed_by == 4 and player4:
-                        max_distance = player4.explosion_range
-                    
-                    pulse = 0.7 + 0.3 * abs(math.sin(explosion_progress * math.pi * 4))
-                    alpha = int(180 * pulse)
-                    
-                    if distance == 0:
-                        fire_color = (255, int(50 * pulse), 0)
-                    elif distance <= max_distance / 2:
-                        fire_color = (255, int(100 * pulse), int(20 * pulse))
-                    else:
-                        fire_color = (255, int(200 * pulse), int(50 * pulse))
-                    
-                    blast_surface = pygame.Surface((CELL_SIZE, CELL_SIZE))
-                    blast_surface.set_alpha(alpha)
-                    blast_surface.fill(fire_color)
-                    window.blit(blast_surface, (cell_x, cell_y))
-    
-    # Draw bomb sprites (only if not exploded) with pulsing animation
-    # Animation sequence: first sprite -> second sprite -> third sprite -> loop between second and third
-    # Skip drawing bombs that are being held by player (they're drawn over player's head)
-    # Skip drawing bombs that are being picked up (they're drawn in draw_player function)
-    # Skip drawing thrown bombs (they're drawn separately after powerups)
-    for bomb in bombs:
-        if not bomb.exploded:
-            # Skip drawing if bomb is being held (thrown and not moving)
-            if bomb.is_thrown and not bomb.is_moving:
-                continue
-            # Skip drawing if bomb is being picked up (drawn in draw_player function)
-            if (player1 and bomb == player1.glove_pickup_bomb) or (player2 and bomb == player2.glove_pickup_bomb):
-                continue
-            # Skip drawing thrown bombs (they're drawn separately after powerups)
-            if bomb.is_thrown:
-                continue
+                dx = grid_x - bomb.grid_x
+                dy = grid_y - bomb.grid_y
+                distance = (dx * dx + dy * dy) ** 0.5
+                # Get explosion range from the player who placed the bomb
+                max_distance = BOMB_EXPLOSION_RANGE  # Default fallback
+                if bomb.placed_by == 1 and player1:
+                    max_distance = player1.explosion_range
+                elif bomb.placed_by == 2 and player2:
+                    max_distance = player2.explosion_range
+                elif bomb.placed_by == 3 and player3:
+                    max_distance = player3.explosion_range
+                elif bomb.placed_by == 4 and player4:
+                    max_distance = player4.explosion_range
                 
-            # Use grid position for non-thrown bombs
-            x, y = bomb.get_pixel_pos()
-            
-            # Apply bounce offset for visual bounce animation
-            bounce_offset = bomb.bounce_offset if hasattr(bomb, 'bounce_offset') else 0.0
-            draw_y = y - bounce_offset  # Subtract offset so bomb bounces upward
-            
-            # Normal drawing for non-thrown bombs
+                pulse = 0.7 + 0.3 * abs(math.sin(explosion_progress * math.pi * 4))
+                alpha = int(180 * pulse)
+                
+                if distance == 0:
+                    fire_color = (255, int(50 * pulse), 0)
+                elif distance <= max_distance / 2:
+                    fire_color = (255, int(100 * pulse), int(20 * pulse))
+                else:
+                    fire_color = (255, int(200 * pulse), int(50 * pulse))
+                
+                blast_surface = pygame.Surface((CELL_SIZE, CELL_SIZE))
+                blast_surface.set_alpha(alpha)
+                blast_surface.fill(fire_color)
+                frame_draw_list.append((blast_surface, (cell_x, cell_y)))
+
+def draw_bomb(bomb, current_time):
+    """Draw a bomb sitting on the grid with pulsing animation"""
+    # Use grid position for non-thrown bombs
+    x, y = bomb.get_pixel_pos()
+    
+    # Apply bounce offset for visual bounce animation
+    bounce_offset = bomb.bounce_offset if hasattr(bomb, 'bounce_offset') else 0.0
+    draw_y = y - bounce_offset  # Subtract offset so bomb bounces upward
+    
+    # Normal drawing for non-thrown bombs
+    # Choose sprite list based on which player placed the bomb
+    # NOTE: Animation pattern, timing, and rendering logic are IDENTICAL for all players
+    # Only the sprite source differs (bomb_sprites vs bomb2_sprites vs bomb3_sprites vs bomb4_sprites)
+    if bomb.placed_by == 1:
+        sprite_list = bomb_sprites
+        sprite_loaded = bomb_sprite_loaded
+    elif bomb.placed_by == 2:
+        sprite_list = bomb2_sprites
+        sprite_loaded = bomb2_sprite_loaded
+    elif bomb.placed_by == 3:
+        sprite_list = bomb3_sprites
+        sprite_loaded = bomb3_sprite_loaded
+    elif bomb.placed_by == 4:
+        sprite_list = bomb4_sprites
+        sprite_loaded = bomb4_sprite_loaded
+    else:
+        sprite_list = bomb_sprites
+        sprite_loaded = bomb_sprite_loaded
+    
+    if sprite_loaded and len(sprite_list) >= 3:
+        # Calculate animation frame based on time elapsed since bomb was placed
+        # Same calculation for both players
+        time_since_placed = current_time - bomb.placed_time
+        frame_count = time_since_placed // BOMB_ANIMATION_SPEED
+        
+        # Animation sequence: 0 -> 1 -> 2 -> 1 -> 0 -> 1 -> 2 -> 1 -> 0 -> ...
+        # Pattern: [0, 1, 2, 1, 0] repeating - IDENTICAL for both players
+        animation_pattern = [0, 1, 2, 1, 0]
+        frame_index = animation_pattern[frame_count % len(animation_pattern)]
+        
+        bomb_sprite = sprite_list[frame_index]
+        # Draw bomb sprite centered on bomb position with bounce offset
+        sprite_rect = bomb_sprite.get_rect(center=(int(x), int(draw_y)))
+        frame_draw_list.append((bomb_sprite, sprite_rect))
+    else:
+        # Fallback to circle if sprite didn't load
+        # Use different colors for different players
+        shape_layer = get_shape_layer()
+        if bomb.placed_by == 2:
+            pygame.draw.circle(shape_layer, BLUE, (int(x), int(draw_y)), CELL_SIZE // 3)
+            pygame.draw.circle(shape_layer, BLACK, (int(x), int(draw_y)), CELL_SIZE // 6)
+        elif bomb.placed_by == 3:
+            pygame.draw.circle(shape_layer, GREEN, (int(x), int(draw_y)), CELL_SIZE // 3)
+            pygame.draw.circle(shape_layer, BLACK, (int(x), int(draw_y)), CELL_SIZE // 6)
+        elif bomb.placed_by == 4:
+            pygame.draw.circle(shape_layer, YELLOW, (int(x), int(draw_y)), CELL_SIZE // 3)
+            pygame.draw.circle(shape_layer, BLACK, (int(x), int(draw_y)), CELL_SIZE // 6)
+        else:
+            pygame.draw.circle(shape_layer, ORANGE, (int(x), int(draw_y)), CELL_SIZE // 3)
+            pygame.draw.circle(shape_layer, BLACK, (int(x), int(draw_y)), CELL_SIZE // 6)
+
+def draw_thrown_bomb(bomb, current_time):
+    """Draw a thrown bomb in flight"""
+    # Use actual pixel position for thrown bombs to show wrapping correctly
+    x = bomb.pixel_x
+    y = bomb.pixel_y
+    
+    # Apply bounce offset for visual bounce animation
+    bounce_offset = bomb.bounce_offset if hasattr(bomb, 'bounce_offset') else 0.0
+    draw_y = y - bounce_offset  # Subtract offset so bomb bounces upward
+    
+    # Draw bomb at current position and wrapped positions when offscreen (Pac-Man style)
+    draw_positions = set()  # Use set to avoid duplicates
+    bomb_radius = CELL_SIZE // 2
+    
+    # Check if bomb is wrapping on X or Y axis
+    x_wrapping = (x < 0 or x > WINDOW_WIDTH)
+    y_wrapping = (draw_y < 0 or draw_y > WINDOW_HEIGHT)
+    
+    # Check if bomb just wrapped back onscreen (for wraparound animation)
+    # Show wraparound animation as long as the flag is active, regardless of distance or bouncing
+    just_wrapped_back_draw = False
+    if hasattr(bomb, 'just_wrapped_back_offscreen') and bomb.just_wrapped_back_offscreen:
+        # Always show wraparound animation when flag is active
+        # Check distance traveled since wrapping back to determine if animation should continue
+        if hasattr(bomb, 'wrap_back_pixel_x') and bomb.wrap_back_pixel_x is not None:
+            # Calculate actual distance traveled (accounting for wrapping)
+            dx_wrap = x - bomb.wrap_back_pixel_x
+            dy_wrap = draw_y - bomb.wrap_back_pixel_y
+            # Account for wrapping in distance calculation
+            if abs(dx_wrap) > WINDOW_WIDTH / 2:
+                if dx_wrap > 0:
+                    dx_wrap = dx_wrap - WINDOW_WIDTH
+                else:
+                    dx_wrap = dx_wrap + WINDOW_WIDTH
+            if abs(dy_wrap) > WINDOW_HEIGHT / 2:
+                if dy_wrap > 0:
+                    dy_wrap = dy_wrap - WINDOW_HEIGHT
+                else:
+                    dy_wrap = dy_wrap + WINDOW_HEIGHT
+            distance_from_wrap_edge = math.sqrt(dx_wrap**2 + dy_wrap**2)
+            # Show animation until bomb has traveled at least 3 tiles from wrap edge
+            # This ensures wraparound is visible even when target is far away or when bouncing
+            if distance_from_wrap_edge < CELL_SIZE * 3:
+                just_wrapped_back_draw = True
+        elif hasattr(bomb, 'wrap_back_pixel_y') and bomb.wrap_back_pixel_y is not None:
+            # Calculate actual distance traveled (accounting for wrapping)
+            dx_wrap = x - bomb.wrap_back_pixel_x if hasattr(bomb, 'wrap_back_pixel_x') and bomb.wrap_back_pixel_x is not None else 0
+            dy_wrap = draw_y - bomb.wrap_back_pixel_y
+            # Account for wrapping in distance calculation
+            if abs(dx_wrap) > WINDOW_WIDTH / 2:
+                if dx_wrap > 0:
+                    dx_wrap = dx_wrap - WINDOW_WIDTH
+                else:
+                    dx_wrap = dx_wrap + WINDOW_WIDTH
+            if abs(dy_wrap) > WINDOW_HEIGHT / 2:
+                if dy_wrap > 0:
+                    dy_wrap = dy_wrap - WINDOW_HEIGHT
+                else:
+                    dy_wrap = dy_wrap + WINDOW_HEIGHT
+            distance_from_wrap_edge = math.sqrt(dx_wrap**2 + dy_wrap**2)
+            # Show animation until bomb has traveled at least 3 tiles from wrap edge
+            if distance_from_wrap_edge < CELL_SIZE * 3:
+                just_wrapped_back_draw = True
+        else:
+            # If wrap position not set, show animation anyway if flag is active
+            just_wrapped_back_draw = True
+    
+    # Calculate wrapped positions
+    if x < 0:
+        wrapped_x = x + WINDOW_WIDTH
+    elif x > WINDOW_WIDTH:
+        wrapped_x = x - WINDOW_WIDTH
+    else:
+        wrapped_x = x
+    
+    if draw_y < 0:
+        wrapped_y = draw_y + WINDOW_HEIGHT
+    elif draw_y > WINDOW_HEIGHT:
+        wrapped_y = draw_y - WINDOW_HEIGHT
+    else:
+        wrapped_y = draw_y
+    
+    # Pac-Man style: Show bomb at both edges when wrapping
+    # Always add current position (will be clipped if offscreen)
+    draw_positions.add((x, draw_y))
+    
+    # Add wrapped positions when wrapping OR when bomb just wrapped back onscreen (for animation)
+    # This ensures wraparound animation is visible even when bomb is onscreen but recently wrapped
+    if x_wrapping or just_wrapped_back_draw:
+        # Show wrapped X position with current Y
+        # If bomb just wrapped back, calculate wrapped position based on throw direction
+        if just_wrapped_back_draw and not x_wrapping:
+            # Bomb wrapped back and is now onscreen - show at opposite edge for wraparound effect
+            if hasattr(bomb, 'throw_direction_x') and bomb.throw_direction_x != 0:
+                if bomb.throw_direction_x > 0:  # Moving right, show at left edge
+                    wrapped_x_draw = x - WINDOW_WIDTH
+                else:  # Moving left, show at right edge
+                    wrapped_x_draw = x + WINDOW_WIDTH
+                draw_positions.add((wrapped_x_draw, draw_y))
+        else:
+            # Normal wrapping - show wrapped position
+            draw_positions.add((wrapped_x, draw_y))
+        
+        # If Y is also wrapping, show fully wrapped position
+        if y_wrapping:
+            draw_positions.add((wrapped_x, wrapped_y))
+    
+    if y_wrapping or just_wrapped_back_draw:
+        # Show wrapped Y position with current X (if X wasn't already handled)
+        if not x_wrapping and not (just_wrapped_back_draw and hasattr(bomb, 'throw_direction_x') and bomb.throw_direction_x != 0):
+            # If bomb just wrapped back vertically, calculate wrapped position
+            if just_wrapped_back_draw and not y_wrapping:
+                if hasattr(bomb, 'throw_direction_y') and bomb.throw_direction_y != 0:
+                    if bomb.throw_direction_y > 0:  # Moving down, show at top edge
+                        wrapped_y_draw = draw_y - WINDOW_HEIGHT
+                    else:  # Moving up, show at bottom edge
+                        wrapped_y_draw = draw_y + WINDOW_HEIGHT
+                    draw_positions.add((x, wrapped_y_draw))
+            else:
+                draw_positions.add((x, wrapped_y))
+        # Fully wrapped position already added above if x_wrapping is True
+    
+    # Draw at all positions (only positions that are actually visible on screen)
+    # Use larger margin to show bomb going offscreen and coming back onscreen (Pac-Man style)
+    visibility_margin = CELL_SIZE * 2  # Allow bomb to be visible even when partially offscreen
+    for draw_x, draw_y_pos in draw_positions:
+        # Only draw if position is actually on the visible screen (with margin for partial visibility)
+        if (draw_x >= -visibility_margin and draw_x <= WINDOW_WIDTH + visibility_margin and
+            draw_y_pos >= -visibility_margin and draw_y_pos <= WINDOW_HEIGHT + visibility_margin):
             # Choose sprite list based on which player placed the bomb
             # NOTE: Animation pattern, timing, and rendering logic are IDENTICAL for all players
             # Only the sprite source differs (bomb_sprites vs bomb2_sprites vs bomb3_sprites vs bomb4_sprites)
@@ -2642,208 +3065,24 @@ def draw_bombs(current_time):
                 
                 bomb_sprite = sprite_list[frame_index]
                 # Draw bomb sprite centered on bomb position with bounce offset
-                sprite_rect = bomb_sprite.get_rect(center=(int(x), int(draw_y)))
-                window.blit(bomb_sprite, sprite_rect)
+                sprite_rect = bomb_sprite.get_rect(center=(int(draw_x), int(draw_y_pos)))
+                frame_draw_list.append((bomb_sprite, sprite_rect))
             else:
                 # Fallback to circle if sprite didn't load
                 # Use different colors for different players
+                shape_layer = get_shape_layer()
                 if bomb.placed_by == 2:
-                    pygame.draw.circle(window, BLUE, (int(x), int(draw_y)), CELL_SIZE // 3)
-                    pygame.draw.circle(window, BLACK, (int(x), int(draw_y)), CELL_SIZE // 6)
+                    pygame.draw.circle(shape_layer, BLUE, (int(draw_x), int(draw_y_pos)), CELL_SIZE // 3)
+                    pygame.draw.circle(shape_layer, BLACK, (int(draw_x), int(draw_y_pos)), CELL_SIZE // 6)
                 elif bomb.placed_by == 3:
-                    pygame.draw.circle(window, GREEN, (int(x), int(draw_y)), CELL_SIZE // 3)
-                    pygame.draw.circle(window, BLACK, (int(x), int(draw_y)), CELL_SIZE // 6)
+                    pygame.draw.circle(shape_layer, GREEN, (int(draw_x), int(draw_y_pos)), CELL_SIZE // 3)
+                    pygame.draw.circle(shape_layer, BLACK, (int(draw_x), int(draw_y_pos)), CELL_SIZE // 6)
                 elif bomb.placed_by == 4:
-                    pygame.draw.circle(window, YELLOW, (int(x), int(draw_y)), CELL_SIZE // 3)
-                    pygame.draw.circle(window, BLACK, (int(x), int(draw_y)), CELL_SIZE // 6)
-                else:
-                    pygame.draw.circle(window, ORANGE, (int(x), int(draw_y)), CELL_SIZE // 3)
-                    pygame.draw.circle(window, BLACK, (int(x), int(draw_y)), CELL_SIZE // 6)
-
-def draw_thrown_bombs(current_time):
-    """Draw thrown bombs (called after powerups so they appear in front)"""
-    for bomb in bombs:
-        if not bomb.exploded and bomb.is_thrown and bomb.is_moving:
-            # Skip drawing if bomb is being picked up (drawn in draw_player function)
-            if (player1 and bomb == player1.glove_pickup_bomb) or (player2 and bomb == player2.glove_pickup_bomb):
-                continue
-                
-            # Use actual pixel position for thrown bombs to show wrapping correctly
-            x = bomb.pixel_x
-            y = bomb.pixel_y
-            
-            # Apply bounce offset for visual bounce animation
-            bounce_offset = bomb.bounce_offset if hasattr(bomb, 'bounce_offset') else 0.0
-            draw_y = y - bounce_offset  # Subtract offset so bomb bounces upward
-            
-            # Draw bomb at current position and wrapped positions when offscreen (Pac-Man style)
-            draw_positions = set()  # Use set to avoid duplicates
-            bomb_radius = CELL_SIZE // 2
-            
-            # Check if bomb is wrapping on X or Y axis
-            x_wrapping = (x < 0 or x > WINDOW_WIDTH)
-            y_wrapping = (draw_y < 0 or draw_y > WINDOW_HEIGHT)
-            
-            # Check if bomb just wrapped back onscreen (for wraparound animation)
-            # Show wraparound animation as long as the flag is active, regardless of distance or bouncing
-            just_wrapped_back_draw = False
-            if hasattr(bomb, 'just_wrapped_back_offscreen') and bomb.just_wrapped_back_offscreen:
-                # Always show wraparound animation when flag is active
-                # Check distance traveled since wrapping back to determine if animation should continue
-                if hasattr(bomb, 'wrap_back_pixel_x') and bomb.wrap_back_pixel_x is not None:
-                    # Calculate actual distance traveled (accounting for wrapping)
-                    dx_wrap = x - bomb.wrap_back_pixel_x
-                    dy_wrap = draw_y - bomb.wrap_back_pixel_y
-                    # Account for wrapping in distance calculation
-                    if abs(dx_wrap) > WINDOW_WIDTH / 2:
-                        if dx_wrap > 0:
-                            dx_wrap = dx_wrap - WINDOW_WIDTH
-                        else:
-                            dx_wrap = dx_wrap + WINDOW_WIDTH
-                    if abs(dy_wrap) > WINDOW_HEIGHT / 2:
-                        if dy_wrap > 0:
-                            dy_wrap = dy_wrap - WINDOW_HEIGHT
-                        else:
-                            dy_wrap = dy_wrap + WINDOW_HEIGHT
-                    distance_from_wrap_edge = math.sqrt(dx_wrap**2 + dy_wrap**2)
-                    # Show animation until bomb has traveled at least 3 tiles from wrap edge
-                    # This ensures wraparound is visible even when target is far away or when bouncing
-                    if distance_from_wrap_edge < CELL_SIZE * 3:
-                        just_wrapped_back_draw = True
-                elif hasattr(bomb, 'wrap_back_pixel_y') and bomb.wrap_back_pixel_y is not None:
-                    # Calculate actual distance traveled (accounting for wrapping)
-                    dx_wrap = x - bomb.wrap_back_pixel_x if hasattr(bomb, 'wrap_back_pixel_x') and bomb.wrap_back_pixel_x is not None else 0
-                    dy_wrap = draw_y - bomb.wrap_back_pixel_y
-                    # Account for wrapping in distance calculation
-                    if abs(dx_wrap) > WINDOW_WIDTH / 2:
-                        if dx_wrap > 0:
-                            dx_wrap = dx_wrap - WINDOW_WIDTH
-                        else:
-                            dx_wrap = dx_wrap + WINDOW_WIDTH
-                    if abs(dy_wrap) > WINDOW_HEIGHT / 2:
-                        if dy_wrap > 0:
-                            dy_wrap = dy_wrap - WINDOW_HEIGHT
-                        else:
-                            dy_wrap = dy_wrap + WINDOW_HEIGHT
-                    distance_from_wrap_edge = math.sqrt(dx_wrap**2 + dy_wrap**2)
-                    # Show animation until bomb has traveled at least 3 tiles from wrap edge
-                    if distance_from_wrap_edge < CELL_SIZE * 3:
-                        just_wrapped_back_draw = True
-                else:
-                    # If wrap position not set, show animation anyway if flag is active
-                    just_wrapped_back_draw = True
-            
-            # Calculate wrapped positions
-            if x < 0:
-                wrapped_x = x + WINDOW_WIDTH
-            elif x > WINDOW_WIDTH:
-                wrapped_x = x - WINDOW_WIDTH
-            else:
-                wrapped_x = x
-            
-            if draw_y < 0:
-                wrapped_y = draw_y + WINDOW_HEIGHT
-            elif draw_y > WINDOW_HEIGHT:
-                wrapped_y = draw_y - WINDOW_HEIGHT
-            else:
-                wrapped_y = draw_y
-            
-            # Pac-Man style: Show bomb at both edges when wrapping
-            # Always add current position (will be clipped if offscreen)
-            draw_positions.add((x, draw_y))
-            
-            # Add wrapped positions when wrapping OR when bomb just wrapped back onscreen (for animation)
-            # This ensures wraparound animation is visible even when bomb is onscreen but recently wrapped
-            if x_wrapping or just_wrapped_back_draw:
-                # Show wrapped X position with current Y
-                # If bomb just wrapped back, calculate wrapped position based on throw direction
-                if just_wrapped_back_draw and not x_wrapping:
-                    # Bomb wrapped back and is now onscreen - show at opposite edge for wraparound effect
-                    if hasattr(bomb, 'throw_direction_x') and bomb.throw_direction_x != 0:
-                        if bomb.throw_direction_x > 0:  # Moving right, show at left edge
-                            wrapped_x_draw = x - WINDOW_WIDTH
-                        else:  # Moving left, show at right edge
-                            wrapped_x_draw = x + WINDOW_WIDTH
-                        draw_positions.add((wrapped_x_draw, draw_y))
+                    pygame.draw.circle(shape_layer, YELLOW, (int(draw_x), int(draw_y_pos)), CELL_SIZE // 3)
+                    pygame.draw.circle(shape_layer, BLACK, (int(draw_x), int(draw_y_pos)), CELL_SIZE // 6)
                 else:
-                    # Normal wrapping - show wrapped position
-                    draw_positions.add((wrapped_x, draw_y))
-                
-                # If Y is also wrapping, show fully wrapped position
-                if y_wrapping:
-                    draw_positions.add((wrapped_x, wrapped_y))
-            
-            if y_wrapping or just_wrapped_back_draw:
-                # Show wrapped Y position with current X (if X wasn't already handled)
-                if not x_wrapping and not (just_wrapped_back_draw and hasattr(bomb, 'throw_direction_x') and bomb.throw_direction_x != 0):
-                    # If bomb just wrapped back vertically, calculate wrapped position
-                    if just_wrapped_back_draw and not y_wrapping:
-                        if hasattr(bomb, 'throw_direction_y') and bomb.throw_direction_y != 0:
-                            if bomb.throw_direction_y > 0:  # Moving down, show at top edge
-                                wrapped_y_draw = draw_y - WINDOW_HEIGHT
-                            else:  # Moving up, show at bottom edge
-                                wrapped_y_draw = draw_y + WINDOW_HEIGHT
-                            draw_positions.add((x, wrapped_y_draw))
-                    else:
-                        draw_positions.add((x, wrapped_y))
-                # Fully wrapped position already added above if x_wrapping is True
-            
-            # Draw at all positions (only positions that are actually visible on screen)
-            # Use larger margin to show bomb going offscreen and coming back onscreen (Pac-Man style)
-            visibility_margin = CELL_SIZE * 2  # Allow bomb to be visible even when partially offscreen
-            for draw_x, draw_y_pos in draw_positions:
-                # Only draw if position is actually on the visible screen (with margin for partial visibility)
-                if (draw_x >= -visibility_margin and draw_x <= WINDOW_WIDTH + visibility_margin and
-                    draw_y_pos >= -visibility_margin and draw_y_pos <= WINDOW_HEIGHT + visibility_margin):
-                    # Choose sprite list based on which player placed the bomb
-                    # NOTE: Animation pattern, timing, and rendering logic are IDENTICAL for all players
-                    # Only the sprite source differs (bomb_sprites vs bomb2_sprites vs bomb3_sprites vs bomb4_sprites)
-                    if bomb.placed_by == 1:
-                        sprite_list = bomb_sprites
-                        sprite_loaded = bomb_sprite_loaded
-                    elif bomb.placed_by == 2:
-                        sprite_list = bomb2_sprites
-                        sprite_loaded = bomb2_sprite_loaded
-                    elif bomb.placed_by == 3:
-                        sprite_list = bomb3_sprites
-                        sprite_loaded = bomb3_sprite_loaded
-                    elif bomb.placed_by == 4:
-                        sprite_list = bomb4_sprites
-                        sprite_loaded = bomb4_sprite_loaded
-                    else:
-                        sprite_list = bomb_sprites
-                        sprite_loaded = bomb_sprite_loaded
-                    
-                    if sprite_loaded and len(sprite_list) >= 3:
-                        # Calculate animation frame based on time elapsed since bomb was placed
-                        # Same calculation for both players
-                        time_since_placed = current_time - bomb.placed_time
-                        frame_count = time_since_placed // BOMB_ANIMATION_SPEED
-                        
-                        # Animation sequence: 0 -> 1 -> 2 -> 1 -> 0 -> 1 -> 2 -> 1 -> 0 -> ...
-                        # Pattern: [0, 1, 2, 1, 0] repeating - IDENTICAL for both players
-                        animation_pattern = [0, 1, 2, 1, 0]
-                        frame_index = animation_pattern[frame_count % len(animation_pattern)]
-                        
-                        bomb_sprite = sprite_list[frame_index]
-                        # Draw bomb sprite centered on bomb position with bounce offset
-                        sprite_rect = bomb_sprite.get_rect(center=(int(draw_x), int(draw_y_pos)))
-                        window.blit(bomb_sprite, sprite_rect)
-                    else:
-                        # Fallback to circle if sprite didn't load
-                        # Use different colors for different players
-                        if bomb.placed_by == 2:
-                            pygame.draw.circle(window, BLUE, (int(draw_x), int(draw_y_pos)), CELL_SIZE // 3)
-                            pygame.draw.circle(window, BLACK, (int(draw_x), int(draw_y_pos)), CELL_SIZE // 6)
-                        elif bomb.placed_by == 3:
-                            pygame.draw.circle(window, GREEN, (int(draw_x), int(draw_y_pos)), CELL_SIZE // 3)
-                            pygame.draw.circle(window, BLACK, (int(draw_x), int(draw_y_pos)), CELL_SIZE // 6)
-                        elif bomb.placed_by == 4:
-                            pygame.draw.circle(window, YELLOW, (int(draw_x), int(draw_y_pos)), CELL_SIZE // 3)
-                            pygame.draw.circle(window, BLACK, (int(draw_x), int(draw_y_pos)), CELL_SIZE // 6)
-                        else:
-                            pygame.draw.circle(window, ORANGE, (int(draw_x), int(draw_y_pos)), CELL_SIZE // 3)
-                            pygame.draw.circle(window, BLACK, (int(draw_x), int(draw_y_pos)), CELL_SIZE // 6)
+                    pygame.draw.circle(shape_layer, ORANGE, (int(draw_x), int(draw_y_pos)), CELL_SIZE // 3)
+                    pygame.draw.circle(shape_layer, BLACK, (int(draw_x), int(draw_y_pos)), CELL_SIZE // 6)
 
 def calculate_circle_rect_overlap(circle_x, circle_y, circle_radius, rect_x, rect_y, rect_width, rect_height):
     """Calculate the overlap area between a circle and rectangle
@@ -3347,6 +3586,9 @@ def reset_game():
     sudden_death_hurry_animation_end_time = None
     sudden_death_hurry_sound_state = 0
     sudden_death_hurry_sound_start_time = None
+    
+    # Rebuild the prerendered ground and permanent walls for the new match
+    build_background()
 
 def explode_bomb(bomb, current_time, check_player_death=True):
     """Handle bomb explosion - destroy destructible walls in range and trigger chain explosions"""
@@ -3451,22 +3693,22 @@ def draw_powerups(current_time=None):
         # Select sprite based on powerup type
         if powerup_type == 'speed_up' and speed_powerup_sprite_loaded and len(speed_powerup_sprites) >= 2:
             powerup_sprite = speed_powerup_sprites[frame_index]
-            window.blit(powerup_sprite, (x, y))
+            frame_draw_list.append((powerup_sprite, (x, y)))
         elif powerup_type == 'bomb_up' and powerup_sprite_loaded and len(powerup_sprites) >= 2:
             powerup_sprite = powerup_sprites[frame_index]
-            window.blit(powerup_sprite, (x, y))
+            frame_draw_list.append((powerup_sprite, (x, y)))
         elif powerup_type == 'fire_up' and fire_powerup_sprite_loaded and len(fire_powerup_sprites) >= 2:
             powerup_sprite = fire_powerup_sprites[frame_index]
-            window.blit(powerup_sprite, (x, y))
+            frame_draw_list.append((powerup_sprite, (x, y)))
         elif powerup_type == 'kick' and kick_powerup_sprite_loaded and len(kick_powerup_sprites) >= 2:
             powerup_sprite = kick_powerup_sprites[frame_index]
-            window.blit(powerup_sprite, (x, y))
+            frame_draw_list.append((powerup_sprite, (x, y)))
         elif powerup_type == 'glove' and glove_powerup_sprite_loaded and len(glove_powerup_sprites) >= 2:
             powerup_sprite = glove_powerup_sprites[frame_index]
-            window.blit(powerup_sprite, (x, y))
+            frame_draw_list.append((powerup_sprite, (x, y)))
         elif powerup_type == 'skull' and skull_powerup_sprite_loaded and len(skull_powerup_sprites) >= 2:
             powerup_sprite = skull_powerup_sprites[frame_index]
-            window.blit(powerup_sprite, (x, y))
+            frame_draw_list.append((powerup_sprite, (x, y)))
         else:
             # Fallback to colored circle if sprite didn't load
             x_center = grid_x * CELL_SIZE + CELL_SIZE // 2
@@ -3486,7 +3728,8 @@ def draw_powerups(current_time=None):
                 color = (128, 128, 128)  # Gray as fallback color for skull
             else:
                 color = YELLOW
-            pygame.draw.circle(window, color, (x_center, y_center), CELL_SIZE // 3)
+            shape_layer = get_shape_layer()
+            pygame.draw.circle(shape_layer, color, (x_center, y_center), CELL_SIZE // 3)
 
 def draw_item_explosions(current_time=None):
     """Draw item explosion animations"""
@@ -3506,7 +3749,7 @@ def draw_item_explosions(current_time=None):
                 progress = elapsed / ITEM_EXPLOSION_DURATION
                 frame_index = int(progress * len(item_explosion_sprites))
                 frame_index = min(frame_index, len(item_explosion_sprites) - 1)
-                window.blit(item_explosion_sprites[frame_index], (x, y))
+                frame_draw_list.append((item_explosion_sprites[frame_index], (x, y)))
         
         # Remove completed item explosions
         for item_pos in items_to_remove:
@@ -3514,15 +3757,19 @@ def draw_item_explosions(current_time=None):
 
 def draw_hitboxes():
     """Draw hitboxes for debugging"""
+    shape_layer = get_shape_layer()
+    cell_size = to_frame(CELL_SIZE)
+    player_radius = to_frame(PLAYER_RADIUS)
+    
     # Draw player hitboxes (circles)
     if player1:
-        pygame.draw.circle(window, RED, (int(player1.x), int(player1.y)), PLAYER_RADIUS, 2)
+        pygame.draw.circle(shape_layer, RED, (to_frame(int(player1.x)), to_frame(int(player1.y))), player_radius, 2)
     if player2:
-        pygame.draw.circle(window, BLUE, (int(player2.x), int(player2.y)), PLAYER_RADIUS, 2)
+        pygame.draw.circle(shape_layer, BLUE, (to_frame(int(player2.x)), to_frame(int(player2.y))), player_radius, 2)
     if player3:
-        pygame.draw.circle(window, GREEN, (int(player3.x), int(player3.y)), PLAYER_RADIUS, 2)
+        pygame.draw.circle(shape_layer, GREEN, (to_frame(int(player3.x)), to_frame(int(player3.y))), player_radius, 2)
     if player4:
-        pygame.draw.circle(window, YELLOW, (int(player4.x), int(player4.y)), PLAYER_RADIUS, 2)
+        pygame.draw.circle(shape_layer, YELLOW, (to_frame(int(player4.x)), to_frame(int(player4.y))), player_radius, 2)
     
     # Draw bomb hitboxes (cell-sized rectangles)
     for bomb in bombs:
@@ -3538,27 +3785,123 @@ def draw_hitboxes():
                 # Use grid position for stationary bombs
                 bomb_x = bomb.grid_x * CELL_SIZE
                 bomb_y = bomb.grid_y * CELL_SIZE
-            pygame.draw.rect(window, BLUE, (bomb_x, bomb_y, CELL_SIZE, CELL_SIZE), 2)
+            pygame.draw.rect(shape_layer, BLUE, (to_frame(bomb_x), to_frame(bomb_y), cell_size, cell_size), 2)
     
     # Draw wall hitboxes (cell-sized rectangles)
     for wall_x, wall_y in walls:
-        x = wall_x * CELL_SIZE
-        y = wall_y * CELL_SIZE
-        pygame.draw.rect(window, GREEN, (x, y, CELL_SIZE, CELL_SIZE), 1)
+        x = wall_x * cell_size
+        y = wall_y * cell_size
+        pygame.draw.rect(shape_layer, GREEN, (x, y, cell_size, cell_size), 1)
     
     # Draw destructible wall hitboxes
     for wall_x, wall_y in destructible_walls:
         if (wall_x, wall_y) not in breaking_blocks:
-            x = wall_x * CELL_SIZE
-            y = wall_y * CELL_SIZE
-            pygame.draw.rect(window, YELLOW, (x, y, CELL_SIZE, CELL_SIZE), 1)
+            x = wall_x * cell_size
+            y = wall_y * cell_size
+            pygame.draw.rect(shape_layer, YELLOW, (x, y, cell_size, cell_size), 1)
     
     # Draw powerup hitboxes
     for (grid_x, grid_y), powerup_type in powerups.items():
         if (grid_x, grid_y) not in item_explosions:
-            x = grid_x * CELL_SIZE
-            y = grid_y * CELL_SIZE
-            pygame.draw.rect(window, ORANGE, (x, y, CELL_SIZE, CELL_SIZE), 1)
+            x = grid_x * cell_size
+            y = grid_y * cell_size
+            pygame.draw.rect(shape_layer, ORANGE, (x, y, cell_size, cell_size), 1)
+
+# Animation clips
+# Each clip's keyframe timeline is worked out once: the frame values in order and the elapsed
+# time (ms from the start of the clip) each one ends at. The frame showing at any elapsed time is
+# then a bisect into the end times, instead of walking the timing rules every frame.
+class AnimationClip:
+    """Precomputed keyframe timeline"""
+    def __init__(self, values, end_times, loop=False):
+        self.values = values  # Frame values (sprite indices) in order
+        self.end_times = end_times  # Cumulative elapsed time each frame ends at
+        self.duration = end_times[-1]
+        self.loop = loop  # Start over after the last frame (otherwise hold it)
+    
+    def get_frame(self, elapsed):
+        """Get the frame value showing at elapsed milliseconds"""
+        if self.loop:
+            elapsed %= self.duration
+        return self.values[min(bisect.bisect_right(self.end_times, elapsed), len(self.values) - 1)]
+
+def make_clip(frames, loop=False):
+    """Make a clip from (frame value, duration) pairs"""
+    values = []
+    end_times = []
+    end_time = 0
+    for value, duration in frames:
+        end_time += duration
+        values.append(value)
+        end_times.append(end_time)
+    return AnimationClip(values, end_times, loop)
+
+def get_clip_sprite(clip, sprites, elapsed):
+    """Get the sprite a clip shows at elapsed milliseconds (the clip's frame values index sprites)"""
+    return sprites[clip.get_frame(elapsed)]
+
+def make_death_clip():
+    """Make the death animation: 5 spins getting slower, then the collapse (4.6 seconds)"""
+    # Frames 0-20: 5 spins of front, left, back, right, ending on the front sprite, over 1500ms with
+    # quadratic easing out (t * (2 - t), fast at the start and slow at the end). Frame k shows
+    # from when the eased progress reaches k / 21
+    SPIN_DURATION = 1500
+    SPIN_FRAMES = 21
+    SPIN_SPRITES = [0, 3, 2, 1]  # Front, left, back, right
+    values = []
+    end_times = []
+    for frame_index in range(SPIN_FRAMES):
+        values.append(SPIN_SPRITES[frame_index % 4] if frame_index < SPIN_FRAMES - 1 else 0)
+        if frame_index < SPIN_FRAMES - 1:
+            end_times.append(SPIN_DURATION * (1 - math.sqrt(1 - (frame_index + 1) / SPIN_FRAMES)))
+        else:
+            end_times.append(SPIN_DURATION)
+    collapse = make_clip([
+        (0, 250),  # Frame 20: pause on the front-facing sprite
+        (4, 100),  # Frame 21: row 11, sprite 4
+        (5, 250),  # Frame 22: row 12, sprite 1
+        (6, 100),  # Frame 23: row 12, sprite 2
+        (7, 500),  # Frame 24: row 12, sprite 3
+        # Frames 25-31: sprite 4, sprite 3, sprite 5, sprite 3, sprite 4, sprite 3, sprite 5 (0.2 seconds each)
+        (8, 200), (7, 200), (9, 200), (7, 200), (8, 200), (7, 200), (9, 200),
+        (7, 500),  # Frame 32: row 12, sprite 3 (pause for 0.5 seconds)
+    ])
+    values += collapse.values
+    end_times += [SPIN_DURATION + end_time for end_time in collapse.end_times]
+    return AnimationClip(values, end_times)
+
+DEATH_CLIP = make_death_clip()  # Indexes the player's death sprites
+# Glove pickup, per direction (sprite indices: 0=sprite1, 1=sprite2, 2=sprite3, 3=sprite4)
+GLOVE_PICKUP_CLIPS = {
+    'up': make_clip([(index, 60) for index in [2, 3, 2, 1, 0, 2, 3, 2]]),  # Row 5: 3,4,3,2,1,3,4,3
+    'right': make_clip([(2, 60), (3, 180), (1, 120), (3, 60), (2, 60)]),  # Row 6: 3,4,2,4,3 (frames 1 and 2 held longer)
+    'down': make_clip([(index, 60) for index in [1, 2, 1, 0, 1, 2, 1]]),  # Row 7: 2,3,2,1,2,3,2
+    'left': make_clip([(index, 60) for index in [2, 3, 1, 0, 1, 3, 1]]),  # Row 8: 3,4,2,1,2,4,2
+}
+WALK_CLIP = make_clip([(1, 200), (2, 200)], loop=True)  # walk1, walk2
+BOSS_IDLE_CLIP = make_clip([(index, 200) for index in range(4)], loop=True)  # The 4 idle sprites on row 9
+SKULL_FLASH_CLIP = make_clip([(False, 150), (True, 150)], loop=True)  # Skull sprites every other 150ms
+
+# Sprite sets each player number animates with (the names of the sprite set globals and of the
+# flags saying they loaded - None if the set has no flag)
+PLAYER_ANIMATION_SETS = {
+    1: {"skull": "skull_sprites", "skull_loaded": "skull_sprite_loaded",
+        "death": "death_sprites", "death_loaded": None, "skull_death": "skull_death_sprites",
+        "glove": "glove_pickup_sprites", "glove_loaded": "glove_pickup_sprites_loaded",
+        "skull_glove": "skull_glove_pickup_sprites"},
+    2: {"skull": "skull_sprites2", "skull_loaded": "skull_sprite2_loaded",
+        "death": "death_sprites2", "death_loaded": "death_sprites2_loaded", "skull_death": "skull_death_sprites2",
+        "glove": "glove_pickup_sprites2", "glove_loaded": "glove_pickup_sprites2_loaded",
+        "skull_glove": "skull_glove_pickup_sprites2"},
+    3: {"skull": "skull_sprites3", "skull_loaded": "skull_sprite3_loaded",
+        "death": "death_sprites3", "death_loaded": "death_sprites3_loaded", "skull_death": "skull_death_sprites3",
+        "glove": "glove_pickup_sprites3", "glove_loaded": "glove_pickup_sprites3_loaded",
+        "skull_glove": "skull_glove_pickup_sprites3"},
+    4: {"skull": "skull_sprites4", "skull_loaded": "skull_sprite4_loaded",
+        "death": "death_sprites4", "death_loaded": "death_sprites4_loaded", "skull_death": "skull_death_sprites4",
+        "glove": "glove_pickup_sprites4", "glove_loaded": "glove_pickup_sprites4_loaded",
+        "skull_glove": "skull_glove_pickup_sprites4"},
+}
 
 def draw_player(player, current_time=None):
     """Draw the player at their current position with walking animation or death animation"""
@@ -3567,261 +3910,60 @@ def draw_player(player, current_time=None):
     def should_use_skull():
         if not player.has_skull or current_time is None:
             return False
-        # Flash every 150ms (alternate between normal and skull)
-        SKULL_FLASH_SPEED = 150
-        return (current_time // SKULL_FLASH_SPEED) % 2 == 1
+        return SKULL_FLASH_CLIP.get_frame(current_time)
     
     # Check if we should show death animation
     # Choose appropriate death sprites based on player number
-    use_skull_death = should_use_skull()
-    if player.player_num == 2:
-        if use_skull_death and skull_sprite2_loaded:
-            player_death_sprites = skull_death_sprites2
-        elif death_sprites2_loaded:
-            player_death_sprites = death_sprites2
-        else:
-            player_death_sprites = []
-    elif player.player_num == 3:
-        if use_skull_death and skull_sprite3_loaded:
-            player_death_sprites = skull_death_sprites3
-        elif death_sprites3_loaded:
-            player_death_sprites = death_sprites3
-        else:
-            player_death_sprites = []
-    elif player.player_num == 4:
-        if use_skull_death and skull_sprite4_loaded:
-            player_death_sprites = skull_death_sprites4
-        elif death_sprites4_loaded:
-            player_death_sprites = death_sprites4
-        else:
-            player_death_sprites = []
-    else:
-        if use_skull_death and skull_sprite_loaded:
-            player_death_sprites = skull_death_sprites if skull_death_sprites else []
-        else:
-            player_death_sprites = death_sprites if death_sprites else []
+    # (only looked up once the player is dead so they are built on first use)
+    animation_sets = PLAYER_ANIMATION_SETS.get(player.player_num, PLAYER_ANIMATION_SETS[1])
+    player_death_sprites = []
+    if player.game_over and player.death_time is not None:
+        if should_use_skull() and globals()[animation_sets["skull_loaded"]]:
+            player_death_sprites = get_lazy_sprites(animation_sets["skull_death"])
+        elif animation_sets["death_loaded"] is None or globals()[animation_sets["death_loaded"]]:
+            player_death_sprites = get_lazy_sprites(animation_sets["death"])
     if player.game_over and player.death_time is not None and current_time is not None and player_death_sprites:
-        # Death animation: 5 spins, getting slower
-        # Each spin has 4 frames: front, right, back, left (20 frames total)
-        # Frame durations: first spin very quick, gradually getting slower
-        
-        # Calculate total animation duration with specific pauses
-        # Timing breakdown:
-        # Frames 0-19: 5 spins (1500ms with easing)
-        # Frame 20: Front-facing sprite (250ms pause)
-        # Frame 21: Row 11, sprite 4 (0.1 seconds)
-        # Frame 22: Row 12, sprite 1 (500ms pause)
-        # Frame 23: Row 12, sprite 2 (0.1 seconds)
-        # Frame 24: Row 12, sprite 3 (100ms pause)
-        # Frames 25-34: Alternating sprites (sprite 4 and 5, 2 times each, 250ms pause per sprite)
-        SPIN_DURATION = 1500  # milliseconds for spinning phase (with easing)
-        FRONT_PAUSE_DURATION = 250  # milliseconds to pause on front-facing sprite (frame 20)
-        FRAME_21_DURATION = 100  # Row 11, sprite 4 - 0.1 seconds
-        FRAME_22_PAUSE_DURATION = 250  # Row 12, sprite 1 - pause for 0.25 seconds
-        FRAME_23_DURATION = 100  # Row 12, sprite 2 - 0.1 seconds
-        FRAME_24_PAUSE_DURATION = 500  # Row 12, sprite 3 - pause for 0.5 seconds
-        # Frames 25-32: Sequence with 0.2 second delay between each frame
-        # Pattern: sprite 4, sprite 3, sprite 5, sprite 3, sprite 4, sprite 3, sprite 5, sprite 3
-        ALTERNATING_FRAME_DURATION = 200  # milliseconds per frame (0.2 second delay between frames)
-        ALTERNATING_FRAMES = 7  # Frames 25-31 (7 frames before pause)
-        FRAME_32_PAUSE_DURATION = 500  # Frame 32 - pause for 0.5 seconds
-        ALTERNATING_TOTAL_DURATION = ALTERNATING_FRAMES * ALTERNATING_FRAME_DURATION + FRAME_32_PAUSE_DURATION  # 1400ms + 500ms = 1900ms
-        
-        # Calculate cumulative timings
-        TIME_FRAME_20_START = SPIN_DURATION
-        TIME_FRAME_20_END = TIME_FRAME_20_START + FRONT_PAUSE_DURATION
-        TIME_FRAME_21_START = TIME_FRAME_20_END
-        TIME_FRAME_21_END = TIME_FRAME_21_START + FRAME_21_DURATION
-        TIME_FRAME_22_START = TIME_FRAME_21_END
-        TIME_FRAME_22_END = TIME_FRAME_22_START + FRAME_22_PAUSE_DURATION
-        TIME_FRAME_23_START = TIME_FRAME_22_END
-        TIME_FRAME_23_END = TIME_FRAME_23_START + FRAME_23_DURATION
-        TIME_FRAME_24_START = TIME_FRAME_23_END
-        TIME_FRAME_24_END = TIME_FRAME_24_START + FRAME_24_PAUSE_DURATION
-        TIME_ALTERNATING_START = TIME_FRAME_24_END
-        TIME_FRAME_32_START = TIME_ALTERNATING_START + (ALTERNATING_FRAMES * ALTERNATING_FRAME_DURATION)
-        TIME_FRAME_32_END = TIME_FRAME_32_START + FRAME_32_PAUSE_DURATION
-        
-        DEATH_ANIMATION_DURATION = TIME_FRAME_32_END  # Total duration (ends after frame 32 pause)
+        # Death animation: 5 spins getting slower, then the collapse (see DEATH_CLIP)
         elapsed = current_time - player.death_time
         
-        if elapsed < DEATH_ANIMATION_DURATION:
-            SPIN_FRAMES = 21  # Frames 0-20 (includes final front-facing sprite in easing)
-            TOTAL_FRAMES = 33  # Frames 0-32 (removed frames 33-34)
-            
-            if elapsed < TIME_FRAME_20_START:
-                # Spinning phase: use easing function (fast at start, slow at end)
-                # Includes frames 0-20 (5 spins + final front-facing sprite)
-                spin_progress = elapsed / SPIN_DURATION
-                # Use quadratic easing out: t * (2 - t)
-                eased_progress = spin_progress * (2 - spin_progress)
-                frame_index = int(eased_progress * SPIN_FRAMES)
-                frame_index = min(frame_index, SPIN_FRAMES - 1)
-            elif elapsed < TIME_FRAME_20_END:
-                # Pause after front-facing sprite (frame 20)
-                frame_index = 20
-            elif elapsed < TIME_FRAME_21_END:
-                # Frame 21: Row 11, sprite 4 (immediate)
-                frame_index = 21
-            elif elapsed < TIME_FRAME_22_END:
-                # Frame 22: Row 12, sprite 1 (pause for 0.25 seconds)
-                frame_index = 22
-            elif elapsed < TIME_FRAME_23_END:
-                # Frame 23: Row 12, sprite 2 (0.1 seconds)
-                frame_index = 23
-            elif elapsed < TIME_FRAME_24_END:
-                # Frame 24: Row 12, sprite 3 (pause for 0.5 seconds)
-                frame_index = 24
-            elif elapsed < TIME_FRAME_32_START:
-                # Frames 25-31: Sequence with 0.2 second delay between frames
-                alternating_elapsed = elapsed - TIME_ALTERNATING_START
-                sprite_index_in_alternating = int(alternating_elapsed / ALTERNATING_FRAME_DURATION)
-                sprite_index_in_alternating = min(sprite_index_in_alternating, ALTERNATING_FRAMES - 1)
-                frame_index = 25 + sprite_index_in_alternating
-            elif elapsed < TIME_FRAME_32_END:
-                # Frame 32: Pause for 0.5 seconds
-                frame_index = 32
-            else:
-                # Animation complete
-                frame_index = 32
-            
-            # Determine sprite index based on frame
-            if frame_index <= 20:
-                # Spinning frames (0-20): 5 spins + final front-facing sprite (all part of easing)
-                if frame_index == 20:
-                    # Frame 20: Final front-facing sprite
-                    sprite_index = 0  # Front
-                else:
-                    # Frames 0-19: 5 spins
-                    frame_in_spin = frame_index % 4
-                    if frame_in_spin == 0:
-                        sprite_index = 0  # Front
-                    elif frame_in_spin == 1:
-                        sprite_index = 3  # Left
-                    elif frame_in_spin == 2:
-                        sprite_index = 2  # Back
-                    else:  # frame_in_spin == 3
-                        sprite_index = 1  # Right
-            elif frame_index == 21:
-                # Row 11, sprite 4
-                sprite_index = 4  # death_sprites[4]
-            elif frame_index == 22:
-                # Row 12, sprite 1
-                sprite_index = 5  # death_sprites[5]
-            elif frame_index == 23:
-                # Row 12, sprite 2
-                sprite_index = 6  # death_sprites[6]
-            elif frame_index == 24:
-                # Row 12, sprite 3
-                sprite_index = 7  # death_sprites[7]
-            elif frame_index == 32:
-                # Frame 32: Row 12, sprite 3 (pause for 0.5 seconds)
-                sprite_index = 7  # death_sprites[7]
-            else:
-                # Frames 25-31: Sequence pattern with 0.2 second delay between frames
-                # Pattern: sprite 4, sprite 3, sprite 5, sprite 3, sprite 4, sprite 3, sprite 5
-                alternating_frame = frame_index - 25
-                pattern = [8, 7, 9, 7, 8, 7, 9]  # sprite 4 (8), sprite 3 (7), sprite 5 (9), etc.
-                sprite_index = pattern[alternating_frame] if alternating_frame < len(pattern) else 7  # Default to sprite 3
-            
-            # Use death sprites (already selected based on player number)
-            sprite = player_death_sprites[sprite_index]
+        if elapsed < DEATH_CLIP.duration:
+            sprite = get_clip_sprite(DEATH_CLIP, player_death_sprites, elapsed)
             
             # Draw death sprite
             sprite_width, sprite_height = sprite.get_size()
             offset_below = 4
             sprite_x = int(player.x - sprite_width // 2)
             sprite_y = int((player.y + PLAYER_RADIUS + offset_below) - sprite_height)
-            window.blit(sprite, (sprite_x, sprite_y))
+            frame_draw_list.append((sprite, (sprite_x, sprite_y)))
             return
     
     # Check if we should show glove pickup animation
     # Animation plays when: player has glove, is standing on bomb
     # Choose appropriate glove pickup sprites based on player number
-    use_skull_glove = should_use_skull()
-    if player.player_num == 2:
-        if use_skull_glove and skull_sprite2_loaded:
-            player_glove_sprites = skull_glove_pickup_sprites2 if skull_glove_pickup_sprites2 else {}
-            player_glove_sprites_loaded = bool(skull_glove_pickup_sprites2)
-        elif glove_pickup_sprites2_loaded:
-            player_glove_sprites = glove_pickup_sprites2
-            player_glove_sprites_loaded = True
-        else:
-            player_glove_sprites = {}
-            player_glove_sprites_loaded = False
-    elif player.player_num == 3:
-        if use_skull_glove and skull_sprite3_loaded:
-            player_glove_sprites = skull_glove_pickup_sprites3 if skull_glove_pickup_sprites3 else {}
-            player_glove_sprites_loaded = bool(skull_glove_pickup_sprites3)
-        elif glove_pickup_sprites3_loaded:
-            player_glove_sprites = glove_pickup_sprites3
-            player_glove_sprites_loaded = True
-        else:
-            player_glove_sprites = {}
-            player_glove_sprites_loaded = False
-    elif player.player_num == 4:
-        if use_skull_glove and skull_sprite4_loaded:
-            player_glove_sprites = skull_glove_pickup_sprites4 if skull_glove_pickup_sprites4 else {}
-            player_glove_sprites_loaded = bool(skull_glove_pickup_sprites4)
-        elif glove_pickup_sprites4_loaded:
-            player_glove_sprites = glove_pickup_sprites4
+    # (skull glove sprites are only looked up while the animation plays so they are built on first use)
+    player_glove_sprites = {}
+    player_glove_sprites_loaded = False
+    if player.glove_pickup_animation_start_time is not None:
+        if should_use_skull() and globals()[animation_sets["skull_loaded"]]:
+            player_glove_sprites = get_lazy_sprites(animation_sets["skull_glove"])
+            player_glove_sprites_loaded = bool(player_glove_sprites)
+        elif globals()[animation_sets["glove_loaded"]]:
+            player_glove_sprites = globals()[animation_sets["glove"]]
             player_glove_sprites_loaded = True
-        else:
-            player_glove_sprites = {}
-            player_glove_sprites_loaded = False
-    else:
-        if use_skull_glove and skull_sprite_loaded:
-            player_glove_sprites = skull_glove_pickup_sprites if skull_glove_pickup_sprites else {}
-            player_glove_sprites_loaded = bool(skull_glove_pickup_sprites)
-        else:
-            player_glove_sprites = glove_pickup_sprites if glove_pickup_sprites_loaded else {}
-            player_glove_sprites_loaded = (player.player_num == 1 and glove_pickup_sprites_loaded)
     
     if (player.glove_pickup_animation_start_time is not None and player.glove_pickup_animation_direction is not None and 
         current_time is not None and player_glove_sprites_loaded and 
         player.glove_pickup_animation_direction in player_glove_sprites):
         
-        # Get sprites for current direction
+        # Get sprites and the pickup clip for current direction
         direction_sprites = player_glove_sprites[player.glove_pickup_animation_direction]
-        
-        # Define animation sequences for each direction (sprite indices: 0=sprite1, 1=sprite2, 2=sprite3, 3=sprite4)
-        sequences = {
-            'up': [2, 3, 2, 1, 0, 2, 3, 2],      # Row 5: 3,4,3,2,1,3,4,3 (8 frames)
-            'right': [2, 3, 1, 3, 2],            # Row 6: 3,4,2,4,3 (5 frames)
-            'down': [1, 2, 1, 0, 1, 2, 1],       # Row 7: 2,3,2,1,2,3,2 (7 frames)
-            'left': [2, 3, 1, 0, 1, 3, 1]       # Row 8: 3,4,2,1,2,4,2 (7 frames)
-        }
-        
-        # Define frame durations for each direction (in milliseconds)
-        # Reduced durations for faster pickup animation
-        # For 'right': frame 1 (index 1) has +200ms buffer, frame 2 (index 2) has +100ms buffer
-        frame_durations = {
-            'up': [60] * 8,  # All frames 60ms (faster)
-            'right': [60, 180, 120, 60, 60],  # Reduced proportionally: Frame 1: 180ms, Frame 2: 120ms
-            'down': [60] * 7,  # All frames 60ms (faster)
-            'left': [60] * 7   # All frames 60ms (faster)
-        }
-        
-        sequence = sequences[player.glove_pickup_animation_direction]
-        durations = frame_durations[player.glove_pickup_animation_direction]
-        GLOVE_PICKUP_ANIMATION_DURATION = sum(durations)  # Total duration
+        glove_pickup_clip = GLOVE_PICKUP_CLIPS[player.glove_pickup_animation_direction]
+        GLOVE_PICKUP_ANIMATION_DURATION = glove_pickup_clip.duration  # Total duration
         
         elapsed = current_time - player.glove_pickup_animation_start_time
         
         if elapsed < GLOVE_PICKUP_ANIMATION_DURATION:
-            # Determine which frame to show based on cumulative elapsed time
-            cumulative_time = 0
-            frame_index = 0
-            for i, duration in enumerate(durations):
-                if elapsed < cumulative_time + duration:
-                    frame_index = i
-                    break
-                cumulative_time += duration
-            
-            frame_index = min(frame_index, len(sequence) - 1)  # Clamp to valid range
-            
-            sprite_index = sequence[frame_index]
-            sprite = direction_sprites[sprite_index]
+            sprite = get_clip_sprite(glove_pickup_clip, direction_sprites, elapsed)
             
             # Update bomb position to follow player during animation
             # Make bomb move upward as animation progresses to simulate picking it up
@@ -4121,7 +4263,7 @@ def draw_player(player, current_time=None):
             offset_below = 4
             sprite_x = int(player.x - sprite_width // 2)
             sprite_y = int((player.y + PLAYER_RADIUS + offset_below) - sprite_height)
-            window.blit(sprite, (sprite_x, sprite_y))
+            frame_draw_list.append((sprite, (sprite_x, sprite_y)))
             
             # Draw the bomb in front of the player sprite during pickup animation
             if player.glove_pickup_bomb is not None:
@@ -4148,22 +4290,23 @@ def draw_player(player, current_time=None):
                     # Use first bomb sprite frame (index 0) during pickup - same for both players
                     bomb_sprite = sprite_list[0]
                     sprite_rect = bomb_sprite.get_rect(center=(int(player.glove_pickup_bomb.pixel_x), int(player.glove_pickup_bomb.pixel_y)))
-                    window.blit(bomb_sprite, sprite_rect)
+                    frame_draw_list.append((bomb_sprite, sprite_rect))
                 else:
                     # Fallback to circle
                     # Use different colors for different players
+                    shape_layer = get_shape_layer()
                     if player.player_num == 2:
-                        pygame.draw.circle(window, BLUE, (int(player.glove_pickup_bomb.pixel_x), int(player.glove_pickup_bomb.pixel_y)), CELL_SIZE // 3)
-                        pygame.draw.circle(window, BLACK, (int(player.glove_pickup_bomb.pixel_x), int(player.glove_pickup_bomb.pixel_y)), CELL_SIZE // 6)
+                        pygame.draw.circle(shape_layer, BLUE, (int(player.glove_pickup_bomb.pixel_x), int(player.glove_pickup_bomb.pixel_y)), CELL_SIZE // 3)
+                        pygame.draw.circle(shape_layer, BLACK, (int(player.glove_pickup_bomb.pixel_x), int(player.glove_pickup_bomb.pixel_y)), CELL_SIZE // 6)
                     elif player.player_num == 3:
-                        pygame.draw.circle(window, GREEN, (int(player.glove_pickup_bomb.pixel_x), int(player.glove_pickup_bomb.pixel_y)), CELL_SIZE // 3)
-                        pygame.draw.circle(window, BLACK, (int(player.glove_pickup_bomb.pixel_x), int(player.glove_pickup_bomb.pixel_y)), CELL_SIZE // 6)
+                        pygame.draw.circle(shape_layer, GREEN, (int(player.glove_pickup_bomb.pixel_x), int(player.glove_pickup_bomb.pixel_y)), CELL_SIZE // 3)
+                        pygame.draw.circle(shape_layer, BLACK, (int(player.glove_pickup_bomb.pixel_x), int(player.glove_pickup_bomb.pixel_y)), CELL_SIZE // 6)
                     elif player.player_num == 4:
-                        pygame.draw.circle(window, YELLOW, (int(player.glove_pickup_bomb.pixel_x), int(player.glove_pickup_bomb.pixel_y)), CELL_SIZE // 3)
-                        pygame.draw.circle(window, BLACK, (int(player.glove_pickup_bomb.pixel_x), int(player.glove_pickup_bomb.pixel_y)), CELL_SIZE // 6)
+                        pygame.draw.circle(shape_layer, YELLOW, (int(player.glove_pickup_bomb.pixel_x), int(player.glove_pickup_bomb.pixel_y)), CELL_SIZE // 3)
+                        pygame.draw.circle(shape_layer, BLACK, (int(player.glove_pickup_bomb.pixel_x), int(player.glove_pickup_bomb.pixel_y)), CELL_SIZE // 6)
                     else:
-                        pygame.draw.circle(window, ORANGE, (int(player.glove_pickup_bomb.pixel_x), int(player.glove_pickup_bomb.pixel_y)), CELL_SIZE // 3)
-                        pygame.draw.circle(window, BLACK, (int(player.glove_pickup_bomb.pixel_x), int(player.glove_pickup_bomb.pixel_y)), CELL_SIZE // 6)
+                        pygame.draw.circle(shape_layer, ORANGE, (int(player.glove_pickup_bomb.pixel_x), int(player.glove_pickup_bomb.pixel_y)), CELL_SIZE // 3)
+                        pygame.draw.circle(shape_layer, BLACK, (int(player.glove_pickup_bomb.pixel_x), int(player.glove_pickup_bomb.pixel_y)), CELL_SIZE // 6)
             
             return
         else:
@@ -4177,28 +4320,11 @@ def draw_player(player, current_time=None):
             player.glove_pickup_animation_direction = None
     
     # Normal player drawing
-    use_skull_normal = should_use_skull()
     # Choose appropriate sprites based on player number and skull state
-    if player.player_num == 2:
-        if use_skull_normal and skull_sprite2_loaded:
-            player_sprites_dict = skull_sprites2 if skull_sprites2 else {}
-        else:
-            player_sprites_dict = player.sprites if player.sprites else {}
-    elif player.player_num == 3:
-        if use_skull_normal and skull_sprite3_loaded:
-            player_sprites_dict = skull_sprites3 if skull_sprites3 else {}
-        else:
-            player_sprites_dict = player.sprites if player.sprites else {}
-    elif player.player_num == 4:
-        if use_skull_normal and skull_sprite4_loaded:
-            player_sprites_dict = skull_sprites4 if skull_sprites4 else {}
-        else:
-            player_sprites_dict = player.sprites if player.sprites else {}
+    if should_use_skull() and globals()[animation_sets["skull_loaded"]]:
+        player_sprites_dict = globals()[animation_sets["skull"]] or {}
     else:
-        if use_skull_normal and skull_sprite_loaded:
-            player_sprites_dict = skull_sprites if skull_sprites else {}
-        else:
-            player_sprites_dict = player.sprites if player.sprites else {}
+        player_sprites_dict = player.sprites if player.sprites else {}
     
     if player_sprites_dict:
         # Get the sprites for the current direction (default to 'down' if not found)
@@ -4207,22 +4333,18 @@ def draw_player(player, current_time=None):
             # Choose animation frame based on movement
             if player.moving:
                 # Animate between walk1 and walk2 frames
-                # Use time-based animation (cycle every 200ms)
                 if current_time:
-                    frame_index = 1 + int((current_time // 200) % 2)  # Alternates between 1 and 2
+                    sprite = get_clip_sprite(WALK_CLIP, direction_sprites, current_time)
                 else:
-                    frame_index = 1  # Default to walk1
-                sprite = direction_sprites[frame_index]  # walk1 or walk2
+                    sprite = direction_sprites[1]  # Default to walk1
             else:
                 # Use idle frame when not moving
                 # For boss sprites, cycle through row 9 idle animation only when facing down (forward)
                 if (player.player_num == 1 and player1_using_boss_sprites and boss_test_sprite_loaded 
                     and boss_idle_sprites and player.direction == 'down'):
-                    # Cycle through 4 sprites on row 9 (200ms per frame)
-                    # Cycles: 0 -> 1 -> 2 -> 3 -> 0 -> ...
+                    # Cycle through the sprites on row 9
                     if current_time:
-                        idle_frame_index = int((current_time // 200) % len(boss_idle_sprites))
-                        sprite = boss_idle_sprites[idle_frame_index]
+                        sprite = get_clip_sprite(BOSS_IDLE_CLIP, boss_idle_sprites, current_time)
                     else:
                         sprite = boss_idle_sprites[0] if boss_idle_sprites else direction_sprites[0]
                 else:
@@ -4235,18 +4357,98 @@ def draw_player(player, current_time=None):
             offset_below = 4  # Pixels to extend below hitbox
             sprite_x = int(player.x - sprite_width // 2)  # Center horizontally
             sprite_y = int((player.y + PLAYER_RADIUS + offset_below) - sprite_height)  # Bottom slightly below hitbox
-            window.blit(sprite, (sprite_x, sprite_y))
+            frame_draw_list.append((sprite, (sprite_x, sprite_y)))
             
     else:
         # Fallback to circle if sprite didn't load
-        pygame.draw.circle(window, WHITE, (int(player.x), int(player.y)), int(PLAYER_RADIUS))
+        shape_layer = get_shape_layer()
+        pygame.draw.circle(shape_layer, WHITE, (int(player.x), int(player.y)), int(PLAYER_RADIUS))
+
+# Entity draw list
+# Bombs and players are drawn from one list of [depth key, draw function, entity] entries, back
+# to front. Depth keys are (layer, y, tie-break): the layers keep bombs under powerups, thrown
+# bombs and item explosions under players, and within a layer lower y is drawn first so entities
+# closer to the bottom of the screen (and the bombs players hold over their heads) appear on top.
+# The list is kept across frames, so it is already nearly sorted and an insertion sort pass
+# re-sorts it in about O(n).
+ENTITY_LAYER_BOMBS = 0
+ENTITY_LAYER_POWERUPS = 1
+ENTITY_LAYER_THROWN_BOMBS = 2
+ENTITY_LAYER_ITEM_EXPLOSIONS = 3
+ENTITY_LAYER_PLAYERS = 4
+
+# Powerups and item explosions are drawn a layer at a time (entries with no entity)
+entity_draw_list = [
+    [(ENTITY_LAYER_POWERUPS,), draw_powerups, None],
+    [(ENTITY_LAYER_ITEM_EXPLOSIONS,), draw_item_explosions, None],
+]
+
+def sort_entity_draw_list():
+    """Insertion sort the entity draw list by depth key (stable, so ties keep last frame's order)"""
+    for i in range(1, len(entity_draw_list)):
+        entry = entity_draw_list[i]
+        j = i - 1
+        while j >= 0 and entity_draw_list[j][0] > entry[0]:
+            entity_draw_list[j + 1] = entity_draw_list[j]
+            j -= 1
+        entity_draw_list[j + 1] = entry
+
+def update_entity_draw_list(current_time):
+    """Add and remove the bombs and players to draw this frame, update their depth keys and re-sort"""
+    # {entity: (depth key, draw function)}
+    entities = {}
+    for index, bomb in enumerate(bombs):
+        if bomb.exploded:
+            continue
+        # Skip bombs being picked up (drawn in draw_player function)
+        if (player1 and bomb == player1.glove_pickup_bomb) or (player2 and bomb == player2.glove_pickup_bomb):
+            continue
+        if bomb.is_thrown:
+            # Skip bombs being held (drawn over the player's head in draw_player function)
+            if not bomb.is_moving:
+                continue
+            entities[bomb] = ((ENTITY_LAYER_THROWN_BOMBS, bomb.pixel_y, index), draw_thrown_bomb)
+        else:
+            entities[bomb] = ((ENTITY_LAYER_BOMBS, bomb.get_pixel_pos()[1], index), draw_bomb)
+    # Only draw players who are alive or still animating their death
+    for player in (player1, player2, player3, player4):
+        if not player:
+            continue
+        if not player.game_over or (player.death_time is not None and (current_time - player.death_time) < DEATH_CLIP.duration):
+            entities[player] = ((ENTITY_LAYER_PLAYERS, player.y, player.player_num), draw_player)
+    
+    # Keep the entries still on the field in last frame's order, then add the new ones
+    entries = []
+    for entry in entity_draw_list:
+        entity = entry[2]
+        if entity is None:
+            entries.append(entry)
+        elif entity in entities:
+            entry[0], entry[1] = entities.pop(entity)
+            entries.append(entry)
+    for entity, (depth, draw_function) in entities.items():
+        entries.append([depth, draw_function, entity])
+    entity_draw_list[:] = entries
+    sort_entity_draw_list()
+
+def draw_entities(current_time):
+    """Draw the bombs, powerups, item explosions and players back to front"""
+    update_entity_draw_list(current_time)
+    for depth, draw_function, entity in entity_draw_list:
+        if entity is None:
+            end_entity_draw()
+            draw_function(current_time)
+        else:
+            begin_entity_draw(entity)
+            draw_function(entity, current_time)
+    end_entity_draw()
 
 def restart_music():
     """Restart the background music"""
     global music_muted
     try:
         pygame.mixer.music.stop()
-        pygame.mixer.music.load(resource_path("Super Bomberman 2 - Battle 1 (SNES OST).mp3"))
+        load_music("Super Bomberman 2 - Battle 1 (SNES OST).mp3")
         # Set volume based on mute state (music is quieter at 0.5 volume)
         if music_muted:
             pygame.mixer.music.set_volume(0.0)
@@ -4263,10 +4465,10 @@ def switch_music_for_boss(is_boss_mode):
         pygame.mixer.music.stop()
         if is_boss_mode:
             # Load boss battle music
-            pygame.mixer.music.load(resource_path("boss fight.mp3"))
+            load_music("boss fight.mp3")
         else:
             # Load normal battle music
-            pygame.mixer.music.load(resource_path("Super Bomberman 2 - Battle 1 (SNES OST).mp3"))
+            load_music("Super Bomberman 2 - Battle 1 (SNES OST).mp3")
         # Set volume based on mute state (music is quieter at 0.5 volume)
         if music_muted:
             pygame.mixer.music.set_volume(0.0)
@@ -4292,6 +4494,9 @@ def main():
     # Load and play background music
     restart_music()
     
+    # Prerender the ground and permanent walls
+    build_background()
+    
     # Spawn skull powerdown at tile to the right of player 1's spawn (2, 1)
     # Make sure the location is clear (not a destructible wall)
     if (2, 1) in destructible_walls:
@@ -4305,8 +4510,14 @@ def main():
     pause_start_time = None  # Time when we paused
     total_paused_time = 0  # Total time spent paused (accumulated)
     
+    if RENDER_THREAD_ENABLED:
+        start_render_thread()
+    
     while running:
-        current_time = pygame.time.get_ticks()
+        current_time = start_tick()
+        
+        # With --prewarm-sprites, build the next lazy sprite sets whose sheet has decoded
+        build_prewarmed_sprites()
         
         # Handle events
         for event in pygame.event.get():
@@ -4402,9 +4613,13 @@ def main():
                         sudden_death_hurry_sound_start_time = None
                 elif event.key == pygame.K_1:
                     # Toggle player 1 between normal and boss test sprites
-                    global player1_using_boss_sprites, boss_test_sprites, boss_test_sprite_loaded, player_sprites, player_sprite_loaded
+                    global player1_using_boss_sprites, boss_test_sprites, boss_idle_sprites, boss_test_sprite_loaded, player_sprites, player_sprite_loaded
                     if not paused and player1:
                         player1_using_boss_sprites = not player1_using_boss_sprites
+                        if player1_using_boss_sprites:
+                            # Boss sprites are cut the first time they are needed
+                            boss_test_sprites = get_lazy_sprites("boss_test_sprites")
+                            boss_idle_sprites = get_lazy_sprites("boss_idle_sprites")
                         if player1_using_boss_sprites and boss_test_sprite_loaded:
                             player1.sprites = boss_test_sprites
                             print(f"Switched player 1 to boss test sprites")
@@ -5135,43 +5350,12 @@ def main():
             # Use frozen time (when we paused) for all animations
             frozen_time = pause_start_time if pause_start_time is not None else current_time
             # Still render the game (frozen state)
-            draw_ground()
+            draw_background()
             draw_destructible_walls(frozen_time)
-            draw_walls()
             draw_sudden_death_blocks(frozen_time)
-            draw_bombs(frozen_time)
-            draw_powerups(frozen_time)
-            draw_item_explosions(frozen_time)
-            # Draw the players - sort by Y position so higher Y (closer to bottom) is drawn on top
-            # Only draw players who are alive or still animating their death
-            active_players = []
-            DEATH_ANIMATION_DURATION = 4600
-            if player1:
-                if not player1.game_over:
-                    active_players.append(player1)
-                elif player1.death_time is not None and (frozen_time - player1.death_time) < DEATH_ANIMATION_DURATION:
-                    active_players.append(player1)
-            if player2:
-                if not player2.game_over:
-                    active_players.append(player2)
-                elif player2.death_time is not None and (frozen_time - player2.death_time) < DEATH_ANIMATION_DURATION:
-                    active_players.append(player2)
-            if player3:
-                if not player3.game_over:
-                    active_players.append(player3)
-                elif player3.death_time is not None and (frozen_time - player3.death_time) < DEATH_ANIMATION_DURATION:
-                    active_players.append(player3)
-            if player4:
-                if not player4.game_over:
-                    active_players.append(player4)
-                elif player4.death_time is not None and (frozen_time - player4.death_time) < DEATH_ANIMATION_DURATION:
-                    active_players.append(player4)
-            
-            # Sort by Y position (lower Y first, higher Y last) so higher Y appears on top
-            active_players.sort(key=lambda p: p.y)
-            
-            for player in active_players:
-                draw_player(player, frozen_time)
+            draw_explosions(frozen_time)
+            # Draw the bombs, powerups, item explosions and players back to front
+            draw_entities(frozen_time)
             
             # Draw hurry animation last so it appears on top of everything (including players)
             draw_hurry_animation(frozen_time)
@@ -5184,13 +5368,12 @@ def main():
                 scale_factor = 0.8  # 80% of original size
                 scaled_width = int(original_width * scale_factor)
                 scaled_height = int(original_height * scale_factor)
-                scaled_pause_image = pygame.transform.scale(pause_image, (scaled_width, scaled_height))
+                scaled_pause_image = get_transformed_surface(pause_image, "scale", (scaled_width, scaled_height))
                 pause_x = (WINDOW_WIDTH - scaled_width) // 2
                 pause_y = (WINDOW_HEIGHT - scaled_height) // 2
-                window.blit(scaled_pause_image, (pause_x, pause_y))
+                frame_draw_list.append((scaled_pause_image, (pause_x, pause_y)))
             
-            pygame.display.flip()
-            clock.tick(60)
+            end_tick()
             continue
         
         # Check for bomb explosions
@@ -8128,63 +8311,24 @@ def main():
                                 player2.thrown_bomb = None
                                 player2.is_throwing = False
         
-        # Clear the screen and draw ground tiles
-        draw_ground()
+        # Clear the screen and draw the prerendered ground, permanent walls and breakable blocks
+        draw_background()
         
         # Draw the grid (optional - you can remove this if you don't want grid lines)
         # draw_grid()
         
-        # Draw the destructible walls (before permanent walls so they appear on top)
+        # Draw the destructible walls that are breaking
         draw_destructible_walls(current_time)
         
-        # Draw the permanent walls
-        draw_walls()
-        
         # Draw sudden death blocks
         draw_sudden_death_blocks(current_time)
         
-        # Draw the bombs (non-thrown bombs only)
-        draw_bombs(current_time)
-        
-        # Draw powerups
-        draw_powerups(current_time)
+        # Draw the bomb explosions
+        draw_explosions(current_time)
         
-        # Draw thrown bombs (after powerups so they appear in front)
-        draw_thrown_bombs(current_time)
-        
-        # Draw item explosion animations
-        draw_item_explosions(current_time)
-        
-        # Draw the players - sort by Y position so higher Y (closer to bottom) is drawn on top
-        # Only draw players who are alive or still animating their death
-        active_players = []
-        DEATH_ANIMATION_DURATION = 4600
-        if player1:
-            if not player1.game_over:
-                active_players.append(player1)
-            elif player1.death_time is not None and (current_time - player1.death_time) < DEATH_ANIMATION_DURATION:
-                active_players.append(player1)
-        if player2:
-            if not player2.game_over:
-                active_players.append(player2)
-            elif player2.death_time is not None and (current_time - player2.death_time) < DEATH_ANIMATION_DURATION:
-                active_players.append(player2)
-        if player3:
-            if not player3.game_over:
-                active_players.append(player3)
-            elif player3.death_time is not None and (current_time - player3.death_time) < DEATH_ANIMATION_DURATION:
-                active_players.append(player3)
-        if player4:
-            if not player4.game_over:
-                active_players.append(player4)
-            elif player4.death_time is not None and (current_time - player4.death_time) < DEATH_ANIMATION_DURATION:
-                active_players.append(player4)
-
-        # Sort by Y position (lower Y first, higher Y last) so higher Y appears on top
-        active_players.sort(key=lambda p: p.y)
-        
-        for player in active_players:
-            draw_player(player, current_time)
+        # Draw the bombs, powerups, thrown bombs, item explosions and players back to front
+        # (players sorted by Y position so higher Y (closer to bottom) is drawn on top)
+        draw_entities(current_time)
         
         # Draw hurry animation last so it appears on top of everything (including players)
         draw_hurry_animation(current_time)
@@ -8193,12 +8337,14 @@ def main():
         if show_hitboxes:
             draw_hitboxes()
         
-        # Update the display
-        pygame.display.flip()
-        
-        # Limit to 60 frames per second
-        clock.tick(60)
+        # Update the display (only the changed areas with --dirty-rects) and wait for the next tick
+        # (60 frames per second, or fixed ticks with --fixed-timestep)
+        end_tick()
+    
+    stop_render_thread()
     
+    # Lazy sprite sets cut during the match are added to the baked sprite cache
+    save_sprite_cache()
     pygame.quit()
     sys.exit()
 
@@ -0,0 +1,289 @@
+"""Tests for the game's sprite processing and asset loading
+
+Run with: python -m pytest
+The game module is imported from this folder with SDL's dummy video and audio drivers, so no
+window opens or sound plays, and with its cache folder moved to a temporary folder so the baked
+caches in the real one are left alone.
+"""
+import hashlib
+import json
+import os
+import random
+import tempfile
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+test_cache_dir = tempfile.mkdtemp(prefix="bomberman_test_cache_")
+os.environ["LOCALAPPDATA"] = test_cache_dir  # get_cache_dir() checks this one first
+os.environ["XDG_CACHE_HOME"] = test_cache_dir
+os.chdir(os.path.dirname(os.path.abspath(__file__)))  # Loose assets are found from the working folder
+
+import pygame
+import pytest
+
+import asset_pack
+import grid_game
+
+
+def make_test_pixels(width=24, height=24, seed=1):
+    """Make a surface of random pixels with chroma key colours (and near misses) mixed in"""
+    rng = random.Random(seed)
+    chroma_colors = [(152, 248, 152), (144, 248, 144), (160, 248, 160)]
+    surface = pygame.Surface((width, height))
+    for x in range(width):
+        for y in range(height):
+            roll = rng.random()
+            if roll < 0.3:
+                # Exact chroma key colours and colours just inside or outside the tolerance
+                r, g, b = rng.choice(chroma_colors)
+                offset = rng.choice([0, 1, 29, 30, 31, -29, -30, -31])
+                color = (max(0, min(255, r + offset)), g, max(0, min(255, b - offset)))
+            elif roll < 0.45:
+                # Bright greens around the g > 200, r < 200, b < 200 rule
+                color = (rng.choice([199, 200, 201]), rng.choice([200, 201, 255]), rng.choice([0, 199, 200]))
+            else:
+                color = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+            surface.set_at((x, y), color)
+    return surface
+
+
+def get_rgba(surface):
+    """Get a surface's pixels as RGBA bytes"""
+    return pygame.image.tobytes(surface, "RGBA")
+
+
+# Chroma keying
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_chroma_key_array_matches_per_pixel(seed):
+    pytest.importorskip("numpy")
+    surface = make_test_pixels(seed=seed)
+    keyed = grid_game.remove_chroma_key_array(surface)
+    expected = grid_game.remove_chroma_key_slow(surface)
+    assert keyed.get_size() == expected.get_size()
+    assert get_rgba(keyed) == get_rgba(expected)
+
+
+def test_chroma_key_array_matches_per_pixel_on_sheet():
+    pytest.importorskip("numpy")
+    sheet = pygame.image.load(grid_game.resource_path(grid_game.sprite_sheets["bomberman"].filename))
+    frame = pygame.Surface((16, 32))
+    frame.blit(sheet, (0, 0), (16, 64, 16, 32))
+    assert get_rgba(grid_game.remove_chroma_key_array(frame)) == get_rgba(grid_game.remove_chroma_key_slow(frame))
+
+
+def test_array_process_falls_back_to_per_pixel():
+    surface = make_test_pixels(8, 8)
+
+    def broken_array_process(surface):
+        raise ValueError("surfarray can't handle this surface")
+
+    result = grid_game.run_array_process(surface, broken_array_process, grid_game.remove_chroma_key_slow, "test")
+    assert get_rgba(result) == get_rgba(grid_game.remove_chroma_key_slow(surface))
+
+
+# Sprite cache
+
+def make_cache_entry(owner, color=(255, 0, 0, 255), size=(2, 2)):
+    """Make a sprite cache entry of one solid colour"""
+    sprite = pygame.Surface(size, pygame.SRCALPHA)
+    sprite.fill(color)
+    return (size, get_rgba(sprite), owner, grid_game.measure_sprite_transparency(sprite))
+
+
+def test_prune_sprite_cache(monkeypatch):
+    built = ("player_sprites", False)
+    unbuilt_lazy = ("death_sprites", False)
+    removed = ("no_longer_in_manifest", False)
+    monkeypatch.setattr(grid_game, "sprite_cache", {
+        "used": make_cache_entry(built),
+        "stale": make_cache_entry(built),
+        "lazy": make_cache_entry(unbuilt_lazy),
+        "removed": make_cache_entry(removed),
+    })
+    monkeypatch.setattr(grid_game, "sprite_cache_used", {"used"})
+    assert grid_game.prune_sprite_cache()
+    # A built set keeps what it used, a lazy set that wasn't built this run keeps everything
+    assert sorted(grid_game.sprite_cache) == ["lazy", "used"]
+    assert not grid_game.prune_sprite_cache()
+
+
+def test_sprite_cache_round_trip(monkeypatch):
+    monkeypatch.setattr(grid_game, "sprite_cache", {
+        "a": make_cache_entry(("player_sprites", False)),
+        "b": make_cache_entry(("player_sprites", True), (0, 0, 255, 128), (3, 1)),
+    })
+    monkeypatch.setattr(grid_game, "sprite_cache_sizes", {"sheet.png": (64, 32)})
+    monkeypatch.setattr(grid_game, "sprite_cache_used", {"a", "b"})
+    monkeypatch.setattr(grid_game, "sprite_cache_dirty", True)
+    grid_game.save_sprite_cache()
+    with open(os.path.join(grid_game.get_cache_dir(), "sprites.cache"), 'rb') as f:
+        data = f.read()
+    sprites, sizes = grid_game.parse_sprite_cache(data)
+    assert sprites == grid_game.sprite_cache
+    assert sizes == {"sheet.png": (64, 32)}
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"\x80\x04\x95 not json\n",  # An old pickled cache
+    b'{"key": "%s", "sprites": {"a": [2, 2, 0, "player_sprites", false, "alpha"]}, "sizes": {}}\n' + bytes(8),
+    b'{"key": "%s", "sprites": {"a": [2, 2, 0, "player_sprites", false, "glow"]}, "sizes": {}}\n' + bytes(16),
+    b'{"key": "%s", "sprites": {"a": [2, 2]}, "sizes": {}}\n',
+])
+def test_malformed_sprite_cache_is_rejected(data):
+    if b"%s" in data:
+        data = data.replace(b"%s", grid_game.sprite_cache_key.encode())
+    with pytest.raises(ValueError):
+        grid_game.parse_sprite_cache(data)
+
+
+# Explosion autotiling
+
+def get_branch_explosion_sprite_type(has_left, has_right, has_up, has_down):
+    """Sprite type the explosion branches picked before the lookup table (the reference)"""
+    is_horizontal = (has_left or has_right) and not (has_up or has_down)
+    is_vertical = (has_up or has_down) and not (has_left or has_right)
+    if is_horizontal:
+        if has_left and has_right:
+            return 'horizontal'
+        return 'end_left' if has_right else 'end_right'
+    if is_vertical:
+        if has_up and has_down:
+            return 'vertical'
+        return 'end_up' if has_down else 'end_down'
+    return 'center'
+
+
+@pytest.mark.parametrize("mask", range(16))
+def test_explosion_autotile_types_match_branches(mask):
+    expected = get_branch_explosion_sprite_type(bool(mask & grid_game.EXPLOSION_NEIGHBOUR_LEFT),
+                                                bool(mask & grid_game.EXPLOSION_NEIGHBOUR_RIGHT),
+                                                bool(mask & grid_game.EXPLOSION_NEIGHBOUR_UP),
+                                                bool(mask & grid_game.EXPLOSION_NEIGHBOUR_DOWN))
+    assert grid_game.EXPLOSION_AUTOTILE_TYPES[mask] == expected
+
+
+@pytest.mark.parametrize("placed_by", [1, 2, 3, 4])
+def test_explosion_sprite_lookup_matches_branches(placed_by):
+    sprite_set = {1: grid_game.explosion_sprites, 2: grid_game.explosion2_sprites,
+                  3: grid_game.explosion3_sprites, 4: grid_game.explosion4_sprites}[placed_by]
+    if not sprite_set:
+        pytest.skip("explosion sprites did not load")
+    x, y = 5, 5
+    for animation_row in range(grid_game.EXPLOSION_ANIMATION_ROWS):
+        for mask in range(16):
+            neighbours = {(x - 1, y): mask & 1, (x + 1, y): mask & 2, (x, y - 1): mask & 4, (x, y + 1): mask & 8}
+            cells = {(x, y)} | {cell for cell, present in neighbours.items() if present}
+            expected = sprite_set[animation_row][get_branch_explosion_sprite_type(*map(bool, neighbours.values()))]
+            assert grid_game.get_sprite_for_cell_from_pattern(x, y, cells, set(), animation_row, placed_by) is expected
+            # A bomb's own cell is always the center, whatever is around it
+            center = grid_game.get_sprite_for_cell_from_pattern(x, y, cells, {(x, y)}, animation_row, placed_by)
+            assert center is sprite_set[animation_row]['center']
+
+
+# Animation clips
+
+def get_stepped_death_sprite(elapsed):
+    """Death sprite index the step-by-step timing rules picked before the clips (the reference)"""
+    if elapsed < 1500:
+        progress = elapsed / 1500
+        frame_index = min(int(progress * (2 - progress) * 21), 20)
+    elif elapsed < 1750:
+        frame_index = 20
+    elif elapsed < 1850:
+        frame_index = 21
+    elif elapsed < 2100:
+        frame_index = 22
+    elif elapsed < 2200:
+        frame_index = 23
+    elif elapsed < 2700:
+        frame_index = 24
+    elif elapsed < 4100:
+        frame_index = 25 + min(int((elapsed - 2700) / 200), 6)
+    else:
+        frame_index = 32
+    if frame_index < 20:
+        return [0, 3, 2, 1][frame_index % 4]
+    if 25 <= frame_index < 32:
+        return [8, 7, 9, 7, 8, 7, 9][frame_index - 25]
+    return {20: 0, 21: 4, 22: 5, 23: 6, 24: 7, 32: 7}[frame_index]
+
+
+def test_clip_frame_boundaries():
+    clip = grid_game.make_clip([("a", 100), ("b", 50), ("c", 200)])
+    assert clip.duration == 350
+    assert clip.get_frame(0) == "a"
+    assert clip.get_frame(99.9) == "a"
+    assert clip.get_frame(100) == "b"  # A frame ends exactly at its end time
+    assert clip.get_frame(149) == "b"
+    assert clip.get_frame(150) == "c"
+    assert clip.get_frame(350) == "c"  # Held after the last frame
+    assert clip.get_frame(10000) == "c"
+
+
+def test_looping_clip_wraps():
+    clip = grid_game.make_clip([(1, 200), (2, 200)], loop=True)
+    assert [clip.get_frame(elapsed) for elapsed in (0, 199, 200, 399, 400, 599, 600)] == [1, 1, 2, 2, 1, 1, 2]
+
+
+def test_death_clip_matches_stepped_timing():
+    clip = grid_game.make_death_clip()
+    assert clip.duration == 4600
+    # Every quarter millisecond, which covers every spin boundary, plus the exact collapse boundaries
+    times = [step / 4 for step in range(4700 * 4)]
+    times += [1500, 1750, 1850, 2100, 2200, 2700, 2900, 3100, 3300, 3500, 3700, 3900, 4100, 4600]
+    mismatches = [elapsed for elapsed in times if clip.get_frame(elapsed) != get_stepped_death_sprite(elapsed)]
+    assert mismatches == []
+
+
+# Asset archive
+
+def write_files(folder, files):
+    """Write {name: bytes} into a folder"""
+    for name, data in files.items():
+        with open(os.path.join(folder, name), 'wb') as f:
+            f.write(data)
+
+
+def test_asset_archive_round_trip(tmp_path):
+    files = {"Kick Voice.wav": b"RIFF kick", "Pause.PNG": bytes(range(256)) * 3, "empty.wav": b""}
+    write_files(tmp_path, files)
+    archive_path = str(tmp_path / "assets.pak")
+    asset_pack.build_archive(archive_path, str(tmp_path), sorted(files))
+
+    archive = asset_pack.open_archive(archive_path)
+    try:
+        assert sorted(archive.names()) == sorted(files)
+        for name, data in files.items():
+            # Looked up case-insensitively, like the loose files
+            for lookup in (name, name.lower(), name.upper()):
+                assert lookup in archive
+                assert bytes(archive.read(lookup)) == data
+                assert archive.get_hash(lookup) == hashlib.md5(data).digest()
+            reader = archive.open(name.lower())
+            assert reader.name == name
+            assert reader.read() == data
+        assert "missing.wav" not in archive
+        with pytest.raises(KeyError):
+            archive.read("missing.wav")
+    finally:
+        archive.file.close()
+
+
+def test_open_archive_without_an_archive(tmp_path):
+    assert asset_pack.open_archive(str(tmp_path / "assets.pak")) is None
+    not_an_archive = tmp_path / "not.pak"
+    not_an_archive.write_bytes(b"just some bytes, long enough for a header")
+    with pytest.raises(ValueError):
+        asset_pack.AssetArchive(str(not_an_archive))
+
+
+def test_game_asset_files_are_matched_case_insensitively(tmp_path):
+    manifest = {"sheets": {"bombs": {"file": "Bombs.png"}}, "layouts": {}, "palettes": {}, "sprites": {}}
+    write_files(tmp_path, {asset_pack.SPRITE_MANIFEST_FILE: json.dumps(manifest).encode(),
+                           "BOMBS.PNG": b"sheet", "pause.png": b"pause", "KICK.WAV": b"kick",
+                           "not a game file.txt": b"skip me"})
+    filenames = asset_pack.get_game_asset_files(str(tmp_path))
+    # Spelled as on disk, and only the files the game loads
+    assert filenames == sorted([asset_pack.SPRITE_MANIFEST_FILE, "BOMBS.PNG", "pause.png", "KICK.WAV"])